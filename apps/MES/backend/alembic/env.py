@@ -20,6 +20,7 @@ from sqlmodel import SQLModel
 # 导入所有您希望 Alembic 管理的 SQLModel 表模型
 # 例如:
 from infrastructure.sqlmodels.work_order import WorkOrder
+from infrastructure.sqlmodels.idempotency import IdempotencyRecord
 # 如果有其他模型，也在这里导入
 
 # 这是 Alembic 配置对象，提供了对 .ini 文件中值的访问
@@ -0,0 +1,44 @@
+"""add_idempotency_keys
+
+Revision ID: 409dc7e4e752
+Revises: 5a09f0be2f1a
+Create Date: 2026-10-17 18:21:37.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '409dc7e4e752'
+down_revision: Union[str, None] = '5a09f0be2f1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Idempotency-Key 请求的响应 (IDEMPOTENCY_STORE=database 时使用，多 worker 共享)
+    # status_code 为空的行表示请求仍在执行，由持有者在 locked_until 之前独占
+    op.create_table('idempotency_keys',
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('request_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('headers', sa.Text(), nullable=True),
+        sa.Column('body', sa.LargeBinary(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+    )
+    # 过期清理 (python -m maintenance.work_orders purge-idempotency-keys)
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
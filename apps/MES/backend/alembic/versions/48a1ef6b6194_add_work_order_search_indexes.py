@@ -0,0 +1,42 @@
+"""add_work_order_search_indexes
+
+Revision ID: 48a1ef6b6194
+Revises: d412e3b9f3e8
+Create Date: 2026-10-17 17:12:41.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48a1ef6b6194'
+down_revision: Union[str, None] = 'd412e3b9f3e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('order_number', 'product_name', 'notes')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 工单搜索 (GET /work-orders/search) 的三元组 (trigram) GIN 索引:
+    # ILIKE 'q%' (工单号前缀) 与 ILIKE '%q%' (产品名称 / 备注包含) 都可走索引，三个条件以 BitmapOr 合并，只读取匹配的行。
+    # pg_trgm 是 PostgreSQL 自带的 contrib 扩展，创建扩展需要数据库所有者或超级用户权限
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.create_index(
+                f'ix_work_orders_{column}_trgm', 'work_orders', [column], unique=False,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm 扩展保留，其他对象可能也在使用
+    with op.get_context().autocommit_block():
+        for column in reversed(SEARCH_COLUMNS):
+            op.drop_index(f'ix_work_orders_{column}_trgm', table_name='work_orders', postgresql_concurrently=True)
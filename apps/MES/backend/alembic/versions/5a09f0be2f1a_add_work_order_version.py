@@ -0,0 +1,53 @@
+"""add_work_order_version
+
+Revision ID: 5a09f0be2f1a
+Revises: 48a1ef6b6194
+Create Date: 2026-10-17 17:48:06.310752
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a09f0be2f1a'
+down_revision: Union[str, None] = '48a1ef6b6194'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 乐观并发版本号: 条件写入在 UPDATE / DELETE 的 WHERE 中比较 version (比较并交换)，不再需要 SELECT ... FOR UPDATE
+    # 带常量默认值的 NOT NULL 列在 PostgreSQL 11+ 上只改元数据，不重写整表；已有工单从版本 1 开始
+    op.add_column('work_orders', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    # 归档表保留归档时的版本号
+    op.add_column('work_orders_archive', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+    # 每次 UPDATE 都递增版本号 (与 update_work_orders_updated_at 一样，也覆盖应用之外手工执行的 UPDATE)。
+    # 应用的 UPDATE 自身已写入 version = version + 1，触发器按 OLD 计算，结果相同，不会重复递增
+    op.execute("""
+        CREATE OR REPLACE FUNCTION work_orders_bump_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+           NEW.version = OLD.version + 1;
+           RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_bump_version
+        BEFORE UPDATE ON work_orders
+        FOR EACH ROW
+        EXECUTE PROCEDURE work_orders_bump_version();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS work_orders_bump_version ON work_orders;")
+    op.execute("DROP FUNCTION IF EXISTS work_orders_bump_version();")
+    op.drop_column('work_orders_archive', 'version')
+    op.drop_column('work_orders', 'version')
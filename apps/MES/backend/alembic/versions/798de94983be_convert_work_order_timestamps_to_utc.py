@@ -0,0 +1,114 @@
+"""convert_work_order_timestamps_to_utc
+
+Revision ID: 798de94983be
+Revises: cb054f9a9ffd
+Create Date: 2026-10-17 19:41:08.926513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '798de94983be'
+down_revision: Union[str, None] = 'cb054f9a9ffd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 每批换算的行数 (每批一个短事务)
+BATCH_SIZE = 1000
+# 换算期间置为 on 的会话变量: 维护 updated_at / version 的行级触发器看到它时保留行的原值
+PRESERVE_SETTING = 'mes.preserve_row_metadata'
+# 已提交的批次进度 (每个表最后换算的 id)，迁移中断后重新执行时从这里继续，不会重复换算
+PROGRESS_TABLE = 'utc_conversion_progress'
+# 值为 UTC 的时区名，这些服务器上的时间戳本来就是 UTC，无需换算
+UTC_ZONES = "'UTC', 'Etc/UTC', 'UCT', 'Etc/UCT', 'GMT', 'Etc/GMT', 'Universal', 'Zulu'"
+
+
+def _row_functions(preserve: bool) -> Sequence[str]:
+    skip = f"""
+           IF current_setting('{PRESERVE_SETTING}', true) = 'on' THEN
+               RETURN NEW;
+           END IF;""" if preserve else ""
+    return (
+        f"""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN{skip}
+           NEW.updated_at = timezone('utc', now());
+           RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION work_orders_bump_version()
+        RETURNS TRIGGER AS $$
+        BEGIN{skip}
+           NEW.version = OLD.version + 1;
+           RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+        """,
+    )
+
+
+def _convert_in_batches(table: str, columns: Sequence[str]) -> str:
+    """
+    DO block converting columns of table from the server time zone to UTC in batches keyed by id;
+    each batch locks and updates BATCH_SIZE rows and commits together with its progress row.
+    """
+    assignments = ", ".join(f"{column} = timezone('utc', t.{column} AT TIME ZONE tz)" for column in columns)
+    return f"""
+        DO $$
+        DECLARE
+            tz text := current_setting('TimeZone');
+            after_id uuid;
+            batch_last_id uuid;
+        BEGIN
+            IF tz IN ({UTC_ZONES}) THEN
+                RETURN;
+            END IF;
+            SELECT p.last_id INTO after_id FROM {PROGRESS_TABLE} p WHERE p.table_name = '{table}';
+            after_id := coalesce(after_id, '00000000-0000-0000-0000-000000000000');
+            PERFORM set_config('{PRESERVE_SETTING}', 'on', false);
+            LOOP
+                WITH batch AS (
+                    SELECT id FROM {table} WHERE id > after_id ORDER BY id LIMIT {BATCH_SIZE} FOR UPDATE
+                ), converted AS (
+                    UPDATE {table} t SET {assignments} FROM batch WHERE t.id = batch.id RETURNING t.id
+                )
+                SELECT id INTO batch_last_id FROM converted ORDER BY id DESC LIMIT 1;
+                EXIT WHEN batch_last_id IS NULL;
+                after_id := batch_last_id;
+                INSERT INTO {PROGRESS_TABLE} (table_name, last_id) VALUES ('{table}', after_id)
+                ON CONFLICT (table_name) DO UPDATE SET last_id = EXCLUDED.last_id;
+                COMMIT;
+            END LOOP;
+            PERFORM set_config('{PRESERVE_SETTING}', 'off', false);
+        END $$;
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # cb054f9a9ffd 之前的时间戳按服务器默认时区 (迁移会话的 TimeZone，应用会话改为 UTC 之前使用的同一时区) 写入，
+    # 归档期限与 ETag 按 UTC 读取它们，此处换算为 UTC。服务器时区为 UTC 时不做任何修改。
+    # 按 id 分批、每批独立提交，不长时间锁表；触发器保持启用: 状态计数与看板汇总的触发器看到的净变化为 0 (不写汇总表)，
+    # updated_at / version 的触发器在换算会话中保留行的原值，因此换算不算作一次修改 (version 不变)。
+    # 换算期间应停止写入 (已换算的行若再由旧版本应用写入会重新得到本地时间)；换算后的工单 ETag 随之变化。
+    for function in _row_functions(preserve=True):
+        op.execute(function)
+    op.execute(f"CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (table_name text PRIMARY KEY, last_id uuid NOT NULL)")
+    # DO 块中的 COMMIT 要求不在外层事务中执行
+    with op.get_context().autocommit_block():
+        op.execute(_convert_in_batches('work_orders', ('created_at', 'updated_at')))
+        op.execute(_convert_in_batches('work_orders_archive', ('created_at', 'updated_at', 'archived_at')))
+    op.execute(f"DROP TABLE {PROGRESS_TABLE}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 已换算的时间戳不再换算回本地时间
+    for function in _row_functions(preserve=False):
+        op.execute(function)
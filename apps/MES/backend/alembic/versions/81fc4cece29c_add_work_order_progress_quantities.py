@@ -0,0 +1,32 @@
+"""add_work_order_progress_quantities
+
+Revision ID: 81fc4cece29c
+Revises: b522fb6664d8
+Create Date: 2026-10-17 14:05:31.228417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '81fc4cece29c'
+down_revision: Union[str, None] = 'b522fb6664d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 已生产 / 报废数量，由生产进度上报接口按增量累加
+    # 带常量默认值的 NOT NULL 列在 PostgreSQL 11+ 上只改元数据，不重写整表
+    op.add_column('work_orders', sa.Column('produced_quantity', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('work_orders', sa.Column('scrapped_quantity', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('work_orders', 'scrapped_quantity')
+    op.drop_column('work_orders', 'produced_quantity')
@@ -0,0 +1,64 @@
+"""add_work_orders_archive
+
+Revision ID: a712e3a959dd
+Revises: 81fc4cece29c
+Create Date: 2026-10-17 15:12:47.503126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+from domain.value_objects.order_status import OrderStatus
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a712e3a959dd'
+down_revision: Union[str, None] = '81fc4cece29c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 终态 (与 domain.value_objects.order_status.TERMINAL_ORDER_STATUSES 保持一致)，迁移脚本中固定写死
+TERMINAL_STATUS_PREDICATE = "status IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 冷数据表: 归档任务把终态且超过保留期的工单从 work_orders 分批移到这里，列与 work_orders 相同外加 archived_at
+    # 工单号只在热表中唯一，归档表上为普通索引
+    op.create_table('work_orders_archive',
+        sa.Column('id', sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('order_number', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('product_name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('status', postgresql.ENUM(OrderStatus, name='order_status_enum', create_type=False), nullable=False),
+        sa.Column('due_date', sa.DateTime(), nullable=True),
+        sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('produced_quantity', sa.Integer(), nullable=False),
+        sa.Column('scrapped_quantity', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_work_orders_archive_order_number', 'work_orders_archive', ['order_number'], unique=False)
+    op.create_index('ix_work_orders_archive_created_at_id', 'work_orders_archive', ['created_at', 'id'], unique=False)
+
+    # 归档候选 (终态工单按 updated_at 排序取一批)，部分索引只包含终态工单
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_work_orders_terminal_updated_at', 'work_orders', ['updated_at'], unique=False,
+            postgresql_where=sa.text(TERMINAL_STATUS_PREDICATE), postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_work_orders_terminal_updated_at', table_name='work_orders', postgresql_concurrently=True)
+    op.drop_index('ix_work_orders_archive_created_at_id', table_name='work_orders_archive')
+    op.drop_index('ix_work_orders_archive_order_number', table_name='work_orders_archive')
+    op.drop_table('work_orders_archive')
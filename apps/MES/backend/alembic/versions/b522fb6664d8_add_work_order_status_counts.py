@@ -0,0 +1,97 @@
+"""add_work_order_status_counts
+
+Revision ID: b522fb6664d8
+Revises: e40d9c23f9d1
+Create Date: 2026-10-17 11:20:42.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from domain.value_objects.order_status import OrderStatus
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b522fb6664d8'
+down_revision: Union[str, None] = 'e40d9c23f9d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 按状态维护的工单计数表: 由 work_orders 上的语句级触发器在同一事务中增减计数，
+    # 列表接口的总数 (无过滤或仅按状态过滤) 由此表求和得到，不再对 work_orders 做 count(*)
+    op.create_table('work_order_status_counts',
+        sa.Column('status', postgresql.ENUM(OrderStatus, name='order_status_enum', create_type=False), nullable=False),
+        sa.Column('count', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+        sa.PrimaryKeyConstraint('status')
+    )
+
+    # 语句级触发器 + 过渡表 (transition tables): 批量写入每条语句只汇总一次，
+    # 而不是每行各更新一次计数行；UPDATE 时按新旧状态求净变化，状态未变则不写计数表
+    op.execute("""
+        CREATE OR REPLACE FUNCTION work_orders_status_count_apply()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO work_order_status_counts (status, count)
+                SELECT status, count(*) FROM new_rows GROUP BY status ORDER BY status
+                ON CONFLICT (status) DO UPDATE SET count = work_order_status_counts.count + EXCLUDED.count;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO work_order_status_counts (status, count)
+                SELECT status, -count(*) FROM old_rows GROUP BY status ORDER BY status
+                ON CONFLICT (status) DO UPDATE SET count = work_order_status_counts.count + EXCLUDED.count;
+            ELSE
+                INSERT INTO work_order_status_counts (status, count)
+                SELECT status, sum(delta) FROM (
+                    SELECT status, 1 AS delta FROM new_rows
+                    UNION ALL
+                    SELECT status, -1 AS delta FROM old_rows
+                ) AS changes
+                GROUP BY status HAVING sum(delta) <> 0 ORDER BY status
+                ON CONFLICT (status) DO UPDATE SET count = work_order_status_counts.count + EXCLUDED.count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_status_count_insert
+        AFTER INSERT ON work_orders
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE work_orders_status_count_apply();
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_status_count_update
+        AFTER UPDATE ON work_orders
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE work_orders_status_count_apply();
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_status_count_delete
+        AFTER DELETE ON work_orders
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE work_orders_status_count_apply();
+    """)
+
+    # 以现有数据初始化计数；SHARE 锁阻止初始化期间的并发写入，避免计数与数据不一致
+    op.execute("LOCK TABLE work_orders IN SHARE MODE")
+    op.execute("""
+        INSERT INTO work_order_status_counts (status, count)
+        SELECT status, count(*) FROM work_orders GROUP BY status
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS work_orders_status_count_delete ON work_orders;")
+    op.execute("DROP TRIGGER IF EXISTS work_orders_status_count_update ON work_orders;")
+    op.execute("DROP TRIGGER IF EXISTS work_orders_status_count_insert ON work_orders;")
+    op.execute("DROP FUNCTION IF EXISTS work_orders_status_count_apply();")
+    op.drop_table('work_order_status_counts')
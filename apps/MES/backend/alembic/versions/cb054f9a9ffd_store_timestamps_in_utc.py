@@ -0,0 +1,57 @@
+"""store_timestamps_in_utc
+
+Revision ID: cb054f9a9ffd
+Revises: 409dc7e4e752
+Create Date: 2026-10-17 19:04:52.177346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cb054f9a9ffd'
+down_revision: Union[str, None] = '409dc7e4e752'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 时间戳列为 timestamp without time zone，应用按 UTC 解读 (ETag / Last-Modified、归档期限)。
+# now() 写入的是会话时区的本地时间，因此默认值与触发器统一改为显式的 UTC 时间。
+# 已有数据的换算见下一个迁移 798de94983be
+UTC_NOW = "timezone('utc', now())"
+SERVER_DEFAULTS = {
+    'work_orders': ('created_at', 'updated_at'),
+    'work_orders_archive': ('archived_at',),
+    'idempotency_keys': ('created_at',),
+}
+
+
+def _updated_at_function(now: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+           NEW.updated_at = {now};
+           RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(_updated_at_function(UTC_NOW))
+    for table, columns in SERVER_DEFAULTS.items():
+        for column in columns:
+            op.alter_column(table, column, server_default=sa.text(UTC_NOW))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 只恢复默认值与触发器，已写入的 UTC 时间戳不再换算回本地时间
+    for table, columns in SERVER_DEFAULTS.items():
+        for column in columns:
+            op.alter_column(table, column, server_default=sa.text('now()'))
+    op.execute(_updated_at_function('now()'))
@@ -0,0 +1,130 @@
+"""add_work_order_summary
+
+Revision ID: d412e3b9f3e8
+Revises: a712e3a959dd
+Create Date: 2026-10-17 16:02:19.884730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+from domain.value_objects.order_status import OrderStatus
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd412e3b9f3e8'
+down_revision: Union[str, None] = 'a712e3a959dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 看板汇总表: 按 (产品, 状态, 计划完成日) 维护工单数与计划数量合计，由 work_orders 上的语句级触发器在同一事务中增减。
+    # 只有活动工单保留计划完成日 (用于统计逾期)，终态工单和没有计划完成日的工单归入 9999-12-31，计数归零的行随即删除，
+    # 因此表的大小取决于产品数和未结的计划完成日，而不是历史工单数
+    op.create_table('work_order_summary',
+        sa.Column('product_name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column('status', postgresql.ENUM(OrderStatus, name='order_status_enum', create_type=False), nullable=False),
+        sa.Column('due_day', sa.Date(), nullable=False),
+        sa.Column('order_count', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+        sa.Column('planned_quantity', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+        sa.PrimaryKeyConstraint('product_name', 'status', 'due_day')
+    )
+
+    # 汇总行的计划完成日 (活动状态与 domain.value_objects.order_status.ACTIVE_ORDER_STATUSES 保持一致，迁移中固定写死)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION work_order_summary_due_day(status order_status_enum, due_date timestamp)
+        RETURNS date AS $$
+            SELECT CASE
+                WHEN status IN ('PENDING', 'IN_PROGRESS', 'ON_HOLD', 'REOPENED') AND due_date IS NOT NULL THEN due_date::date
+                ELSE DATE '9999-12-31'
+            END
+        $$ LANGUAGE sql IMMUTABLE;
+    """)
+    # 与 work_orders_status_count_apply 相同的做法: 语句级触发器 + 过渡表，每条语句按汇总键求净变化后只写一次，
+    # 净变化为 0 的键 (例如只改了备注或生产数量) 不写汇总表。计数只会在旧行所在的键上减到 0，随后删除这些空行
+    op.execute("""
+        CREATE OR REPLACE FUNCTION work_order_summary_apply()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO work_order_summary (product_name, status, due_day, order_count, planned_quantity)
+                SELECT product_name, status, work_order_summary_due_day(status, due_date), count(*), sum(quantity)
+                FROM new_rows GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+                ON CONFLICT (product_name, status, due_day) DO UPDATE SET
+                    order_count = work_order_summary.order_count + EXCLUDED.order_count,
+                    planned_quantity = work_order_summary.planned_quantity + EXCLUDED.planned_quantity;
+                RETURN NULL;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO work_order_summary (product_name, status, due_day, order_count, planned_quantity)
+                SELECT product_name, status, work_order_summary_due_day(status, due_date), -count(*), -sum(quantity)
+                FROM old_rows GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+                ON CONFLICT (product_name, status, due_day) DO UPDATE SET
+                    order_count = work_order_summary.order_count + EXCLUDED.order_count,
+                    planned_quantity = work_order_summary.planned_quantity + EXCLUDED.planned_quantity;
+            ELSE
+                INSERT INTO work_order_summary (product_name, status, due_day, order_count, planned_quantity)
+                SELECT product_name, status, due_day, sum(order_count), sum(planned_quantity) FROM (
+                    SELECT product_name, status, work_order_summary_due_day(status, due_date) AS due_day,
+                        1 AS order_count, quantity AS planned_quantity
+                    FROM new_rows
+                    UNION ALL
+                    SELECT product_name, status, work_order_summary_due_day(status, due_date), -1, -quantity
+                    FROM old_rows
+                ) AS changes
+                GROUP BY 1, 2, 3 HAVING sum(order_count) <> 0 OR sum(planned_quantity) <> 0 ORDER BY 1, 2, 3
+                ON CONFLICT (product_name, status, due_day) DO UPDATE SET
+                    order_count = work_order_summary.order_count + EXCLUDED.order_count,
+                    planned_quantity = work_order_summary.planned_quantity + EXCLUDED.planned_quantity;
+            END IF;
+            DELETE FROM work_order_summary
+            WHERE order_count = 0 AND (product_name, status, due_day) IN (
+                SELECT product_name, status, work_order_summary_due_day(status, due_date) FROM old_rows
+            );
+            RETURN NULL;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_summary_insert
+        AFTER INSERT ON work_orders
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE work_order_summary_apply();
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_summary_update
+        AFTER UPDATE ON work_orders
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE work_order_summary_apply();
+    """)
+    op.execute("""
+        CREATE TRIGGER work_orders_summary_delete
+        AFTER DELETE ON work_orders
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE work_order_summary_apply();
+    """)
+
+    # 以现有数据初始化；SHARE 锁阻止初始化期间的并发写入 (之后可用 python -m maintenance.work_orders rebuild-summary 重新核对)
+    op.execute("LOCK TABLE work_orders IN SHARE MODE")
+    op.execute("""
+        INSERT INTO work_order_summary (product_name, status, due_day, order_count, planned_quantity)
+        SELECT product_name, status, work_order_summary_due_day(status, due_date), count(*), sum(quantity)
+        FROM work_orders GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS work_orders_summary_delete ON work_orders;")
+    op.execute("DROP TRIGGER IF EXISTS work_orders_summary_update ON work_orders;")
+    op.execute("DROP TRIGGER IF EXISTS work_orders_summary_insert ON work_orders;")
+    op.execute("DROP FUNCTION IF EXISTS work_order_summary_apply();")
+    op.execute("DROP FUNCTION IF EXISTS work_order_summary_due_day(order_status_enum, timestamp);")
+    op.drop_table('work_order_summary')
@@ -0,0 +1,48 @@
+"""add_list_filter_indexes
+
+Revision ID: e40d9c23f9d1
+Revises: f89466b64bab
+Create Date: 2026-10-17 10:03:26.118940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e40d9c23f9d1'
+down_revision: Union[str, None] = 'f89466b64bab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 仍在车间流转中的状态 (与 domain.value_objects.order_status.ACTIVE_ORDER_STATUSES 保持一致)
+# 迁移脚本中固定写死，避免日后修改领域常量时改变历史迁移的含义
+ACTIVE_STATUS_PREDICATE = "status IN ('PENDING', 'IN_PROGRESS', 'ON_HOLD', 'REOPENED')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 工单列表过滤/排序索引:
+    # - (due_date, id): 计划完成日期窗口过滤及按 due_date 排序/游标分页
+    # - (status, created_at, id): 按状态过滤 + 默认的创建时间排序/游标分页
+    # - (product_name, created_at, id): 按产品过滤 + 创建时间排序/游标分页
+    # - (status, due_date) WHERE 活动状态: 看板 "进行中工单按交期" 查询，部分索引不包含大量历史终态工单
+    with op.get_context().autocommit_block():
+        op.create_index('ix_work_orders_due_date_id', 'work_orders', ['due_date', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_work_orders_status_created_at_id', 'work_orders', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_work_orders_product_name_created_at_id', 'work_orders', ['product_name', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            'ix_work_orders_active_status_due_date', 'work_orders', ['status', 'due_date'], unique=False,
+            postgresql_where=sa.text(ACTIVE_STATUS_PREDICATE), postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_work_orders_active_status_due_date', table_name='work_orders', postgresql_concurrently=True)
+        op.drop_index('ix_work_orders_product_name_created_at_id', table_name='work_orders', postgresql_concurrently=True)
+        op.drop_index('ix_work_orders_status_created_at_id', table_name='work_orders', postgresql_concurrently=True)
+        op.drop_index('ix_work_orders_due_date_id', table_name='work_orders', postgresql_concurrently=True)
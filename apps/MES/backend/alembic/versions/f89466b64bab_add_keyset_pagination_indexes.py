@@ -0,0 +1,35 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: f89466b64bab
+Revises: <alembic_will_generate_this>
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f89466b64bab'
+# The initial revision (3318fdc6a2cc_*.py) keeps the id already recorded in deployed databases
+down_revision: Union[str, None] = '<alembic_will_generate_this>'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 游标分页按 (排序字段, id) 比较与排序，需要对应的复合索引。
+    # work_orders 表数据量大，使用 CONCURRENTLY 避免建索引期间锁表 (需在事务外执行)。
+    with op.get_context().autocommit_block():
+        op.create_index('ix_work_orders_created_at_id', 'work_orders', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_work_orders_updated_at_id', 'work_orders', ['updated_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_work_orders_updated_at_id', table_name='work_orders', postgresql_concurrently=True)
+        op.drop_index('ix_work_orders_created_at_id', table_name='work_orders', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+# api/change_feed.py
+"""
+Server-Sent Events framing for the work order change feed (GET /work-orders/events).
+Each event is sent as
+
+    event: updated
+    data: {"id": "...", "data": {...}}
+
+Comment lines (": keepalive") are sent while there is nothing to report, so proxies do not
+close the idle connection. After a "resync" event, and after every (re)connect, clients reload
+the work orders they display: events published while they were not subscribed are not replayed.
+"""
+from infrastructure.events.work_order_events import WorkOrderEvent
+
+from api.fast_json import dumps
+
+SSE_MEDIA_TYPE = "text/event-stream"
+# Reconnect delay advertised to EventSource clients
+RETRY_MILLISECONDS = 3000
+
+
+def encode_retry() -> bytes:
+    return f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+
+
+def encode_event(event: WorkOrderEvent) -> bytes:
+    return b"event: " + event.type.encode() + b"\ndata: " + dumps({"id": event.id, "data": event.data}) + b"\n\n"
+
+
+def encode_keepalive() -> bytes:
+    return b": keepalive\n\n"
@@ -0,0 +1,103 @@
+# api/conditional_requests.py
+"""
+HTTP conditional request helpers (ETag / Last-Modified / If-None-Match / If-Match).
+A work order's ETag is derived from its id and updated_at, which the database changes on every
+write, so it can be checked against a projected (id, updated_at) read or pushed into an UPDATE.
+"""
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    # updated_at is stored as a naive UTC timestamp (db_now / timezone('utc', now()) on PostgreSQL)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def fields_tag(fields: Sequence[str]) -> str:
+    """Short digest of a (normalised) sparse fieldset, distinguishing its ETags from the full representation's."""
+    return hashlib.blake2b(",".join(fields).encode(), digest_size=4).hexdigest()
+
+
+def work_order_etag(work_order_id: uuid.UUID, updated_at: datetime, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Strong ETag "<id hex>-<updated_at in microseconds since epoch>", with "-<fields_tag>" appended for a
+    sparse fieldset: a cached sparse body must never be revalidated as the full representation, or vice versa.
+    """
+    delta = _to_utc_naive(updated_at) - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    if fields is not None:
+        return f'"{work_order_id.hex}-{micros}-{fields_tag(fields)}"'
+    return f'"{work_order_id.hex}-{micros}"'
+
+
+def parse_work_order_etag(etag: str) -> Optional[Tuple[uuid.UUID, datetime]]:
+    """
+    Inverse of work_order_etag; None for weak or foreign ETags. The fieldset part is ignored,
+    since a sparse ETag identifies the same (id, updated_at) state for If-Match.
+    """
+    etag = etag.strip()
+    if not (len(etag) >= 2 and etag[0] == etag[-1] == '"'):
+        return None
+    id_hex, _, version = etag[1:-1].partition("-")
+    micros = version.partition("-")[0]
+    try:
+        return uuid.UUID(hex=id_hex), _EPOCH + timedelta(microseconds=int(micros))
+    except ValueError:
+        return None
+
+
+def list_etag(rows: Iterable[Tuple[uuid.UUID, Optional[datetime]]], *extra: object) -> str:
+    """
+    Strong ETag of a list page: digest over the (id, updated_at) of its items plus page metadata
+    (total, next cursor). Any insert, delete or update touching the page changes it.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for work_order_id, updated_at in rows:
+        digest.update(work_order_id.bytes)
+        digest.update(updated_at.isoformat().encode() if updated_at else b"-")
+    for value in extra:
+        digest.update(b"|" + repr(value).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_to_utc_naive(value).replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def split_etags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _weak_equal(a: str, b: str) -> bool:
+    return a.removeprefix("W/") == b.removeprefix("W/")
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: Optional[datetime],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """
+    RFC 9110 evaluation for GET: If-None-Match (weak comparison) takes precedence,
+    If-Modified-Since is only considered when If-None-Match is absent.
+    """
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return any(_weak_equal(tag, etag) for tag in split_etags(if_none_match))
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second resolution
+        return _to_utc_naive(last_modified).replace(microsecond=0) <= _to_utc_naive(since)
+    return False
@@ -1,10 +1,16 @@
 # api/endpoints/work_orders_router.py
+import asyncio
 import uuid
+from datetime import datetime
 from sqlmodel import SQLModel
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import AsyncIterator, List, Any, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlmodel import Field
 
 # Import SQLModel schemas directly
+from infrastructure.repositories.work_order_queries import READ_COLUMNS, SEARCH_MIN_LENGTH, projection
 from infrastructure.sqlmodels.work_order import (
     WorkOrder, # The table model, can be used for responses if it matches WorkOrderReadFull
     WorkOrderCreate,
@@ -12,14 +18,44 @@ from infrastructure.sqlmodels.work_order import (
     WorkOrderUpdate,
     WorkOrderReadFull
 )
+from api.work_order_export import EXPORT_MEDIA_TYPES, encode_csv, encode_ndjson
+from api.fast_json import WorkOrderJSONResponse, row_dicts
+from api.change_feed import SSE_MEDIA_TYPE, encode_event, encode_keepalive, encode_retry
+from api.work_order_import import iter_csv_records, iter_ndjson_records
+from api.conditional_requests import http_date, is_not_modified, list_etag, parse_work_order_etag, split_etags, work_order_etag
 from application.services.work_order_app_service import WorkOrderApplicationService
-from core.dependencies import get_work_order_application_service
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.production_progress import ProgressIncrement, ProgressOutcome
+from domain.value_objects.work_order_summary import WorkOrderSummary
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from core.config import (
+    BULK_INSERT_CHUNK_SIZE, BULK_MAX_ITEMS, CHANGE_FEED_HEARTBEAT_SECONDS, EXPORT_BATCH_SIZE, IMPORT_MAX_REPORTED_ERRORS,
+    PROGRESS_DURABLE_TIMEOUT_SECONDS,
+)
+from core.dependencies import get_work_order_application_service, progress_coalescer, work_order_application_service_scope, work_order_events
+from infrastructure.events.work_order_events import EventFilter
+from domain.value_objects.bulk_operation import BulkConflictPolicy, BulkItemOutcome, BulkTransitionOutcome, ImportReport
+from domain.exceptions import WorkOrderModifiedError, WorkOrderVersionConflictError
 
 router = APIRouter(
     prefix="/work-orders",
     tags=["Work Orders - 工单管理 (SQLModel)"], # Updated tag
 )
 
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> None:
+    """ETag/Last-Modified 响应头；no-cache 要求客户端每次用 If-None-Match 重新验证，而不是按启发式缓存"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
 @router.post(
     "/",
     response_model=WorkOrderRead, # Or WorkOrderReadFull if you want all fields from table model
@@ -28,6 +64,7 @@ router = APIRouter(
 )
 async def create_work_order(
     wo_create: WorkOrderCreate, # Use SQLModel schema for request body
+    response: Response,
     service: WorkOrderApplicationService = Depends(get_work_order_application_service)
 ) -> Any: # Return type can be WorkOrderRead or WorkOrder (SQLModel table model)
     """
@@ -43,6 +80,7 @@ async def create_work_order(
         # The service method will need to be adapted to accept WorkOrderCreate
         # and return a WorkOrder (table model) or compatible type.
         created_wo = await service.create_work_order_sqlmodel(wo_create_data=wo_create)
+        set_validators(response, work_order_etag(created_wo.id, created_wo.updated_at), created_wo.updated_at)
         return created_wo
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -52,6 +90,393 @@ async def create_work_order(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error creating work order")
 
 
+class WorkOrderBulkCreate(SQLModel):
+    items: List[WorkOrderCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS, description="待创建的工单")
+    on_conflict: BulkConflictPolicy = Field(
+        default=BulkConflictPolicy.SKIP_EXISTING,
+        description="工单号重复时的策略: skip_existing 跳过重复项 / fail_batch 整批回滚"
+    )
+
+
+class WorkOrderBulkItemResult(SQLModel):
+    index: int # 在请求 items 中的下标
+    order_number: str
+    outcome: BulkItemOutcome
+    id: Optional[uuid.UUID] = None # 仅 outcome 为 created 时有值
+
+
+class WorkOrderBulkCreateResponse(SQLModel):
+    created: List[WorkOrderRead]
+    results: List[WorkOrderBulkItemResult]
+    created_count: int
+    duplicate_count: int
+    rolled_back: bool # fail_batch 策略下因重复而整批回滚
+
+
+@router.post(
+    "/bulk",
+    response_model=WorkOrderBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_409_CONFLICT: {"model": WorkOrderBulkCreateResponse, "description": "fail_batch 策略下存在重复，整批未创建"}},
+    summary="批量创建工单 (SQLModel)"
+)
+async def bulk_create_work_orders(
+    bulk: WorkOrderBulkCreate,
+    service: WorkOrderApplicationService = Depends(get_work_order_application_service)
+) -> Any:
+    """
+    批量创建工单 (例如 ERP 班前同步)。整批在一个事务中写入，每 BULK_INSERT_CHUNK_SIZE 条一条多行 INSERT，
+    由 order_number 唯一索引识别重复，并通过 RETURNING 直接返回创建结果。
+    - **skip_existing**: 重复项被跳过，其余条目创建成功 (201)。
+    - **fail_batch**: 任一重复则整批回滚，返回 409 及每条的处理结果。
+    """
+    created, outcomes = await service.bulk_create_work_orders(
+        bulk.items, policy=bulk.on_conflict, chunk_size=BULK_INSERT_CHUNK_SIZE
+    )
+    created_ids = {wo.order_number: wo.id for wo in created}
+    results = [
+        WorkOrderBulkItemResult(
+            index=index,
+            order_number=item.order_number,
+            outcome=outcome,
+            id=created_ids.get(item.order_number) if outcome == BulkItemOutcome.CREATED else None,
+        )
+        for index, (item, outcome) in enumerate(zip(bulk.items, outcomes))
+    ]
+    rolled_back = bulk.on_conflict == BulkConflictPolicy.FAIL_BATCH and any(
+        outcome != BulkItemOutcome.CREATED for outcome in outcomes
+    )
+    response = WorkOrderBulkCreateResponse(
+        created=created,
+        results=results,
+        created_count=len(created),
+        duplicate_count=sum(
+            outcome in (BulkItemOutcome.DUPLICATE_EXISTING, BulkItemOutcome.DUPLICATE_IN_BATCH) for outcome in outcomes
+        ),
+        rolled_back=rolled_back,
+    )
+    if rolled_back:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content=jsonable_encoder(response))
+    return response
+
+
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    responses={status.HTTP_400_BAD_REQUEST: {"description": "数据流无法解析且未读取到任何数据行 (如 CSV 表头错误)"}},
+    summary="流式导入工单 (CSV / NDJSON)"
+)
+async def import_work_orders(
+    request: Request,
+    import_format: Optional[Literal["ndjson", "csv"]] = Query(
+        None, alias="format", description="上传格式；缺省时按 Content-Type 判断 (含 csv 为 CSV，否则 NDJSON)"
+    ),
+    chunk_size: int = Query(BULK_INSERT_CHUNK_SIZE, ge=1, le=5000, description="每个事务写入的有效行数"),
+    service: WorkOrderApplicationService = Depends(get_work_order_application_service)
+) -> Any:
+    """
+    导入历史工单 / ERP 导出数据。请求体按块读取、逐行解析并按 WorkOrderCreate 校验，
+    每 chunk_size 条有效数据一次多行 INSERT 并提交一个事务；内存占用与上传大小无关。
+    - **CSV**: 首行为表头，列名与导出一致 (id / created_at / updated_at / version 等由数据库生成的列会被忽略)，空单元格视为未填写。
+    - **NDJSON**: 每行一个 JSON 对象。
+    工单号已存在的行被跳过。返回汇总及逐行错误 (最多 IMPORT_MAX_REPORTED_ERRORS 条)。
+    """
+    if import_format is None:
+        import_format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    parse = iter_csv_records if import_format == "csv" else iter_ndjson_records
+    report = await service.import_work_orders(
+        parse(request.stream()), chunk_size=chunk_size, max_errors=IMPORT_MAX_REPORTED_ERRORS
+    )
+    if report.aborted is not None and report.received == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=report.aborted)
+    return report
+
+
+class WorkOrderBulkStatusUpdate(SQLModel):
+    status: OrderStatus = Field(description="目标状态")
+    ids: Optional[List[uuid.UUID]] = Field(default=None, min_length=1, max_length=BULK_MAX_ITEMS, description="工单 ID 列表")
+    filter: Optional[WorkOrderFilter] = Field(default=None, description="按条件选择工单 (与 ids 同时给出时取交集)")
+
+
+class WorkOrderBulkStatusItemResult(SQLModel):
+    id: uuid.UUID
+    outcome: BulkTransitionOutcome
+
+
+class WorkOrderBulkStatusUpdateResponse(SQLModel):
+    status: OrderStatus
+    results: List[WorkOrderBulkStatusItemResult] # 按 ids 操作时包含每个 id；仅按 filter 操作时只列出已更新的 id
+    updated_count: int
+    not_found_count: int
+    rejected_count: int
+
+
+@router.post(
+    "/bulk/status",
+    response_model=WorkOrderBulkStatusUpdateResponse,
+    summary="批量变更工单状态 (SQLModel)"
+)
+async def bulk_update_work_order_status(
+    bulk: WorkOrderBulkStatusUpdate,
+    service: WorkOrderApplicationService = Depends(get_work_order_application_service)
+) -> Any:
+    """
+    批量下达/取消等状态变更，用一条 UPDATE ... WHERE status NOT IN (...) RETURNING id 完成。
+    与单条更新相同的规则在 SQL 中执行: 已完成/已取消的工单不能转为其他状态，这些工单的结果为 rejected。
+    必须给出 ids 或至少一个 filter 条件。
+    """
+    try:
+        outcomes, rejected_count = await service.bulk_transition_status(bulk.status, ids=bulk.ids, filters=bulk.filter)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return WorkOrderBulkStatusUpdateResponse(
+        status=bulk.status,
+        results=[WorkOrderBulkStatusItemResult(id=wo_id, outcome=outcome) for wo_id, outcome in outcomes.items()],
+        updated_count=sum(outcome == BulkTransitionOutcome.UPDATED for outcome in outcomes.values()),
+        not_found_count=sum(outcome == BulkTransitionOutcome.NOT_FOUND for outcome in outcomes.values()),
+        rejected_count=rejected_count,
+    )
+
+
+class WorkOrderProgressBatch(SQLModel):
+    items: List[ProgressIncrement] = Field(min_length=1, max_length=BULK_MAX_ITEMS, description="产量增量 (同一工单可出现多次，按和累加)")
+
+
+class WorkOrderProgressItemResult(SQLModel):
+    work_order_id: uuid.UUID
+    outcome: ProgressOutcome
+
+
+class WorkOrderProgressResponse(SQLModel):
+    accepted: int # 本次接收的增量条数
+    durable: bool # 响应返回时增量是否已提交到数据库
+    results: Optional[List[WorkOrderProgressItemResult]] = None # 仅 durable=true 时返回
+
+
+@router.post(
+    "/progress",
+    response_model=WorkOrderProgressResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_200_OK: {"model": WorkOrderProgressResponse, "description": "durable=true: 增量已提交"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "durable=true 且写入未在超时内完成；增量仍在缓冲区中重试，不要重发"},
+    },
+    summary="上报生产进度 (产量/报废增量)"
+)
+async def report_work_order_progress(
+    batch: WorkOrderProgressBatch,
+    durable: bool = Query(False, description="等待增量写入数据库后再返回，并返回每个工单的处理结果"),
+) -> Any:
+    """
+    设备/产线批量上报产量与报废增量。增量先在内存中按工单合并，每 PROGRESS_FLUSH_INTERVAL_MS 或
+    缓冲工单数达到 PROGRESS_FLUSH_MAX_ORDERS 时用一条集合 UPDATE 写入；已生产数量达到计划数量时，
+    进行中的工单自动置为 COMPLETED。
+    - 默认立即返回 202: 增量在下一次刷新前仅存在于本进程内存中 (进程崩溃会丢失)。
+    - **durable=true**: 等待本批增量提交后返回 200，results 中为每个工单的结果
+      (applied / not_found / rejected: 已取消的工单不接受进度 / failed: 增量无法写入 (如累计数量超出范围)，已丢弃)。
+    """
+    future = progress_coalescer.add(batch.items, wait=durable)
+    if future is None:
+        return WorkOrderProgressResponse(accepted=len(batch.items), durable=False)
+    try:
+        outcomes = await asyncio.wait_for(asyncio.shield(future), PROGRESS_DURABLE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Progress could not be written in time; the increments stay buffered and are retried. Do not resend them.",
+        )
+    requested = dict.fromkeys(item.work_order_id for item in batch.items)
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=jsonable_encoder(WorkOrderProgressResponse(
+            accepted=len(batch.items),
+            durable=True,
+            results=[
+                # 增量为 0 的条目不会写库，视为已应用
+                WorkOrderProgressItemResult(work_order_id=wo_id, outcome=outcomes.get(wo_id, ProgressOutcome.APPLIED))
+                for wo_id in requested
+            ],
+        )),
+    )
+
+
+class WorkOrderListResponse(SQLModel): # Define a Pydantic/SQLModel for list response
+    items: List[WorkOrderRead] # List of read models
+    total: Optional[int] = None # 仅在 include_total=true 时返回
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None # 游标分页模式下的下一页游标，没有更多数据时为 None
+
+
+class WorkOrderSearchResponse(SQLModel):
+    items: List[WorkOrderRead] # 按相关度排序
+    next_cursor: Optional[str] = None # 下一页游标，没有更多结果时为 None
+
+
+def get_work_order_filter(
+    statuses: Optional[List[OrderStatus]] = Query(None, alias="status", description="工单状态，可重复传入多个值"),
+    due_from: Optional[datetime] = Query(None, description="计划完成日期起 (含)"),
+    due_to: Optional[datetime] = Query(None, description="计划完成日期止 (含)"),
+    created_from: Optional[datetime] = Query(None, description="创建时间起 (含)"),
+    created_to: Optional[datetime] = Query(None, description="创建时间止 (含)"),
+    product_name: Optional[str] = Query(None, min_length=1, max_length=100, description="产品名称 (精确匹配)"),
+) -> WorkOrderFilter:
+    """
+    列表类接口共用的过滤参数，下推到仓储层的 SQL WHERE 条件中执行。
+    """
+    if due_from and due_to and due_from > due_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="due_from must not be later than due_to.")
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="created_from must not be later than created_to.")
+    return WorkOrderFilter(
+        statuses=statuses,
+        due_from=due_from,
+        due_to=due_to,
+        created_from=created_from,
+        created_to=created_to,
+        product_name=product_name,
+    )
+
+
+def get_work_order_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=f"稀疏字段集: 逗号分隔的返回字段，如 id,order_number,status,due_date；可选 {', '.join(READ_COLUMNS)}；不传返回全部字段",
+    ),
+) -> Optional[List[str]]:
+    """
+    解析 fields 参数，返回按 WorkOrderRead 字段顺序排列、去重后的字段列表；未知字段返回 400。
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested.difference(READ_COLUMNS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(READ_COLUMNS)}.",
+        )
+    if not requested:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="fields must name at least one field.")
+    return [name for name in READ_COLUMNS if name in requested]
+
+
+@router.get(
+    "/export",
+    summary="流式导出工单 (NDJSON / CSV)",
+    response_class=StreamingResponse,
+)
+async def export_work_orders(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="导出格式: ndjson (每行一个 JSON 对象) 或 csv"),
+    sort_by: WorkOrderSortField = Query(WorkOrderSortField.CREATED_AT, description="排序字段"),
+    sort_dir: SortDirection = Query(SortDirection.ASC, description="排序方向"),
+    filters: WorkOrderFilter = Depends(get_work_order_filter),
+    include_archived: bool = Query(False, description="同时导出已归档的工单 (排在未归档工单之后，各自按排序参数排序)"),
+) -> StreamingResponse:
+    """
+    导出全部符合条件的工单，过滤参数与列表接口相同。
+    数据经服务端游标按批 (EXPORT_BATCH_SIZE) 读取并逐批写出，内存占用与导出行数无关；无需再以每页 100 条循环调用列表接口。
+    """
+    async def body() -> AsyncIterator[bytes]:
+        # The request's session is already closed once the body is streamed, so the export uses its own
+        async with work_order_application_service_scope() as service:
+            first = True
+            async for batch in service.stream_work_orders(
+                filters=filters, sort_by=sort_by, direction=sort_dir, batch_size=EXPORT_BATCH_SIZE, columns=READ_COLUMNS,
+                include_archived=include_archived,
+            ):
+                yield encode_csv(batch, include_header=first) if export_format == "csv" else encode_ndjson(batch)
+                first = False
+            if first and export_format == "csv":
+                yield encode_csv([], include_header=True)
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="work_orders.{export_format}"'},
+    )
+
+
+@router.get(
+    "/summary",
+    response_model=WorkOrderSummary,
+    summary="生产看板汇总"
+)
+async def get_work_order_summary(
+    response: Response,
+    service: WorkOrderApplicationService = Depends(get_work_order_application_service)
+) -> Any:
+    """
+    一次返回看板所需的汇总数据，代替逐页读取列表接口后在客户端统计:
+    - **status_counts**: 各状态工单数; **total**: 工单总数
+    - **overdue**: 计划完成日期已过、仍处于 PENDING / IN_PROGRESS / ON_HOLD / REOPENED 的工单数
+    - **products**: 按产品的工单数与计划数量 (全部 / 仍在流转中)
+    数据来自由数据库触发器随每次写入增量维护的汇总表，耗时与工单总数无关；不含已归档的工单。
+    """
+    response.headers["Cache-Control"] = "no-cache"
+    return await service.get_summary()
+
+
+@router.get(
+    "/search",
+    response_model=WorkOrderSearchResponse,
+    summary="搜索工单"
+)
+async def search_work_orders(
+    q: str = Query(..., min_length=SEARCH_MIN_LENGTH, max_length=100, description="搜索词 (不区分大小写)"),
+    limit: int = Query(20, ge=1, le=100, description="每页的记录数"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor (须使用相同的 q)"),
+    service: WorkOrderApplicationService = Depends(get_work_order_application_service)
+) -> Any:
+    """
+    按工单号前缀、产品名称或备注 (包含) 搜索工单，结果按相关度排序:
+    工单号完全匹配 > 工单号前缀匹配 > 产品名称包含 > 仅备注包含，同一档内按工单号排序，用 next_cursor 翻页。
+    PostgreSQL 上由 pg_trgm GIN 索引、SQLite 上由 FTS5 trigram 表支撑，只读取匹配的行；不含已归档的工单。
+    """
+    if not q.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search term must not be blank.")
+    try:
+        items, next_cursor = await service.search_work_orders(q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return WorkOrderSearchResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/events",
+    summary="工单变更推送 (Server-Sent Events)",
+    response_class=StreamingResponse,
+)
+async def work_order_events_stream(
+    statuses: Optional[List[OrderStatus]] = Query(None, alias="status", description="只推送变更前或变更后处于这些状态的工单，可重复传入多个值"),
+    product_name: Optional[str] = Query(None, min_length=1, max_length=100, description="只推送该产品的工单 (精确匹配)"),
+) -> StreamingResponse:
+    """
+    以 SSE (text/event-stream) 推送工单的 created / updated / deleted 事件，代替定时轮询列表接口。
+    updated 事件带 previous_status (变更前的状态)，按状态订阅时工单离开这些状态的变更也会推送。
+    删除事件以及批量状态变更事件只带 id (及状态)，会推送给所有订阅者。
+    收到 resync 事件 (消费过慢、积压已被丢弃) 或重新连接后，客户端应重新加载一次列表。
+    """
+    filters = EventFilter(statuses=frozenset(statuses) if statuses else None, product_name=product_name)
+
+    async def body() -> AsyncIterator[bytes]:
+        # Subscribed only once the body is streamed, so a response that is never sent leaves nothing behind
+        subscription = work_order_events.subscribe(filters)
+        try:
+            yield encode_retry()
+            while True:
+                event = await subscription.get(timeout=CHANGE_FEED_HEARTBEAT_SECONDS)
+                yield encode_keepalive() if event is None else encode_event(event)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/{wo_id}",
     response_model=WorkOrderReadFull, # Use WorkOrderRead or WorkOrderReadFull
@@ -59,42 +484,100 @@ async def create_work_order(
 )
 async def get_work_order_by_id(
     wo_id: uuid.UUID,
+    response: Response,
+    fields: Optional[List[str]] = Depends(get_work_order_fields),
+    if_none_match: Optional[str] = Header(None, description="上次响应的 ETag；未修改时返回 304"),
+    if_modified_since: Optional[str] = Header(None, description="上次响应的 Last-Modified；未修改时返回 304"),
     service: WorkOrderApplicationService = Depends(get_work_order_application_service)
 ) -> Any:
+    """
+    响应携带 ETag / Last-Modified (由 id 和 updated_at 得出)。
+    带 If-None-Match / If-Modified-Since 的请求先只查询 updated_at (或命中缓存)，未修改时直接返回 304，不读取和序列化整行。
+    传入 fields 时只返回所选字段 (整行仍来自工单缓存)，ETag 附带字段集摘要，与完整表示及其他字段集的 ETag 不同。
+    """
+    if if_none_match is not None or if_modified_since is not None:
+        last_modified = await service.get_work_order_last_modified(wo_id)
+        if last_modified is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Work Order not found")
+        etag = work_order_etag(wo_id, last_modified, fields)
+        if is_not_modified(etag, last_modified, if_none_match, if_modified_since):
+            return not_modified_response(etag, last_modified)
     work_order = await service.get_work_order_by_id(wo_id) # Service returns SQLModel WorkOrder
     if not work_order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Work Order not found")
-    return work_order
+    etag = work_order_etag(work_order.id, work_order.updated_at, fields)
+    if fields is None:
+        set_validators(response, etag, work_order.updated_at)
+        return work_order
+    sparse_response = WorkOrderJSONResponse({name: getattr(work_order, name) for name in fields})
+    set_validators(sparse_response, etag, work_order.updated_at)
+    return sparse_response
 
 
-class WorkOrderListResponse(SQLModel): # Define a Pydantic/SQLModel for list response
-    items: List[WorkOrderRead] # List of read models
-    total: int
-    skip: int
-    limit: int
-
 @router.get(
     "/",
     response_model=WorkOrderListResponse, # Use the new list response model
     summary="获取工单列表 (分页, SQLModel)"
 )
 async def list_work_orders(
-    skip: int = Query(0, ge=0, description="跳过的记录数"),
+    skip: int = Query(0, ge=0, description="跳过的记录数 (offset 分页)"),
     limit: int = Query(10, ge=1, le=100, description="每页的记录数"),
+    paging: Literal["offset", "cursor"] = Query("offset", description="分页模式: offset (默认, 兼容旧客户端) 或 cursor (keyset 游标分页)"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor；传入时自动使用游标分页"),
+    include_total: Optional[bool] = Query(None, description="是否返回符合条件的总数 total；offset 模式默认返回，cursor 模式默认不返回"),
+    sort_by: WorkOrderSortField = Query(WorkOrderSortField.CREATED_AT, description="排序字段"),
+    sort_dir: SortDirection = Query(SortDirection.ASC, description="排序方向"),
+    filters: WorkOrderFilter = Depends(get_work_order_filter),
+    fields: Optional[List[str]] = Depends(get_work_order_fields),
+    if_none_match: Optional[str] = Header(None, description="上次响应的 ETag；本页内容未变化时返回 304"),
     service: WorkOrderApplicationService = Depends(get_work_order_application_service)
 ) -> WorkOrderListResponse:
-    items = await service.get_all_work_orders(skip=skip, limit=limit) # Service returns List[WorkOrder]
-    total_count = await service.count_work_orders()
-    # Convert items to WorkOrderRead if necessary, though direct SQLModel WorkOrder might be fine
-    # if WorkOrderReadFull is the target and WorkOrder is compatible.
-    # For explicit schema, map here:
-    # read_items = [WorkOrderRead.model_validate(item) for item in items]
-    return WorkOrderListResponse(
-        items=items, # Assuming service returns List[WorkOrder] which is compatible with List[WorkOrderRead] structure
-        total=total_count,
-        skip=skip,
-        limit=limit
-    )
+    """
+    获取工单列表，支持按状态 (多选)、计划完成日期窗口、创建时间窗口、产品名称过滤，以及排序。
+    - **offset 模式**: 使用 skip/limit；翻页越深越慢，仅为兼容保留。
+    - **cursor 模式**: 按 (sort_by, id) 做 keyset 分页，用响应中的 next_cursor 请求下一页，任意深度耗时恒定。
+      翻页时需保持相同的过滤与排序参数。
+    - **total**: 无过滤或仅按状态过滤时由按状态维护的计数表得到 (不扫描工单表)；其他过滤条件需要 count(*)，
+      游标翻页时建议保持默认的 include_total=false。
+    - **ETag**: 由本页各工单的 (id, updated_at)、分页信息及 fields 计算；If-None-Match 匹配时返回 304，不序列化本页数据。
+    - 只查询 WorkOrderRead 的各列，得到的普通行由 orjson 直接序列化，不再逐条构造模型并做 response_model 校验；
+      输出与 WorkOrderListResponse 的序列化结果逐字节一致。
+    - **fields**: 稀疏字段集，SELECT 只包含所选字段 (另加计算 ETag / 游标所需的 id、updated_at 和排序字段)，
+      items 中只返回所选字段；高频轮询终端可借此减少数据库 I/O 和响应体积。
+    """
+    columns = READ_COLUMNS if fields is None else projection(fields, "id", "updated_at", sort_by.value)
+    next_cursor = None
+    use_cursor = paging == "cursor" or bool(cursor)
+    if include_total is None:
+        include_total = not use_cursor
+    if use_cursor:
+        try:
+            items, next_cursor = await service.get_work_orders_by_cursor(
+                limit=limit, cursor=cursor, filters=filters, sort_by=sort_by, direction=sort_dir, columns=columns
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        skip = 0
+    else:
+        items = await service.get_all_work_orders(
+            skip=skip, limit=limit, filters=filters, sort_by=sort_by, direction=sort_dir, columns=columns
+        ) # Projected rows in WorkOrderRead column order
+    total_count = await service.count_work_orders(filters=filters) if include_total else None
+    # fields is normalised (deduplicated, in column order), so equivalent fieldsets share an ETag
+    etag = list_etag(((item.id, item.updated_at) for item in items), total_count, skip, limit, next_cursor, fields)
+    if if_none_match is not None and is_not_modified(etag, None, if_none_match, None):
+        return not_modified_response(etag)
+    # Keys in WorkOrderListResponse field order; response_model only documents the schema here,
+    # a returned Response is sent as is.
+    response = WorkOrderJSONResponse({
+        "items": row_dicts(items, fields),
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    })
+    set_validators(response, etag)
+    return response
 
 
 @router.put(
@@ -105,14 +588,37 @@ async def list_work_orders(
 async def update_work_order(
     wo_id: uuid.UUID,
     wo_update: WorkOrderUpdate, # Use SQLModel schema for request body
+    response: Response,
+    if_match: Optional[str] = Header(None, description="GET 返回的 ETag；工单已被他人修改时返回 412，不做修改"),
     service: WorkOrderApplicationService = Depends(get_work_order_application_service)
 ) -> Any:
+    """
+    更新工单。携带 If-Match 时为乐观并发写入: ETag 对应的 updated_at 作为 UPDATE 的 WHERE 条件，
+    无需事先读取；不匹配时返回 412 Precondition Failed。
+    请求体中的 **version** (读取时的版本号) 同样在 UPDATE 的 WHERE 中比较 (version 随每次写入加 1)，
+    工单已被其他终端修改时返回 409 Conflict，客户端应重新读取后再提交。
+    """
+    expected_updated_at = None
+    if if_match is not None and if_match.strip() != "*":
+        parsed = filter(None, (parse_work_order_etag(tag) for tag in split_etags(if_match)))
+        expected_updated_at = [updated_at for tag_id, updated_at in parsed if tag_id == wo_id]
+        if not expected_updated_at:
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="If-Match does not match the current work order.")
     try:
         # Service method needs to accept WorkOrderUpdate
-        updated_wo = await service.update_work_order_sqlmodel(wo_id=wo_id, wo_update_data=wo_update)
+        updated_wo = await service.update_work_order_sqlmodel(
+            wo_id=wo_id, wo_update_data=wo_update, expected_updated_at=expected_updated_at
+        )
         if not updated_wo:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Work Order not found for update")
+        set_validators(response, work_order_etag(updated_wo.id, updated_wo.updated_at), updated_wo.updated_at)
         return updated_wo
+    except HTTPException:
+        raise
+    except WorkOrderVersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except WorkOrderModifiedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -127,12 +633,15 @@ async def update_work_order(
 )
 async def delete_work_order(
     wo_id: uuid.UUID,
+    version: Optional[int] = Query(None, ge=1, description="读取时的版本号；工单已被修改 (版本号不同) 时返回 409，不做删除"),
     service: WorkOrderApplicationService = Depends(get_work_order_application_service)
 ):
     try:
-        deleted = await service.delete_work_order(wo_id) # Service method is fine
+        deleted = await service.delete_work_order(wo_id, expected_version=version)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Work Order not found or could not be deleted")
+    except WorkOrderVersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return None
@@ -0,0 +1,40 @@
+# api/fast_json.py
+"""
+Fast serialization path for work order reads: column-projected rows (see
+work_order_queries.READ_COLUMNS) are encoded straight to JSON by orjson, skipping the
+table model -> response_model validation -> jsonable dict round trip per item.
+The output is byte-identical to the WorkOrderRead / WorkOrderListResponse responses:
+same key order, compact separators, UTF-8 text, enums by value, UUIDs as strings and
+datetimes in the same ISO 8601 form (microseconds only when non-zero, UTC as "Z").
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# OPT_UTC_Z: pydantic writes a UTC offset as "Z", orjson defaults to "+00:00"
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def row_dicts(rows: Iterable[Any], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Projected rows (sqlalchemy Row) as dicts keyed in column order; with fields, only those keys
+    (sparse fieldsets select a few extra columns for the ETag / cursor that are not returned).
+    """
+    if fields is None:
+        return [row._asdict() for row in rows]
+    return [{name: getattr(row, name) for name in fields} for row in rows]
+
+
+class WorkOrderJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson. Content must already be plain dicts/lists of JSON-native,
+    datetime, UUID or Enum values (e.g. row_dicts output); no response_model validation is applied.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,204 @@
+# api/idempotency.py
+"""
+Idempotency keys for write endpoints. A client (e.g. an edge gateway that retries on timeouts)
+sends the same key with every attempt of one logical request:
+
+    Idempotency-Key: 7f1c2e9a-0b5d-4c1e-9a51-3f1e2d4c5b6a
+
+The first attempt executes and its response is stored; later attempts get the stored response
+(with an Idempotent-Replayed: true header) without executing the endpoint again. Attempts that
+arrive while the first one is still executing wait for its response instead of running in
+parallel. Reusing a key for a different request (method, path, query or body) is answered with 422.
+Requests without the header are not affected.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.cache.idempotency_store import AbstractIdempotencyStore, StoredResponse
+from infrastructure.cache.single_flight import SingleFlight
+
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255 # idempotency_keys.key
+CLAIM_POLL_SECONDS = 0.1
+
+
+def request_fingerprint(scope: Scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b"")):
+        digest.update(part + b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def error_response(status_code: int, detail: str, headers: Iterable[Tuple[bytes, bytes]] = ()) -> StoredResponse:
+    body = orjson.dumps({"detail": detail})
+    return StoredResponse(
+        status_code,
+        [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+        body,
+        fingerprint="",
+    )
+
+
+class IdempotencyInProgress(Exception):
+    """Another worker is still executing the key after the wait."""
+
+
+class IdempotentRequests:
+    """
+    Executes the requests of one key at most once: concurrent attempts in this process share one
+    execution (single-flight); across workers the store's claim decides which one executes.
+    """
+
+    def __init__(self, store: AbstractIdempotencyStore, paths: Iterable[str], wait_seconds: float = 10):
+        self.store = store
+        self.paths: FrozenSet[str] = frozenset(paths)
+        self.wait_seconds = wait_seconds
+        self._flight = SingleFlight()
+        self.executions = 0
+        self.replays = 0
+        self.mismatches = 0
+        self.in_progress = 0 # attempts answered with 409 while another worker was executing the key
+
+    def covers(self, scope: Scope) -> bool:
+        return scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in self.paths
+
+    async def respond(self, key: str, fingerprint: str, execute) -> Tuple[StoredResponse, bool]:
+        """
+        The response for one attempt and whether it was replayed (not executed by this attempt).
+        execute runs the endpoint and returns its captured response.
+        """
+        executed = False
+
+        async def load() -> StoredResponse:
+            nonlocal executed
+            deadline = time.monotonic() + self.wait_seconds
+            while True:
+                stored = await self.store.get(key)
+                if stored is not None:
+                    return stored
+                if await self.store.claim(key, fingerprint):
+                    break
+                if time.monotonic() >= deadline:
+                    raise IdempotencyInProgress()
+                await asyncio.sleep(CLAIM_POLL_SECONDS)
+            executed = True
+            self.executions += 1
+            try:
+                response = await execute()
+            except BaseException:
+                await self.store.release(key)
+                raise
+            # 5xx: nothing was committed (the endpoint rolled back), the next retry executes again
+            if response.status_code >= 500:
+                await self.store.release(key)
+            else:
+                await self.store.complete(key, response)
+            return response
+
+        response = await self._flight.do(key, load)
+        return response, not executed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executions": self.executions,
+            "replays": self.replays,
+            "coalesced": self._flight.coalesced,
+            "mismatches": self.mismatches,
+            "in_progress": self.in_progress,
+            "store": self.store.stats(),
+        }
+
+
+async def _read_body(receive: Receive) -> Optional[bytes]:
+    """The whole request body, or None when the client disconnected while sending it."""
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _send_response(send: Send, response: StoredResponse, replayed: bool) -> None:
+    headers = list(response.headers)
+    if replayed:
+        headers.append((REPLAYED_HEADER, b"true"))
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp, requests: IdempotentRequests):
+        self.app = app
+        self.requests = requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.requests.covers(scope):
+            await self.app(scope, receive, send)
+            return
+        key = Headers(scope=scope).get(IDEMPOTENCY_KEY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_response(send, error_response(400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters."), False)
+            return
+
+        body = await _read_body(receive)
+        if body is None:
+            return
+        fingerprint = request_fingerprint(scope, body)
+
+        async def execute() -> StoredResponse:
+            # The endpoint sees the buffered body; a failing app is never stored
+            delivered = False
+
+            async def replay_receive() -> Message:
+                nonlocal delivered
+                if not delivered:
+                    delivered = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                return await receive()
+
+            start: Optional[Message] = None
+            chunks: List[bytes] = []
+
+            async def capture(message: Message) -> None:
+                nonlocal start
+                if message["type"] == "http.response.start":
+                    start = message
+                elif message["type"] == "http.response.body":
+                    chunks.append(message.get("body", b""))
+
+            await self.app(scope, replay_receive, capture)
+            if start is None:
+                raise RuntimeError("Endpoint returned without a response.")
+            return StoredResponse(start["status"], list(start.get("headers", [])), b"".join(chunks), fingerprint)
+
+        try:
+            response, replayed = await self.requests.respond(key, fingerprint, execute)
+        except IdempotencyInProgress:
+            self.requests.in_progress += 1
+            response, replayed = error_response(
+                409, "A request with this Idempotency-Key is still in progress; retry later.", [(b"retry-after", b"1")]
+            ), False
+        else:
+            if response.fingerprint != fingerprint:
+                self.requests.mismatches += 1
+                response, replayed = error_response(
+                    422, "Idempotency-Key was already used for a different request."
+                ), False
+            elif replayed:
+                self.requests.replays += 1
+        await _send_response(send, response, replayed)
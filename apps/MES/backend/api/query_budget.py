@@ -0,0 +1,57 @@
+# api/query_budget.py
+"""
+Per-request query budget: counts the statements and database time of each request and
+reports them in a Server-Timing response header, e.g.
+
+    Server-Timing: db;dur=3.412;desc="4 queries"
+
+Requests that exceed the statement budget are logged with the repository methods involved,
+so an extra lookup that sneaks into an endpoint shows up without a profiler.
+Streaming responses report the statements executed before the headers were sent.
+"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.metrics.query_budget import QueryStats, current_query_stats, log_record
+
+query_budget_logger = logging.getLogger("mes.query_budget")
+
+
+def server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.seconds * 1000:.3f};desc="{stats.count} queries"'
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app: ASGIApp, max_statements: int = 0):
+        self.app = app
+        self.max_statements = max_statements # 0: no budget, only the Server-Timing header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            if self.max_statements and stats.count > self.max_statements:
+                route = scope.get("route")
+                query_budget_logger.warning(log_record(
+                    "query_budget_exceeded",
+                    method=scope["method"],
+                    route=getattr(route, "path", None) or scope["path"],
+                    statements=stats.count,
+                    budget=self.max_statements,
+                    db_ms=round(stats.seconds * 1000, 3),
+                    repository_methods=stats.repository_methods,
+                ))
@@ -0,0 +1,57 @@
+# api/read_consistency.py
+"""
+Read-your-writes for replica routing. After a successful write (POST/PUT/PATCH/DELETE with a
+2xx/3xx status) the client gets a short-lived cookie; while it is present its reads are served
+by the primary, so a client never reads a replica that has not replayed its own write yet.
+Clients that do not keep cookies can ask for the primary explicitly per request:
+
+    X-Read-Consistency: primary
+"""
+import math
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.database.replicas import primary_reads_required
+
+READ_CONSISTENCY_HEADER = "x-read-consistency"
+PRIMARY_READS_COOKIE = "mes_read_primary_until"
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def primary_required(headers: Headers) -> bool:
+    if headers.get(READ_CONSISTENCY_HEADER, "").strip().lower() == "primary":
+        return True
+    until = cookie_parser(headers.get("cookie", "")).get(PRIMARY_READS_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, sticky_seconds: float = 5):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = primary_reads_required.set(primary_required(Headers(scope=scope)))
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and scope["method"] in WRITE_METHODS and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_READS_COOKIE}={until:.3f}; Max-Age={math.ceil(self.sticky_seconds)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            primary_reads_required.reset(token)
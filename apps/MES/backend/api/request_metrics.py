@@ -0,0 +1,55 @@
+# api/request_metrics.py
+"""
+Request latency histogram (per route template, method and status code) and in-flight gauge,
+recorded by a plain ASGI middleware: no request/response objects are built and streaming
+bodies pass through untouched, so it stays cheap enough to keep enabled in production.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.metrics.registry import REGISTRY, GaugeFamily, HistogramFamily
+
+# Route label of requests that matched no route (keeps arbitrary 404 paths out of the label values)
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUEST_DURATION = REGISTRY.register(HistogramFamily(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body has been sent, by method, route template and status code.",
+    ("method", "route", "status"),
+))
+
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(GaugeFamily(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled, by method.",
+    ("method",),
+))
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500 # unless a response is started, the request failed
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method, route_path, str(status_code))
@@ -0,0 +1,48 @@
+# api/work_order_export.py
+"""
+Row encoders for GET /work-orders/export. Each batch of projected rows (READ_COLUMNS) from the
+repository's server-side cursor is encoded into one chunk of the streaming response.
+"""
+import csv
+import io
+from enum import Enum
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from api.fast_json import dumps
+
+# Column order of CSV exports (and of CSV imports)
+EXPORT_COLUMNS: List[str] = [
+    "id", "order_number", "product_name", "quantity", "status", "due_date", "notes", "created_at", "updated_at",
+    "produced_quantity", "scrapped_quantity", "version",
+]
+
+EXPORT_MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_ndjson(batch: Sequence[Any]) -> bytes:
+    """One JSON object per line, same fields and formatting as the API's WorkOrderRead responses."""
+    return b"".join(dumps(row._asdict()) + b"\n" for row in batch)
+
+
+def encode_csv(batch: Sequence[Any], include_header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if include_header:
+        writer.writerow(EXPORT_COLUMNS)
+    for wo in batch:
+        writer.writerow([_csv_value(getattr(wo, column)) for column in EXPORT_COLUMNS])
+    return buffer.getvalue().encode()
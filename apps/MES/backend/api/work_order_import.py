@@ -0,0 +1,112 @@
+# api/work_order_import.py
+"""
+Incremental parsers for POST /work-orders/import. The request body is consumed chunk by chunk and
+turned into one record per row, so memory does not grow with the size of the upload.
+"""
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+from api.work_order_export import EXPORT_COLUMNS
+from domain.exceptions import ImportFormatError
+from infrastructure.sqlmodels.work_order import WorkOrderCreate
+
+IMPORT_COLUMNS = set(WorkOrderCreate.model_fields)
+# Columns written by the export that are generated on insert; accepted and ignored so that exports re-import
+IGNORED_COLUMNS = set(EXPORT_COLUMNS) - IMPORT_COLUMNS
+REQUIRED_COLUMNS = {name for name, field in WorkOrderCreate.model_fields.items() if field.is_required()}
+
+
+class ImportRecord(NamedTuple):
+    row: int
+    data: Optional[Dict[str, Any]] # None when the row could not be parsed
+    error: Optional[str] = None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decodes UTF-8 (optionally with BOM) incrementally and yields lines including their line break."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            # Split on "\n" only: str.splitlines would also break inside JSON strings at U+2028 etc.
+            start = 0
+            while (end := pending.find("\n", start)) != -1:
+                yield pending[start:end + 1]
+                start = end + 1
+            # The rest is an incomplete line; keep it for the next chunk
+            pending = pending[start:]
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"Upload is not valid UTF-8: {e}")
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRecord]:
+    row = 0
+    async for line in iter_lines(chunks):
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield ImportRecord(row, None, f"Invalid JSON: {e}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRecord(row, None, "Each line must be a JSON object.")
+            continue
+        yield ImportRecord(row, data)
+
+
+def _csv_header(line: str) -> List[str]:
+    header = [column.strip() for column in next(csv.reader([line]))]
+    unknown = [column for column in header if column not in IMPORT_COLUMNS | IGNORED_COLUMNS]
+    if unknown:
+        raise ImportFormatError(f"Unknown CSV columns: {unknown}.")
+    missing = sorted(REQUIRED_COLUMNS - set(header))
+    if missing:
+        raise ImportFormatError(f"CSV header is missing required columns: {missing}.")
+    return header
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRecord]:
+    """
+    The first line is the header (column names as in the export). Empty cells are treated as
+    not provided, so the model defaults apply. Quoted cells may contain line breaks: a record is
+    complete once its quotes are balanced.
+    """
+    header: Optional[List[str]] = None
+    line_number = 0
+    record, record_row = "", 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record:
+            record_row = line_number
+        record += line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        if header is None:
+            header = _csv_header(text)
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield ImportRecord(record_row, None, f"Invalid CSV: {e}")
+            continue
+        if len(values) != len(header):
+            yield ImportRecord(record_row, None, f"Expected {len(header)} columns, got {len(values)}.")
+            continue
+        yield ImportRecord(record_row, {
+            column: value for column, value in zip(header, values) if value != "" and column in IMPORT_COLUMNS
+        })
+    if record.strip():
+        yield ImportRecord(record_row, None, "Unterminated quoted field.")
+    if header is None:
+        raise ImportFormatError("CSV upload is empty (no header row).")
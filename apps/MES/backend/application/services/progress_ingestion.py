@@ -0,0 +1,163 @@
+# application/services/progress_ingestion.py
+import asyncio
+import logging
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from domain.value_objects.production_progress import ProgressIncrement, ProgressOutcome
+
+logger = logging.getLogger("mes.progress")
+
+FlushFunction = Callable[[Dict[uuid.UUID, Tuple[int, int]]], Awaitable[Dict[uuid.UUID, ProgressOutcome]]]
+Outcomes = Dict[uuid.UUID, ProgressOutcome]
+
+
+class ProgressCoalescer:
+    """
+    Write coalescing for production progress reports. Increments are summed in memory per order
+    and written by a background task as one set-based UPDATE per flush (see
+    WorkOrderApplicationService.apply_progress), every `interval_seconds` or as soon as
+    `max_orders` distinct orders are pending. Machines reporting several times per second per
+    order thus cost one row update per order and flush instead of one transaction per report.
+
+    Acknowledged increments live only in this process until the next flush: `add(wait=True)`
+    returns a future that resolves once they are committed, for callers that need durability.
+    The flush function must not fail once it has committed, so a failed flush applied nothing.
+    A flush failing with a transient error (`retryable`, e.g. the database is unreachable) puts its
+    increments (and waiting callers) back into the buffer, to be retried with the next flush;
+    increments are never applied twice. Any other error is deterministic (e.g. a total out of the
+    column's range): the batch is retried order by order, so only the failing orders are dropped,
+    with a FAILED outcome for their waiters, instead of blocking every other order forever.
+    """
+
+    def __init__(
+        self,
+        flush: FlushFunction,
+        interval_seconds: float = 0.2,
+        max_orders: int = 1000,
+        retryable: Callable[[Exception], bool] = lambda e: True,
+    ):
+        self._flush = flush
+        self.interval_seconds = interval_seconds
+        self.max_orders = max_orders
+        self.retryable = retryable
+        self._pending: Dict[uuid.UUID, List[int]] = {}
+        # Callers waiting for the write, with the outcomes of orders already written for them
+        # by an earlier, partially retried flush
+        self._waiters: List[Tuple[asyncio.Future, Outcomes]] = []
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # Counters since start-up (GET /health/diagnostics)
+        self.received = 0
+        self.flushes = 0
+        self.flushed_orders = 0
+        self.failed_flushes = 0
+        self.dropped_orders = 0
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the background task and writes what is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def add(self, increments: Iterable[ProgressIncrement], wait: bool = False) -> Optional["asyncio.Future[Dict[uuid.UUID, ProgressOutcome]]"]:
+        for increment in increments:
+            self.received += 1
+            if not increment.produced and not increment.scrapped:
+                continue
+            totals = self._pending.setdefault(increment.work_order_id, [0, 0])
+            totals[0] += increment.produced
+            totals[1] += increment.scrapped
+        future = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((future, {}))
+        if len(self._pending) >= self.max_orders or wait:
+            # Size threshold reached, or a caller waits for the write: do not wait for the interval
+            self._flush_requested.set()
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            batch, waiters = self._pending, self._waiters
+            self._pending, self._waiters = {}, []
+            if not batch:
+                self._resolve(waiters, {})
+                return
+            outcomes, retry = await self._write(batch)
+            self.flushed_orders += len(outcomes)
+            if not retry:
+                self.flushes += 1
+                self._resolve(waiters, outcomes)
+                return
+            logger.error(f"progress flush of {len(retry)} order(s) failed, retrying with the next flush")
+            for wo_id, (produced, scrapped) in retry.items():
+                totals = self._pending.setdefault(wo_id, [0, 0])
+                totals[0] += produced
+                totals[1] += scrapped
+            # Callers that gave up waiting (durable timeout) are not kept
+            self._waiters = [
+                (future, {**written, **outcomes}) for future, written in waiters if not future.done()
+            ] + self._waiters
+
+    async def _write(self, batch: Dict[uuid.UUID, List[int]]) -> Tuple[Outcomes, Dict[uuid.UUID, List[int]]]:
+        """Outcomes of the orders written (or dropped), and the orders to retry with the next flush."""
+        try:
+            outcomes = await self._flush({wo_id: (produced, scrapped) for wo_id, (produced, scrapped) in batch.items()})
+            return outcomes, {}
+        except Exception as e:
+            self.failed_flushes += 1
+            if self.retryable(e):
+                logger.warning(f"progress flush of {len(batch)} order(s) failed: {e}")
+                return {}, batch
+            if len(batch) == 1:
+                (wo_id,) = batch
+                self.dropped_orders += 1
+                logger.error(f"progress increments {batch[wo_id]} of work order {wo_id} dropped, they cannot be written: {e}")
+                return {wo_id: ProgressOutcome.FAILED}, {}
+            logger.error(f"progress flush of {len(batch)} order(s) failed, writing them one by one: {e}")
+        outcomes: Outcomes = {}
+        retry: Dict[uuid.UUID, List[int]] = {}
+        for wo_id, totals in batch.items():
+            if retry:
+                # The database became unavailable: keep the rest for the next flush
+                retry[wo_id] = totals
+                continue
+            written, failed = await self._write({wo_id: totals})
+            outcomes.update(written)
+            retry.update(failed)
+        return outcomes, retry
+
+    @staticmethod
+    def _resolve(waiters: List[Tuple[asyncio.Future, Outcomes]], outcomes: Outcomes) -> None:
+        for future, written in waiters:
+            if not future.done():
+                future.set_result({**written, **outcomes})
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_orders": len(self._pending),
+            "received": self.received,
+            "flushes": self.flushes,
+            "flushed_orders": self.flushed_orders,
+            "failed_flushes": self.failed_flushes,
+            "dropped_orders": self.dropped_orders,
+        }
@@ -1,12 +1,24 @@
 # application/services/work_order_app_service.py
+import asyncio
 import uuid
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+from datetime import datetime, timezone
 
+from pydantic import ValidationError
+
+from domain.exceptions import DuplicateWorkOrdersError, ImportFormatError, WorkOrderModifiedError, WorkOrderVersionConflictError
 from domain.repositories.work_order_repository import AbstractWorkOrderRepository
-from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.bulk_operation import (
+    BulkConflictPolicy, BulkItemOutcome, BulkTransitionOutcome, ImportReport, ImportRowError
+)
+from domain.value_objects.order_status import (
+    ACTIVE_ORDER_STATUSES, TERMINAL_ORDER_STATUSES, OrderStatus, statuses_blocked_for_transition
+)
+from domain.value_objects.production_progress import ProgressOutcome
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from domain.value_objects.work_order_summary import WorkOrderSummary
 # Import SQLModel classes; these will be the primary data carriers now
-from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderCreate, WorkOrderUpdate
+from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderArchive, WorkOrderCreate, WorkOrderUpdate
 
 
 class WorkOrderApplicationService:
@@ -18,77 +30,364 @@ class WorkOrderApplicationService:
         Creates a new work order using SQLModel.
         wo_create_data is an instance of WorkOrderCreate.
         Returns the persisted WorkOrder table model.
+        The duplicate order_number check is done by the repository's single INSERT against the unique index
+        (raises ValueError), so no separate lookup round trip is needed.
         """
-        existing_wo = await self.work_order_repo.get_by_order_number(wo_create_data.order_number)
-        if existing_wo:
-            raise ValueError(f"Work order with number '{wo_create_data.order_number}' already exists.")
-
-        # Convert WorkOrderCreate to WorkOrder (table model)
-        # SQLModel makes this easy if WorkOrderCreate contains all necessary fields
-        # or if WorkOrder has appropriate defaults (like id, created_at, updated_at).
-        
         # The WorkOrder model has default_factory for id, and DB defaults for created_at/updated_at.
         # So, we can directly create a WorkOrder instance from WorkOrderCreate.
-        # SQLModel's .model_validate should work if WorkOrderCreate is a compatible subset.
-        # Or, more explicitly:
         new_work_order_table_instance = WorkOrder.model_validate(wo_create_data)
-        # new_work_order_table_instance.id = uuid.uuid4() # If not using default_factory in model
         # created_at and updated_at will be handled by the database as per Alembic migration.
 
         return await self.work_order_repo.add(new_work_order_table_instance)
 
+    async def bulk_create_work_orders(
+        self,
+        items: List[WorkOrderCreate],
+        policy: BulkConflictPolicy = BulkConflictPolicy.SKIP_EXISTING,
+        chunk_size: int = 1000,
+    ) -> Tuple[List[WorkOrder], List[BulkItemOutcome]]:
+        """
+        Creates a batch of work orders in one transaction.
+        Returns the created WorkOrder table models and one outcome per input item (same order as items).
+        Duplicates within the batch keep their first occurrence; duplicates of existing orders are detected
+        by the database's unique index rather than a lookup per item.
+        With FAIL_BATCH any duplicate rejects the whole batch and nothing is created.
+        """
+        outcomes: List[Optional[BulkItemOutcome]] = [None] * len(items)
+        seen_numbers = set()
+        unique_items: List[Tuple[int, WorkOrderCreate]] = []
+        for index, item in enumerate(items):
+            if item.order_number in seen_numbers:
+                outcomes[index] = BulkItemOutcome.DUPLICATE_IN_BATCH
+            else:
+                seen_numbers.add(item.order_number)
+                unique_items.append((index, item))
+
+        if policy == BulkConflictPolicy.FAIL_BATCH and len(unique_items) < len(items):
+            return [], [outcome or BulkItemOutcome.NOT_CREATED for outcome in outcomes]
+
+        try:
+            # The validated create payloads go straight to the INSERT; building a WorkOrder table model per row costs more than the insert
+            created = await self.work_order_repo.add_many(
+                [item for _, item in unique_items],
+                chunk_size=chunk_size,
+                all_or_nothing=policy == BulkConflictPolicy.FAIL_BATCH,
+            )
+        except DuplicateWorkOrdersError as e:
+            duplicates = set(e.order_numbers)
+            for index, item in unique_items:
+                outcomes[index] = (
+                    BulkItemOutcome.DUPLICATE_EXISTING if item.order_number in duplicates else BulkItemOutcome.NOT_CREATED
+                )
+            return [], outcomes
+
+        created_numbers = {wo.order_number for wo in created}
+        for index, item in unique_items:
+            outcomes[index] = (
+                BulkItemOutcome.CREATED if item.order_number in created_numbers else BulkItemOutcome.DUPLICATE_EXISTING
+            )
+        return created, outcomes
+
+    async def import_work_orders(
+        self,
+        records: AsyncIterator[Any],
+        chunk_size: int = 1000,
+        max_errors: int = 1000,
+    ) -> ImportReport:
+        """
+        Imports a stream of parsed rows (objects with row / data / error, see api.work_order_import).
+        Rows are validated one by one against WorkOrderCreate and written every chunk_size valid rows,
+        one transaction per chunk, via the bulk insert path (existing order numbers are skipped and reported).
+        Only the current chunk and at most max_errors error entries are held in memory.
+        """
+        report = ImportReport()
+        pending: List[Tuple[int, WorkOrderCreate]] = []
+
+        def reject(row: int, order_number: Optional[str], outcome: BulkItemOutcome, detail: str) -> None:
+            if len(report.errors) < max_errors:
+                report.errors.append(ImportRowError(row=row, order_number=order_number, outcome=outcome, detail=detail))
+            else:
+                report.errors_truncated = True
+
+        async def flush() -> None:
+            if not pending:
+                return
+            created, outcomes = await self.bulk_create_work_orders(
+                [item for _, item in pending], policy=BulkConflictPolicy.SKIP_EXISTING, chunk_size=chunk_size
+            )
+            report.created += len(created)
+            report.chunks_committed += 1
+            for (row, item), outcome in zip(pending, outcomes):
+                if outcome != BulkItemOutcome.CREATED:
+                    report.duplicates += 1
+                    reject(row, item.order_number, outcome, f"Work order with number '{item.order_number}' already exists.")
+            pending.clear()
+
+        try:
+            async for record in records:
+                report.received += 1
+                if record.error is not None:
+                    report.invalid += 1
+                    reject(record.row, None, BulkItemOutcome.INVALID, record.error)
+                    continue
+                try:
+                    item = WorkOrderCreate.model_validate(record.data)
+                except ValidationError as e:
+                    report.invalid += 1
+                    detail = "; ".join(
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                    )
+                    order_number = record.data.get("order_number")
+                    reject(record.row, order_number if isinstance(order_number, str) else None, BulkItemOutcome.INVALID, detail)
+                    continue
+                pending.append((record.row, item))
+                if len(pending) >= chunk_size:
+                    await flush()
+        except ImportFormatError as e:
+            # Rows read before the stream broke are still written
+            report.aborted = str(e)
+        await flush()
+        return report
+
     async def get_work_order_by_id(self, wo_id: uuid.UUID) -> Optional[WorkOrder]:
         """Returns a WorkOrder table model instance."""
         return await self.work_order_repo.get_by_id(wo_id)
 
-    async def get_all_work_orders(self, skip: int = 0, limit: int = 100) -> List[WorkOrder]:
-        """Returns a list of WorkOrder table model instances."""
-        return await self.work_order_repo.list_all(skip=skip, limit=limit)
+    async def get_work_order_last_modified(self, wo_id: uuid.UUID) -> Optional[datetime]:
+        """Returns only updated_at (for conditional GETs), or None if the order does not exist."""
+        return await self.work_order_repo.get_updated_at(wo_id)
+
+    async def get_all_work_orders(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[WorkOrder]:
+        """
+        Returns a list of WorkOrder table model instances,
+        or plain rows of only the given columns (fast serialization path).
+        """
+        return await self.work_order_repo.list_all(
+            skip=skip, limit=limit, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    async def get_work_orders_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        """
+        Returns one keyset page of WorkOrder table model instances (or plain rows of the given columns)
+        and the cursor of the next page.
+        Raises ValueError for an invalid cursor.
+        """
+        return await self.work_order_repo.list_by_cursor(
+            limit=limit, cursor=cursor, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
 
     async def update_work_order_sqlmodel(
         self,
         wo_id: uuid.UUID,
-        wo_update_data: WorkOrderUpdate
+        wo_update_data: WorkOrderUpdate,
+        expected_updated_at: Optional[List[datetime]] = None,
     ) -> Optional[WorkOrder]:
         """
         Updates a work order using SQLModel.
         wo_update_data is an instance of WorkOrderUpdate.
-        Returns the updated WorkOrder table model instance.
+        Returns the updated WorkOrder table model instance, or None if it does not exist.
+        The status rules are pushed into the repository's single UPDATE (WHERE status NOT IN ...) and the
+        order_number uniqueness is enforced by the unique index; the order is only read again when the
+        UPDATE matched nothing, to tell "not found" from "rejected by rule".
+        expected_updated_at (from If-Match) makes the update conditional; WorkOrderModifiedError is
+        raised when the order has changed since. wo_update_data.version does the same with the version
+        number (compare-and-swap in the UPDATE's WHERE clause) and raises WorkOrderVersionConflictError.
+        Archived orders are read-only (ValueError).
         """
-        # The repository's update method now handles applying WorkOrderUpdate to the fetched WorkOrder
-        
-        # Business logic before update (e.g., status change validation) can be here:
+        blocked_from = []
+        if wo_update_data.status is not None:
+            blocked_from = statuses_blocked_for_transition(wo_update_data.status)
+        expected_version = wo_update_data.version
+
+        updated_wo = await self.work_order_repo.update(
+            wo_id, wo_update_data, blocked_from=blocked_from, expected_updated_at=expected_updated_at,
+            expected_version=expected_version,
+        )
+        if updated_wo is not None:
+            return updated_wo
+
         current_wo = await self.work_order_repo.get_by_id(wo_id)
         if not current_wo:
             return None # Or raise not found
+        if isinstance(current_wo, WorkOrderArchive):
+            raise ValueError("Work order is archived and can no longer be changed.")
+        if expected_updated_at is not None and current_wo.updated_at not in expected_updated_at:
+            raise WorkOrderModifiedError(wo_id)
+        if expected_version is not None and current_wo.version != expected_version:
+            raise WorkOrderVersionConflictError(wo_id, expected_version, current_wo.version)
+        if current_wo.status == OrderStatus.COMPLETED:
+            raise ValueError("Cannot change status of a completed order via this generic update. Use a specific operation.")
+        if current_wo.status == OrderStatus.CANCELLED:
+            raise ValueError("Cannot change status of a cancelled order.")
+        # The status changed between the UPDATE and the read above
+        raise ValueError("Work order was modified concurrently, please retry.")
 
-        if wo_update_data.status is not None:
-            # Example of domain logic:
-            if current_wo.status == OrderStatus.COMPLETED and wo_update_data.status != OrderStatus.COMPLETED:
-                raise ValueError("Cannot change status of a completed order via this generic update. Use a specific operation.")
-            if current_wo.status == OrderStatus.CANCELLED and wo_update_data.status != OrderStatus.CANCELLED:
-                raise ValueError("Cannot change status of a cancelled order.")
-        
-        if wo_update_data.order_number and wo_update_data.order_number != current_wo.order_number:
-            existing_wo_with_new_number = await self.work_order_repo.get_by_order_number(wo_update_data.order_number)
-            if existing_wo_with_new_number and existing_wo_with_new_number.id != wo_id:
-                 raise ValueError(f"Work order with number '{wo_update_data.order_number}' already exists.")
+    async def bulk_transition_status(
+        self,
+        target: OrderStatus,
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+    ) -> Tuple[Dict[uuid.UUID, BulkTransitionOutcome], int]:
+        """
+        Moves many work orders to `target` with one set-based UPDATE. The same status rules as
+        update_work_order_sqlmodel apply (completed/cancelled orders keep their status), enforced in SQL.
+        Returns per-id outcomes and the number of orders rejected by the status rules.
+        With explicit ids every id gets an outcome; with only a filter just the updated ids are listed.
+        """
+        if ids is None and (filters is None or filters.is_empty()):
+            raise ValueError("Either ids or at least one filter condition is required for a bulk status change.")
 
+        blocked_from = statuses_blocked_for_transition(target)
+        unique_ids = list(dict.fromkeys(ids)) if ids is not None else None
+        updated_ids = await self.work_order_repo.update_status_many(
+            target, blocked_from, ids=unique_ids, filters=filters
+        )
+        outcomes = {wo_id: BulkTransitionOutcome.UPDATED for wo_id in updated_ids}
 
-        # The repository update method now takes wo_id and WorkOrderUpdate
-        return await self.work_order_repo.update(wo_id, wo_update_data)
+        if unique_ids is not None:
+            missing = [wo_id for wo_id in unique_ids if wo_id not in outcomes]
+            existing = set(await self.work_order_repo.find_existing_ids(missing)) if missing else set()
+            for wo_id in missing:
+                outcomes[wo_id] = BulkTransitionOutcome.REJECTED if wo_id in existing else BulkTransitionOutcome.NOT_FOUND
+            # Keep the request order
+            outcomes = {wo_id: outcomes[wo_id] for wo_id in unique_ids}
+            rejected_count = sum(outcome == BulkTransitionOutcome.REJECTED for outcome in outcomes.values())
+            return outcomes, rejected_count
 
+        # Filter only: the rejected orders are the ones matching the filter but sitting in a blocked status
+        if filters.statuses:
+            blocked_statuses = [s for s in filters.statuses if s in blocked_from]
+        else:
+            blocked_statuses = blocked_from
+        rejected_count = 0
+        if blocked_statuses:
+            rejected_count = await self.work_order_repo.count_all(
+                filters=filters.model_copy(update={"statuses": blocked_statuses})
+            )
+        return outcomes, rejected_count
 
-    async def delete_work_order(self, wo_id: uuid.UUID) -> bool:
-        """Deletes a work order. Returns True if successful."""
-        # Add business logic if needed, e.g., check status before deletion
+    async def apply_progress(
+        self,
+        increments: Mapping[uuid.UUID, Tuple[int, int]],
+        auto_complete: bool = True,
+        chunk_size: int = 1000,
+    ) -> Dict[uuid.UUID, ProgressOutcome]:
+        """
+        Adds coalesced (produced, scrapped) increments per order with set-based UPDATEs.
+        Cancelled orders no longer accept progress. With auto_complete, active orders whose produced
+        quantity reaches the planned quantity are moved to COMPLETED in the same statement.
+        Nothing is read after the UPDATEs commit: a failure past that point would make the caller
+        (ProgressCoalescer) retry increments that were already applied. Which orders exist is read
+        beforehand instead, to tell rejected from unknown orders.
+        """
+        rejected_from = [OrderStatus.CANCELLED]
+        complete_from = list(ACTIVE_ORDER_STATUSES) if auto_complete else []
+        ids = list(increments)
+        existing = set()
+        for start in range(0, len(ids), chunk_size):
+            existing.update(await self.work_order_repo.find_existing_ids(ids[start:start + chunk_size]))
+        updated = await self.work_order_repo.apply_progress(
+            increments, rejected_from=rejected_from, complete_from=complete_from, chunk_size=chunk_size
+        )
+        outcomes = {wo.id: ProgressOutcome.APPLIED for wo in updated}
+        for wo_id in ids:
+            if wo_id not in outcomes:
+                outcomes[wo_id] = ProgressOutcome.REJECTED if wo_id in existing else ProgressOutcome.NOT_FOUND
+        return outcomes
+
+    async def delete_work_order(self, wo_id: uuid.UUID, expected_version: Optional[int] = None) -> bool:
+        """
+        Deletes a work order. Returns True if successful.
+        The in-progress guard (and the expected_version check, if given) is part of the DELETE statement;
+        the order is only read back when nothing was deleted, to tell "not found" from "in progress" /
+        "changed since" (WorkOrderVersionConflictError).
+        """
+        if await self.work_order_repo.delete(wo_id, blocked_from=[OrderStatus.IN_PROGRESS], expected_version=expected_version):
+            return True
         work_order_to_delete = await self.work_order_repo.get_by_id(wo_id)
+        if isinstance(work_order_to_delete, WorkOrderArchive):
+            raise ValueError("Work order is archived and can no longer be deleted.")
+        if work_order_to_delete and expected_version is not None and work_order_to_delete.version != expected_version:
+            raise WorkOrderVersionConflictError(wo_id, expected_version, work_order_to_delete.version)
         if work_order_to_delete and work_order_to_delete.status == OrderStatus.IN_PROGRESS:
             raise ValueError("Cannot delete a work order that is currently in progress.")
-        
-        return await self.work_order_repo.delete(wo_id)
+        return False
+
+    async def archive_work_orders(
+        self,
+        older_than: datetime,
+        batch_size: int = 1000,
+        max_batches: Optional[int] = None,
+        pause_seconds: float = 0,
+    ) -> int:
+        """
+        Moves COMPLETED / CANCELLED orders last changed before older_than to the archive, batch_size
+        orders per transaction, until none are left (or max_batches batches were moved).
+        Each batch only locks its own rows for the duration of one DELETE + INSERT; pause_seconds
+        between batches leaves room for the regular write traffic. Returns the number of archived orders.
+        """
+        archived = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            archived_ids = await self.work_order_repo.archive_terminal(
+                older_than, TERMINAL_ORDER_STATUSES, batch_size=batch_size
+            )
+            archived += len(archived_ids)
+            batches += 1
+            if len(archived_ids) < batch_size:
+                break
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
+        return archived
+
+    def stream_work_orders(
+        self,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[WorkOrder]]:
+        """
+        Streams all matching work orders (or plain rows of the given columns) in batches (for exports);
+        with include_archived the matching archived orders follow the hot ones.
+        """
+        return self.work_order_repo.stream_all(
+            filters=filters, sort_by=sort_by, direction=direction, batch_size=batch_size, columns=columns,
+            include_archived=include_archived,
+        )
+
+    async def search_work_orders(
+        self, term: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        """
+        Ranked search over order number (prefix), product name and notes (substring), case-insensitive.
+        Raises ValueError for an invalid cursor.
+        """
+        return await self.work_order_repo.search(term.strip(), limit=limit, cursor=cursor)
+
+    async def get_summary(self) -> WorkOrderSummary:
+        """Dashboard aggregates as of now (overdue: active orders whose due date has passed)."""
+        return await self.work_order_repo.summarize(datetime.now(timezone.utc).replace(tzinfo=None))
 
-    async def count_work_orders(self) -> int:
-        """Counts all work orders."""
-        return await self.work_order_repo.count_all()
+    async def count_work_orders(self, filters: Optional[WorkOrderFilter] = None) -> int:
+        """Counts all work orders matching the optional filters."""
+        return await self.work_order_repo.count_all(filters=filters)
 
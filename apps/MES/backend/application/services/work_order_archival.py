@@ -0,0 +1,72 @@
+# application/services/work_order_archival.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("mes.archive")
+
+
+def archive_cutoff(after_days: float) -> datetime:
+    """Terminal orders last changed before this (naive UTC, like the stored timestamps) are archived."""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=after_days)
+
+
+class WorkOrderArchiver:
+    """
+    Runs the archival job (see WorkOrderApplicationService.archive_work_orders) in the background
+    every `interval_seconds`; with an interval of 0 it never runs in the service process and the
+    job is scheduled externally instead (python -m maintenance.work_orders archive).
+    Several workers may run it at the same time: every batch skips the rows another archiver holds.
+    """
+
+    def __init__(self, archive: Callable[[], Awaitable[int]], interval_seconds: float = 0):
+        self._archive = archive
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        # Counters since start-up (GET /health/diagnostics)
+        self.runs = 0
+        self.archived = 0
+        self.failed_runs = 0
+        self.last_run_at: Optional[datetime] = None
+
+    async def start(self) -> None:
+        if self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_once()
+
+    async def run_once(self) -> int:
+        try:
+            archived = await self._archive()
+        except Exception as e:
+            self.failed_runs += 1
+            logger.error(f"work order archival failed, retrying in {self.interval_seconds}s: {e}")
+            return 0
+        self.runs += 1
+        self.archived += archived
+        self.last_run_at = datetime.now(timezone.utc)
+        if archived:
+            logger.info(f"archived {archived} work order(s)")
+        return archived
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.interval_seconds > 0,
+            "runs": self.runs,
+            "archived": self.archived,
+            "failed_runs": self.failed_runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
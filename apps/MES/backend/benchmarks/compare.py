@@ -0,0 +1,69 @@
+# benchmarks/compare.py
+"""
+Diffs two benchmark reports. Results are matched on (driver, scenario, concurrency); a result
+is a regression when throughput dropped, or p95/p99 latency grew, by more than the threshold,
+or when it has errors the baseline did not have.
+"""
+from typing import Any, Dict, List, Tuple
+
+ResultKey = Tuple[str, str, int]
+
+# metric -> True when higher is better
+COMPARED_METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+}
+# Only these may flag a regression (p50 is reported but is too noisy on its own)
+REGRESSION_METRICS = ("throughput_rps", "p95_ms", "p99_ms")
+
+
+def _key(result: Dict[str, Any]) -> ResultKey:
+    return result["driver"], result["scenario"], result["concurrency"]
+
+
+def relative_change(baseline: float, current: float) -> float:
+    if not baseline:
+        return 0.0
+    return (current - baseline) / baseline
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> Dict[str, Any]:
+    baseline_results = {_key(result): result for result in baseline["results"]}
+    current_results = {_key(result): result for result in current["results"]}
+    rows: List[Dict[str, Any]] = []
+    for key, result in current_results.items():
+        base = baseline_results.get(key)
+        if base is None:
+            continue
+        changes: Dict[str, Any] = {}
+        reasons: List[str] = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if base.get(metric) is None or result.get(metric) is None:
+                continue
+            change = relative_change(base[metric], result[metric])
+            changes[metric] = {"baseline": base[metric], "current": result[metric], "change": round(change, 4)}
+            worse = -change if higher_is_better else change
+            if metric in REGRESSION_METRICS and worse > threshold:
+                reasons.append(f"{metric} {change:+.1%}")
+        if result.get("errors", 0) > base.get("errors", 0):
+            reasons.append(f"errors {base.get('errors', 0)} -> {result['errors']}")
+        driver, scenario, concurrency = key
+        rows.append({
+            "driver": driver,
+            "scenario": scenario,
+            "concurrency": concurrency,
+            "metrics": changes,
+            "regression": bool(reasons),
+            "reasons": reasons,
+        })
+    return {
+        "threshold": threshold,
+        "baseline_meta": baseline.get("meta"),
+        "current_meta": current.get("meta"),
+        "results": rows,
+        "only_in_baseline": [list(key) for key in baseline_results.keys() - current_results.keys()],
+        "only_in_current": [list(key) for key in current_results.keys() - baseline_results.keys()],
+        "regressions": sum(row["regression"] for row in rows),
+    }
@@ -0,0 +1,280 @@
+# benchmarks/runner.py
+"""
+Load scenarios for the work order API and the two drivers that run them:
+- asgi: httpx.AsyncClient over ASGITransport, the app in this process (no network, no server),
+  which isolates the cost of FastAPI / pydantic / the repositories;
+- uvicorn: a real uvicorn server in a subprocess, driven over loopback HTTP.
+Every scenario sends a fixed number of requests from `concurrency` concurrent workers and
+records the latency of each request.
+"""
+import asyncio
+import contextlib
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from benchmarks.seed import STATUS_CYCLE, bench_id, bench_row
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.work_order_query import SortDirection, WorkOrderSortField
+from infrastructure.repositories.work_order_queries import encode_cursor
+
+API = "/api/v1/work-orders/"
+
+# Seed positions whose status accepts plain field updates (not a terminal status)
+UPDATABLE_OFFSETS = [offset for offset, value in enumerate(STATUS_CYCLE) if value == OrderStatus.PENDING]
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Any] = None
+    expected_status: int = 200
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Builds the i-th request of a run; `context` carries data prepared before timing starts
+    build: Callable[[int, Dict[str, Any]], Request]
+    prepare: Optional[Callable[[httpx.AsyncClient, int], Awaitable[Dict[str, Any]]]] = None
+
+
+@dataclass
+class ScenarioResult:
+    driver: str
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    seconds: float
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "driver": self.driver,
+            "scenario": self.scenario,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "throughput_rps": round(self.requests / self.seconds, 1) if self.seconds else None,
+            "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else None,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "max_ms": round(ordered[-1], 3) if ordered else None,
+        }
+
+
+def percentile(ordered: Sequence[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sample."""
+    if not ordered:
+        return None
+    rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+    return round(ordered[rank], 3)
+
+
+def scenarios(rows: int, depths: Sequence[int], page_size: int, run_id: str) -> List[Scenario]:
+    """The scenarios of one run; list scenarios are repeated for every paging depth."""
+    rng = random.Random(42)
+
+    def create(index: int, context: Dict[str, Any]) -> Request:
+        payload = {"order_number": f"BENCHNEW-{run_id}-{index}", "product_name": "bench", "quantity": 1 + index % 100}
+        return Request("POST", API, json=payload, expected_status=201)
+
+    def get(index: int, context: Dict[str, Any]) -> Request:
+        return Request("GET", f"{API}{bench_id(rng.randrange(rows))}")
+
+    def update(index: int, context: Dict[str, Any]) -> Request:
+        cycles = max(rows // len(STATUS_CYCLE), 1)
+        position = rng.randrange(cycles) * len(STATUS_CYCLE) + UPDATABLE_OFFSETS[index % len(UPDATABLE_OFFSETS)]
+        return Request("PUT", f"{API}{bench_id(min(position, rows - 1))}", json={"quantity": 1 + index % 500})
+
+    async def prepare_delete(client: httpx.AsyncClient, requests: int) -> Dict[str, Any]:
+        # Orders to delete are created up front through the bulk endpoint, outside the timed section
+        numbers = [f"BENCHDEL-{run_id}-{index}" for index in range(requests)]
+        ids: List[str] = []
+        for start in range(0, requests, 1000):
+            items = [{"order_number": number, "product_name": "bench", "quantity": 1} for number in numbers[start:start + 1000]]
+            response = await client.post(f"{API}bulk", json={"items": items})
+            response.raise_for_status()
+            ids.extend(item["id"] for item in response.json()["created"])
+        return {"ids": ids}
+
+    def delete(index: int, context: Dict[str, Any]) -> Request:
+        return Request("DELETE", f"{API}{context['ids'][index]}", expected_status=204)
+
+    result = [
+        Scenario("create", create),
+        Scenario("get", get),
+        Scenario("update", update),
+        Scenario("delete", delete, prepare_delete),
+    ]
+    for depth in depths:
+        if depth >= rows:
+            continue
+        result.append(Scenario(
+            f"list_offset_depth_{depth}",
+            lambda index, context, depth=depth: Request("GET", API, params={"skip": depth, "limit": page_size}),
+        ))
+
+        async def prepare_cursor(client: httpx.AsyncClient, requests: int, depth: int = depth) -> Dict[str, Any]:
+            return {"cursor": cursor_at(depth)}
+
+        result.append(Scenario(
+            f"list_cursor_depth_{depth}",
+            lambda index, context: Request("GET", API, params={"paging": "cursor", "limit": page_size, "cursor": context["cursor"]}),
+            prepare_cursor,
+        ))
+    return result
+
+
+def cursor_at(depth: int) -> Optional[str]:
+    """
+    Cursor of a page starting after `depth` rows in the default (created_at, id) order. Seeded rows
+    are the oldest rows, so the position is known without paging there.
+    """
+    if depth == 0:
+        return None
+    last = bench_row(depth - 1)
+    return encode_cursor(WorkOrderSortField.CREATED_AT, SortDirection.ASC, SimpleNamespace(**last))
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    driver: str,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int = 20,
+) -> ScenarioResult:
+    context = await scenario.prepare(client, requests + warmup) if scenario.prepare else {}
+    for index in range(requests, requests + warmup):
+        await send(client, scenario.build(index, context))
+    result = ScenarioResult(driver, scenario.name, concurrency, requests, 0, 0.0)
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            request = scenario.build(index, context)
+            started = time.perf_counter()
+            status_code = await send(client, request)
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            if status_code != request.expected_status:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+async def send(client: httpx.AsyncClient, request: Request) -> int:
+    try:
+        response = await client.request(request.method, request.url, params=request.params, json=request.json)
+        return response.status_code
+    except httpx.HTTPError:
+        return -1
+
+
+@contextlib.asynccontextmanager
+async def asgi_client(concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    import main
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client(concurrency: int, workers: int = 1) -> AsyncIterator[httpx.AsyncClient]:
+    """Starts `uvicorn main:app` with this process' environment (DATABASE_URL etc.) and stops it afterwards."""
+    port = free_port()
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+    ]
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen(command, cwd=backend_dir, env=dict(os.environ))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become ready within 30 seconds")
+                await asyncio.sleep(0.2)
+            yield client
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+DRIVERS = {
+    "asgi": asgi_client,
+    "uvicorn": uvicorn_client,
+}
+
+
+async def run(
+    drivers: Sequence[str],
+    rows: int,
+    requests: int,
+    concurrency_levels: Sequence[int],
+    depths: Sequence[int],
+    page_size: int = 100,
+    only: Optional[Sequence[str]] = None,
+    uvicorn_workers: int = 1,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for driver in drivers:
+        for concurrency in concurrency_levels:
+            client_factory = DRIVERS[driver]
+            options = {"workers": uvicorn_workers} if driver == "uvicorn" else {}
+            async with client_factory(concurrency, **options) as client:
+                run_id = uuid.uuid4().hex[:8]
+                for scenario in scenarios(rows, depths, page_size, run_id):
+                    if only and not any(scenario.name.startswith(prefix) for prefix in only):
+                        continue
+                    result = await run_scenario(client, driver, scenario, requests, concurrency)
+                    summary = result.summary()
+                    print(
+                        f"{driver:8} c={concurrency:<4} {scenario.name:28} {summary['throughput_rps']:>9} req/s "
+                        f"p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms p99={summary['p99_ms']}ms errors={summary['errors']}",
+                        file=sys.stderr, flush=True,
+                    )
+                    results.append(summary)
+    return results
+
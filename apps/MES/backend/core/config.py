@@ -0,0 +1,73 @@
+# core/config.py
+import os
+from dotenv import load_dotenv
+
+# 应用级可调参数，统一从 .env / 环境变量读取 (数据库连接相关配置见 infrastructure/database/connection.py)
+load_dotenv()
+
+# 批量创建: 每条多行 INSERT 包含的行数。
+# 每行 9 列，PostgreSQL 单条语句最多 32767 个绑定参数，因此不宜超过 3000。
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", "1000"))
+
+# 单次批量请求允许的最大条目数
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+# 导入: 响应中最多列出的逐行错误数 (计数不受影响)
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+# 导出: 服务端游标每批读取的行数 (同时也是每次写出响应的行数)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# 工单查询缓存 (按 id / 工单号的进程内 LRU + TTL 读穿透缓存)
+# 多进程部署时其他进程的写入最多在 TTL 秒后可见
+WORK_ORDER_CACHE_ENABLED = os.getenv("WORK_ORDER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+WORK_ORDER_CACHE_MAX_ENTRIES = int(os.getenv("WORK_ORDER_CACHE_MAX_ENTRIES", "10000"))
+WORK_ORDER_CACHE_TTL_SECONDS = float(os.getenv("WORK_ORDER_CACHE_TTL_SECONDS", "10"))
+
+# 查询预算与慢查询日志
+# 单条 SQL 执行超过该毫秒数时记录一条结构化 (JSON) 慢查询日志 (含 SQL 与发起的仓储方法)；0 关闭
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# 单个请求执行的 SQL 条数超过该值时记录告警日志；0 表示不设预算 (仍返回 Server-Timing 响应头)
+QUERY_BUDGET_MAX_STATEMENTS = int(os.getenv("QUERY_BUDGET_MAX_STATEMENTS", "10"))
+
+# 工单变更推送 (GET /work-orders/events, Server-Sent Events)
+# - CHANGE_FEED_BACKEND: memory (只推送本进程的写入) 或 postgres (LISTEN/NOTIFY, 多 worker 共享同一推送流)
+# - CHANGE_FEED_QUEUE_SIZE: 每个订阅者最多积压的事件数; 消费过慢时丢弃积压并发送一条 resync 事件
+# - CHANGE_FEED_HEARTBEAT_SECONDS: 无事件时发送心跳注释的间隔，防止代理断开空闲连接
+CHANGE_FEED_BACKEND = os.getenv("CHANGE_FEED_BACKEND", "memory").lower()
+CHANGE_FEED_CHANNEL = os.getenv("CHANGE_FEED_CHANNEL", "work_order_events")
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "1000"))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+
+# 生产进度上报 (POST /work-orders/progress): 增量先在内存中按工单合并，再批量写入
+# - PROGRESS_FLUSH_INTERVAL_MS: 合并写入的间隔
+# - PROGRESS_FLUSH_MAX_ORDERS: 待写入的工单数达到该值时立即写入 (也是每条 UPDATE 包含的工单数上限)
+# - PROGRESS_AUTO_COMPLETE: 已生产数量达到计划数量时自动转为 COMPLETED
+# - PROGRESS_DURABLE_TIMEOUT_SECONDS: durable=true 的请求等待写入的最长时间，超时返回 503
+PROGRESS_FLUSH_INTERVAL_MS = float(os.getenv("PROGRESS_FLUSH_INTERVAL_MS", "200"))
+PROGRESS_FLUSH_MAX_ORDERS = int(os.getenv("PROGRESS_FLUSH_MAX_ORDERS", "1000"))
+PROGRESS_AUTO_COMPLETE = os.getenv("PROGRESS_AUTO_COMPLETE", "true").lower() in ("1", "true", "yes")
+PROGRESS_DURABLE_TIMEOUT_SECONDS = float(os.getenv("PROGRESS_DURABLE_TIMEOUT_SECONDS", "30"))
+
+# 终态工单归档 (冷热分离): COMPLETED / CANCELLED 且超过保留期未修改的工单分批移入 work_orders_archive
+# - ARCHIVE_AFTER_DAYS: 终态工单在热表中保留的天数 (按 updated_at)
+# - ARCHIVE_BATCH_SIZE: 每个事务移动的工单数，批次越小锁持有时间越短
+# - ARCHIVE_BATCH_PAUSE_MS: 两批之间的停顿，给正常写入让出时间
+# - ARCHIVE_INTERVAL_SECONDS: 进程内后台归档任务的运行间隔; 0 表示不在服务进程中运行 (改用 python -m maintenance.work_orders archive 定时执行)
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+ARCHIVE_BATCH_PAUSE_MS = float(os.getenv("ARCHIVE_BATCH_PAUSE_MS", "100"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "0"))
+
+# 幂等键 (Idempotency-Key 请求头): 创建 / 批量写入接口的重试直接返回首次请求的响应，不会重复写入
+# - IDEMPOTENCY_STORE: memory (进程内 LRU; 重试落到其他 worker 时会再次执行) 或 database (idempotency_keys 表, 多 worker 共享)
+# - IDEMPOTENCY_TTL_SECONDS: 响应保留时间，之后同一个 key 视为新请求
+# - IDEMPOTENCY_MAX_ENTRIES: 进程内保留的响应数上限 (database 模式下作为读缓存)
+# - IDEMPOTENCY_LOCK_SECONDS: database 模式下执行中请求的租约，worker 异常退出后其他 worker 可在租约到期后接管该 key
+# - IDEMPOTENCY_WAIT_SECONDS: 同一个 key 正在其他 worker 上执行时等待其响应的最长时间，超时返回 409
+IDEMPOTENCY_ENABLED = os.getenv("IDEMPOTENCY_ENABLED", "true").lower() in ("1", "true", "yes")
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "memory").lower()
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
@@ -1,19 +1,147 @@
 # core/dependencies.py
+from contextlib import asynccontextmanager
+import uuid
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
 from sqlmodel import Session # Import Session from sqlmodel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends
 
 from domain.repositories.work_order_repository import AbstractWorkOrderRepository
 from infrastructure.repositories.sqlmodel_work_order_repository import SQLModelWorkOrderRepository # Import new repo
-from infrastructure.database.connection import get_session # Import get_session
+from infrastructure.repositories.async_sqlmodel_work_order_repository import AsyncSQLModelWorkOrderRepository
+from infrastructure.repositories.cached_work_order_repository import CachedWorkOrderRepository, WorkOrderCache
+from infrastructure.repositories.replica_routing_work_order_repository import ReplicaRoutingWorkOrderRepository
+from infrastructure.repositories.event_publishing_work_order_repository import EventPublishingWorkOrderRepository
+from infrastructure.repositories.work_order_queries import DIALECT_INSERTS
+from infrastructure.events.work_order_events import WorkOrderEventBroadcaster
+from infrastructure.cache.cache_backend import InMemoryLRUCacheBackend
+from infrastructure.cache.idempotency_store import AbstractIdempotencyStore, DatabaseIdempotencyStore, InMemoryIdempotencyStore
+from core.config import WORK_ORDER_CACHE_ENABLED, WORK_ORDER_CACHE_MAX_ENTRIES, WORK_ORDER_CACHE_TTL_SECONDS
+from core.config import CHANGE_FEED_BACKEND, CHANGE_FEED_CHANNEL, CHANGE_FEED_QUEUE_SIZE
+from core.config import PROGRESS_AUTO_COMPLETE, PROGRESS_FLUSH_INTERVAL_MS, PROGRESS_FLUSH_MAX_ORDERS
+from core.config import IDEMPOTENCY_ENABLED, IDEMPOTENCY_LOCK_SECONDS, IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_STORE, IDEMPOTENCY_TTL_SECONDS
+from core.config import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_PAUSE_MS, ARCHIVE_BATCH_SIZE, ARCHIVE_INTERVAL_SECONDS
+from infrastructure.database.connection import DATABASE_URL, DATABASE_SESSION_MODE, engine, async_engine, read_replicas, async_read_replicas
+from infrastructure.database.connection import is_transient_database_error
 from application.services.work_order_app_service import WorkOrderApplicationService
+from application.services.progress_ingestion import ProgressCoalescer
+from application.services.work_order_archival import WorkOrderArchiver, archive_cutoff
+from domain.value_objects.production_progress import ProgressOutcome
 
-def get_work_order_repository(session: Session = Depends(get_session)) -> AbstractWorkOrderRepository:
+def check_database_dialect(dialect_name: str) -> None:
+    """
+    The repositories create work orders with INSERT ... ON CONFLICT DO NOTHING, which only the
+    PostgreSQL and SQLite dialects provide; any other backend is rejected once at startup
+    instead of failing every create with a 500.
+    """
+    if dialect_name not in DIALECT_INSERTS:
+        raise ValueError(
+            f"Unsupported database dialect '{dialect_name}'; DATABASE_URL must point to one of: {', '.join(DIALECT_INSERTS)}."
+        )
+
+check_database_dialect(engine.dialect.name)
+
+# 进程内共享的工单查询缓存；替换为共享缓存时只需换成另一个 AbstractCacheBackend 实现
+work_order_cache: Optional[WorkOrderCache] = (
+    WorkOrderCache(InMemoryLRUCacheBackend(max_entries=WORK_ORDER_CACHE_MAX_ENTRIES, ttl_seconds=WORK_ORDER_CACHE_TTL_SECONDS))
+    if WORK_ORDER_CACHE_ENABLED else None
+)
+
+
+def build_work_order_event_broadcaster() -> WorkOrderEventBroadcaster:
+    if CHANGE_FEED_BACKEND == "postgres":
+        from infrastructure.events.postgres_notify import PostgresNotifyBroadcaster
+        return PostgresNotifyBroadcaster(DATABASE_URL, channel=CHANGE_FEED_CHANNEL, max_queue=CHANGE_FEED_QUEUE_SIZE)
+    if CHANGE_FEED_BACKEND != "memory":
+        raise ValueError(f"CHANGE_FEED_BACKEND must be 'memory' or 'postgres', got '{CHANGE_FEED_BACKEND}'.")
+    return WorkOrderEventBroadcaster(max_queue=CHANGE_FEED_QUEUE_SIZE)
+
+# 工单变更推送: 仓储的写操作提交后发布事件，由 GET /work-orders/events 的订阅者接收
+work_order_events = build_work_order_event_broadcaster()
+
+@asynccontextmanager
+async def open_session() -> AsyncIterator[Union[AsyncSession, Session]]:
+    """
+    Opens a database session for the configured DATABASE_SESSION_MODE.
+    - async (default): an AsyncSession whose I/O is awaited on the event loop.
+    - sync: the original blocking Session, kept selectable for benchmarking.
+    Both use expire_on_commit=False, which keeps returned objects readable after commit
+    without an implicit reload query per object.
+    """
+    if DATABASE_SESSION_MODE == "sync":
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+    else:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+@asynccontextmanager
+async def open_read_session() -> AsyncIterator[Optional[Union[AsyncSession, Session]]]:
+    """
+    Opens a session on the next read replica (round-robin), or yields None when no replicas
+    are configured or the request has to read its client's own writes from the primary.
+    """
+    if DATABASE_SESSION_MODE == "sync":
+        if not read_replicas.reads_enabled():
+            yield None
+            return
+        with Session(read_replicas.next(), expire_on_commit=False) as session:
+            yield session
+    else:
+        if not async_read_replicas.reads_enabled():
+            yield None
+            return
+        async with AsyncSession(async_read_replicas.next(), expire_on_commit=False) as session:
+            yield session
+
+async def get_session() -> AsyncIterator[Union[AsyncSession, Session]]:
+    """
+    Dependency to get a database session (see open_session).
+    """
+    async with open_session() as session:
+        yield session
+
+async def get_read_session() -> AsyncIterator[Optional[Union[AsyncSession, Session]]]:
+    """
+    Dependency to get a read replica session, or None (see open_read_session).
+    """
+    async with open_read_session() as session:
+        yield session
+
+def get_work_order_repository(
+    session: Union[AsyncSession, Session] = Depends(get_session),
+    read_session: Optional[Union[AsyncSession, Session]] = Depends(get_read_session),
+) -> AbstractWorkOrderRepository:
     """
     Dependency to get the SQLModel-based work order repository instance.
     It requires a database session, which is also injected by FastAPI.
     """
+    return build_work_order_repository(session, read_session)
+
+def build_sql_repository(session: Union[AsyncSession, Session]) -> AbstractWorkOrderRepository:
+    """Repository matching the session type."""
+    if isinstance(session, AsyncSession):
+        return AsyncSQLModelWorkOrderRepository(session=session)
     return SQLModelWorkOrderRepository(session=session)
 
+def build_work_order_repository(
+    session: Union[AsyncSession, Session],
+    read_session: Optional[Union[AsyncSession, Session]] = None,
+) -> AbstractWorkOrderRepository:
+    """
+    Repository matching the session type; with a read_session, read-only methods go to the
+    replica behind it. Committed writes are published to the change feed, and point lookups
+    go through the shared read-through cache when WORK_ORDER_CACHE_ENABLED.
+    """
+    repo = build_sql_repository(session)
+    if read_session is not None:
+        repo = ReplicaRoutingWorkOrderRepository(repo, build_sql_repository(read_session))
+    repo = EventPublishingWorkOrderRepository(repo, work_order_events)
+    if work_order_cache is not None:
+        # Cache misses served by a replica are not stored (see WorkOrderCache)
+        return CachedWorkOrderRepository(repo, work_order_cache, reads_from_replica=read_session is not None)
+    return repo
+
 def get_work_order_application_service(
     repo: AbstractWorkOrderRepository = Depends(get_work_order_repository)
 ) -> WorkOrderApplicationService:
@@ -21,3 +149,60 @@ def get_work_order_application_service(
     Gets the WorkOrderApplicationService with its dependencies injected.
     """
     return WorkOrderApplicationService(work_order_repo=repo)
+
+@asynccontextmanager
+async def work_order_application_service_scope() -> AsyncIterator[WorkOrderApplicationService]:
+    """
+    A service on its own session, for work that outlives the request's dependencies:
+    FastAPI closes yield-dependencies before a StreamingResponse body is sent.
+    """
+    async with open_session() as session, open_read_session() as read_session:
+        yield WorkOrderApplicationService(work_order_repo=build_work_order_repository(session, read_session))
+
+
+async def flush_progress(increments: Dict[uuid.UUID, Tuple[int, int]]) -> Dict[uuid.UUID, ProgressOutcome]:
+    """Writes one coalesced batch of production progress on its own session."""
+    async with work_order_application_service_scope() as service:
+        return await service.apply_progress(
+            increments, auto_complete=PROGRESS_AUTO_COMPLETE, chunk_size=PROGRESS_FLUSH_MAX_ORDERS
+        )
+
+# 生产进度上报的合并写入缓冲 (进程内; 由 main.py 的 lifespan 启动/停止后台写入任务)
+progress_coalescer = ProgressCoalescer(
+    flush_progress, interval_seconds=PROGRESS_FLUSH_INTERVAL_MS / 1000, max_orders=PROGRESS_FLUSH_MAX_ORDERS,
+    retryable=is_transient_database_error,
+)
+
+
+async def archive_work_orders(
+    after_days: float = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Moves terminal orders older than after_days to the archive table, on its own session."""
+    async with work_order_application_service_scope() as service:
+        return await service.archive_work_orders(
+            archive_cutoff(after_days),
+            batch_size=batch_size,
+            max_batches=max_batches,
+            pause_seconds=ARCHIVE_BATCH_PAUSE_MS / 1000,
+        )
+
+# 终态工单的后台归档任务 (ARCHIVE_INTERVAL_SECONDS 为 0 时不启动)
+work_order_archiver = WorkOrderArchiver(archive_work_orders, interval_seconds=ARCHIVE_INTERVAL_SECONDS)
+
+
+def build_idempotency_store() -> AbstractIdempotencyStore:
+    memory = InMemoryIdempotencyStore(
+        InMemoryLRUCacheBackend(max_entries=IDEMPOTENCY_MAX_ENTRIES, ttl_seconds=IDEMPOTENCY_TTL_SECONDS)
+    )
+    if IDEMPOTENCY_STORE == "database":
+        return DatabaseIdempotencyStore(
+            open_session, ttl_seconds=IDEMPOTENCY_TTL_SECONDS, lock_seconds=IDEMPOTENCY_LOCK_SECONDS, memory=memory
+        )
+    if IDEMPOTENCY_STORE != "memory":
+        raise ValueError(f"IDEMPOTENCY_STORE must be 'memory' or 'database', got '{IDEMPOTENCY_STORE}'.")
+    return memory
+
+# Idempotency-Key 请求的响应存储 (由 main.py 的 IdempotencyMiddleware 使用)
+idempotency_store: Optional[AbstractIdempotencyStore] = build_idempotency_store() if IDEMPOTENCY_ENABLED else None
@@ -0,0 +1,41 @@
+# domain/exceptions.py
+from typing import Iterable
+
+
+class DuplicateWorkOrdersError(ValueError):
+    """
+    批量写入时工单号与已有工单冲突。
+    继承 ValueError，未专门处理时与单条创建的重复校验一样映射为 400。
+    """
+    def __init__(self, order_numbers: Iterable[str]):
+        self.order_numbers = sorted(set(order_numbers))
+        super().__init__(f"Work orders with numbers {self.order_numbers} already exist.")
+
+
+class ImportFormatError(ValueError):
+    """
+    导入数据流本身无法解析 (表头缺少必填列、未知列、编码错误等)，无法继续逐行处理。
+    """
+
+
+class WorkOrderModifiedError(ValueError):
+    """
+    条件更新 (If-Match) 失败: 工单在客户端读取之后已被修改。
+    """
+    def __init__(self, work_order_id):
+        self.work_order_id = work_order_id
+        super().__init__(f"Work order {work_order_id} has been modified since it was read.")
+
+
+class WorkOrderVersionConflictError(WorkOrderModifiedError):
+    """
+    按版本号的条件写入失败: 工单的当前版本号已不是客户端读取时的版本 (其他终端先写入了)，映射为 409。
+    """
+    def __init__(self, work_order_id, expected_version: int, current_version: int):
+        self.work_order_id = work_order_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+        ValueError.__init__(
+            self,
+            f"Work order {work_order_id} is at version {current_version}, not {expected_version}; reload it and retry.",
+        )
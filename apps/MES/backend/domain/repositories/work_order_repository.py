@@ -1,8 +1,12 @@
 # domain/repositories/work_order_repository.py
 import abc
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
 from domain.entities.work_order import WorkOrder
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from domain.value_objects.work_order_summary import WorkOrderSummary
 
 class AbstractWorkOrderRepository(abc.ABC):
     """
@@ -11,6 +15,9 @@ class AbstractWorkOrderRepository(abc.ABC):
 
     @abc.abstractmethod
     async def get_by_id(self, id: uuid.UUID) -> Optional[WorkOrder]:
+        """
+        按 id 查询工单；热表中不存在时再查归档表 (归档工单只读)。get_by_order_number / get_updated_at 同理。
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -18,17 +25,172 @@ class AbstractWorkOrderRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def update(self, work_order: WorkOrder) -> Optional[WorkOrder]:
+    async def add_many(self, work_orders: List[WorkOrder], chunk_size: int = 1000, all_or_nothing: bool = False) -> List[WorkOrder]:
+        """
+        在单个事务中批量插入工单 (可直接传入创建请求模型，无需逐条构造表模型)，返回实际创建的工单；工单号已存在的条目被跳过。
+        all_or_nothing=True 时只要存在重复就整体回滚并抛出 DuplicateWorkOrdersError。
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def delete(self, id: uuid.UUID) -> bool:
+    async def update(
+        self,
+        work_order_id: uuid.UUID,
+        work_order_update_data,
+        blocked_from: Optional[List[OrderStatus]] = None,
+        expected_updated_at: Optional[List[datetime]] = None,
+        expected_version: Optional[int] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> Optional[WorkOrder]:
+        """
+        单条 UPDATE ... RETURNING 更新工单，version 随之加 1。工单不存在、当前状态属于 blocked_from，
+        给定 expected_updated_at 而当前 updated_at 不在其中 (If-Match)，或给定 expected_version 而当前版本号不同时
+        不做修改并返回 None。版本号在同一条 UPDATE 的 WHERE 中比较 (比较并交换)，无需 SELECT ... FOR UPDATE。
+        传入 previous_statuses 时写入被更新工单修改前的状态 {工单 id: 状态} (见 update_status_many)。
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def list_all(self, skip: int = 0, limit: int = 100) -> List[WorkOrder]:
+    async def get_updated_at(self, id: uuid.UUID) -> Optional[datetime]:
+        """
+        只查询工单的 updated_at (ETag / Last-Modified 的来源)，工单不存在时返回 None。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_status_many(
+        self,
+        target: OrderStatus,
+        blocked_from: List[OrderStatus],
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[uuid.UUID]:
+        """
+        用一条 UPDATE 把匹配 ids/filters 且当前状态不在 blocked_from 中的工单改为 target，返回被更新的 id。
+        传入 previous_statuses 时写入被更新工单修改前的状态 {工单 id: 状态}：PostgreSQL 上由同一条 UPDATE ... FROM
+        (SELECT id, status ... FOR UPDATE) ... RETURNING 返回，SQLite 上在同一事务中先读取；不传则不额外读取。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def apply_progress(
+        self,
+        increments: Mapping[uuid.UUID, Tuple[int, int]],
+        rejected_from: Sequence[OrderStatus] = (),
+        complete_from: Sequence[OrderStatus] = (),
+        chunk_size: int = 1000,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[WorkOrder]:
+        """
+        在单个事务中把 {工单 id: (新增生产数量, 新增报废数量)} 累加到 produced_quantity / scrapped_quantity
+        (每块一条 UPDATE)；当前状态属于 rejected_from 的工单不修改。累加后已生产数量达到计划数量、
+        且当前状态属于 complete_from 的工单在同一条语句中转为 COMPLETED。返回被更新的工单。
+        传入 previous_statuses 时写入被更新工单修改前的状态 (见 update_status_many)。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def find_existing_ids(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        """
+        返回 ids 中存在的工单 id (含已归档的工单)。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def archive_terminal(
+        self,
+        older_than: datetime,
+        statuses: Sequence[OrderStatus],
+        batch_size: int = 1000,
+    ) -> List[uuid.UUID]:
+        """
+        在一个短事务中把最多 batch_size 张状态属于 statuses 且 updated_at 早于 older_than 的工单
+        从热表移到归档表，返回被归档的 id；返回空列表表示没有待归档的工单。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(
+        self, id: uuid.UUID, blocked_from: Optional[List[OrderStatus]] = None, expected_version: Optional[int] = None
+    ) -> bool:
+        """
+        用一条 DELETE 删除当前状态不在 blocked_from 中 (给定 expected_version 时还须版本号一致) 的工单；
+        工单不存在、状态不允许或版本号不同时返回 False。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[WorkOrder]:
+        """
+        偏移分页。指定 columns 时只查询这些列，返回按列名访问的普通行 (不构造模型实例)。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stream_all(
+        self,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[WorkOrder]]:
+        """
+        按批 (每批最多 batch_size 条) 流式返回全部符合条件的工单，基于服务端游标，内存占用与总行数无关。
+        指定 columns 时每批为只含这些列的普通行。include_archived=True 时在热表数据之后继续返回归档表中符合条件的工单。
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
     async def get_by_order_number(self, order_number: str) -> Optional[WorkOrder]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[WorkOrder], Optional[str]]:
+        """
+        全文搜索 (不区分大小写)：工单号以 term 开头、产品名称或备注包含 term 的工单，按相关度
+        (工单号完全匹配 > 工单号前缀 > 产品名称 > 备注) 再按工单号排序，游标分页，返回 (当前页工单, 下一页游标)。
+        不含已归档的工单。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def summarize(self, now: datetime) -> WorkOrderSummary:
+        """
+        看板汇总 (各状态工单数、截至 now 的逾期数、按产品的工单数与计划数量)，读取由触发器增量维护的汇总表，
+        耗时与工单总数无关。不含已归档的工单。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def count_all(self, filters: Optional[WorkOrderFilter] = None) -> int:
+        """
+        符合过滤条件的工单总数。无过滤或仅按状态过滤时读取按状态维护的计数表，其余情况执行 count(*)。
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        """
+        游标 (keyset) 分页，返回 (当前页工单, 下一页游标)；没有更多数据时游标为 None。
+        指定 columns 时返回只含这些列的普通行，columns 须包含排序字段和 id。
+        """
+        raise NotImplementedError
@@ -0,0 +1,58 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+class BulkConflictPolicy(str, Enum):
+    """
+    批量创建遇到重复工单号时的处理策略
+    """
+
+    SKIP_EXISTING = "skip_existing" # 跳过重复项，其余照常创建
+    FAIL_BATCH = "fail_batch" # 任一重复则整批回滚
+
+
+class BulkItemOutcome(str, Enum):
+    """
+    批量操作中单个条目的处理结果
+    """
+
+    CREATED = "created" # 已创建
+    DUPLICATE_EXISTING = "duplicate_existing" # 与数据库中已有工单号重复
+    DUPLICATE_IN_BATCH = "duplicate_in_batch" # 与同批次中更早的条目重复
+    NOT_CREATED = "not_created" # 本身无冲突，但整批被回滚 (fail_batch)
+    INVALID = "invalid" # 数据格式或字段校验失败 (导入)
+
+
+class BulkTransitionOutcome(str, Enum):
+    """
+    批量状态变更中单个工单的处理结果
+    """
+
+    UPDATED = "updated" # 已更新
+    NOT_FOUND = "not_found" # 工单不存在
+    REJECTED = "rejected" # 违反状态规则 (已完成/已取消的工单不能转为其他状态)
+
+
+class ImportRowError(BaseModel):
+    """
+    导入时未创建的一行
+    """
+    row: int = Field(description="行号 (从 1 开始，CSV 的表头为第 1 行)")
+    order_number: Optional[str] = Field(default=None, description="工单号 (能解析出时)")
+    outcome: BulkItemOutcome
+    detail: str
+
+
+class ImportReport(BaseModel):
+    """
+    导入结果汇总。errors 最多保留 max_errors 条，超出时 errors_truncated=True (计数仍然准确)。
+    """
+    received: int = 0 # 读取到的数据行数
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    chunks_committed: int = 0 # 已提交的事务 (分块) 数
+    errors: List[ImportRowError] = Field(default_factory=list)
+    errors_truncated: bool = False
+    aborted: Optional[str] = None # 数据流无法继续解析时的原因；此前已提交的分块保留
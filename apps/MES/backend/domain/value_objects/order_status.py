@@ -11,4 +11,25 @@ class OrderStatus(str,Enum):
     CANCELLED = "CANCELLED" # 已取消
     FAILED = "FAILED" # 失败
     ON_HOLD = "ON_HOLD" # 暂停
-    REOPENED = "REOPENED" # 重新打开
\ No newline at end of file
+    REOPENED = "REOPENED" # 重新打开
+
+# 仍在车间流转中的状态 (非终态)，部分索引与看板查询以此为准
+ACTIVE_ORDER_STATUSES = (
+    OrderStatus.PENDING,
+    OrderStatus.IN_PROGRESS,
+    OrderStatus.ON_HOLD,
+    OrderStatus.REOPENED,
+)
+
+# 终态: 通用更新只能保持原状态，不能再转到其他状态
+TERMINAL_ORDER_STATUSES = (
+    OrderStatus.COMPLETED,
+    OrderStatus.CANCELLED,
+)
+
+def statuses_blocked_for_transition(target: OrderStatus) -> list[OrderStatus]:
+    """
+    返回不允许转换到 target 的当前状态 (已完成/已取消的工单只能保持原状态)。
+    供单条与批量状态变更共用，批量变更时直接下推为 SQL 的 status NOT IN (...) 条件。
+    """
+    return [status for status in TERMINAL_ORDER_STATUSES if status != target]
@@ -0,0 +1,26 @@
+import uuid
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+# produced_quantity / scrapped_quantity 为 INTEGER (PostgreSQL int4) 列，单次增量不能超过其上限
+PROGRESS_INCREMENT_MAX = 2**31 - 1
+
+class ProgressIncrement(BaseModel):
+    """
+    设备上报的一次生产进度增量 (相对上次上报的新增数量，而不是累计值)
+    """
+    work_order_id: uuid.UUID = Field(description="工单 ID")
+    produced: int = Field(default=0, ge=0, le=PROGRESS_INCREMENT_MAX, description="新增生产数量")
+    scrapped: int = Field(default=0, ge=0, le=PROGRESS_INCREMENT_MAX, description="新增报废数量")
+
+
+class ProgressOutcome(str, Enum):
+    """
+    合并写入后单个工单的处理结果
+    """
+
+    APPLIED = "applied" # 已累加 (可能同时自动完工)
+    NOT_FOUND = "not_found" # 工单不存在
+    REJECTED = "rejected" # 工单已取消，不再接受进度
+    FAILED = "failed" # 增量无法写入 (如累计数量超出列的范围)，已丢弃
@@ -0,0 +1,42 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from domain.value_objects.order_status import OrderStatus
+
+class WorkOrderSortField(str, Enum):
+    """
+    工单列表排序字段 (均有 (字段, id) 复合索引或唯一索引支撑，可用于游标分页)
+    """
+
+    CREATED_AT = "created_at" # 创建时间
+    UPDATED_AT = "updated_at" # 最后更新时间
+    ORDER_NUMBER = "order_number" # 工单号
+    DUE_DATE = "due_date" # 计划完成日期 (可为空, 空值视为最大值)
+
+
+class SortDirection(str, Enum):
+    """
+    排序方向
+    """
+
+    ASC = "asc" # 升序
+    DESC = "desc" # 降序
+
+
+class WorkOrderFilter(BaseModel):
+    """
+    工单列表过滤条件，所有条件之间为 AND 关系；未设置的条件不参与过滤。
+    时间窗口均为闭区间。
+    """
+    statuses: Optional[List[OrderStatus]] = Field(default=None, description="工单状态 (多选, 任一匹配)")
+    due_from: Optional[datetime] = Field(default=None, description="计划完成日期起")
+    due_to: Optional[datetime] = Field(default=None, description="计划完成日期止")
+    created_from: Optional[datetime] = Field(default=None, description="创建时间起")
+    created_to: Optional[datetime] = Field(default=None, description="创建时间止")
+    product_name: Optional[str] = Field(default=None, max_length=100, description="产品名称 (精确匹配)")
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from domain.value_objects.order_status import OrderStatus
+
+class ProductSummary(BaseModel):
+    """
+    单个产品的工单汇总
+    """
+    product_name: str
+    order_count: int = 0 # 工单数 (未归档)
+    planned_quantity: int = 0 # 计划数量合计
+    active_order_count: int = 0 # 仍在车间流转中的工单数
+    active_planned_quantity: int = 0 # 仍在车间流转中的计划数量合计
+
+
+class WorkOrderSummary(BaseModel):
+    """
+    生产看板汇总 (不含已归档的工单)
+    """
+    as_of: datetime = Field(description="统计时间 (逾期以此为准)")
+    total: int = 0
+    status_counts: Dict[OrderStatus, int] = Field(default_factory=dict, description="各状态工单数")
+    overdue: int = Field(default=0, description="计划完成日期已过而仍处于活动状态的工单数")
+    products: List[ProductSummary] = Field(default_factory=list, description="按产品的工单数与计划数量，按产品名称排序")
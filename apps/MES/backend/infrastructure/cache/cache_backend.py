@@ -0,0 +1,96 @@
+# infrastructure/cache/cache_backend.py
+"""
+Cache backends for read-through caches. The interface is async so that a shared backend
+(e.g. Redis) can be swapped in for the in-process one without changing its callers.
+"""
+import abc
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache backend since start-up."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0 # entries dropped because the cache was full (LRU)
+    expirations: int = 0 # entries dropped because their TTL had passed
+    size: int = 0
+
+
+class AbstractCacheBackend(abc.ABC):
+    """
+    Key/value cache backend interface.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the cached value, or None on a miss (missing or expired)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, *keys: Hashable) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stats(self) -> CacheStats:
+        raise NotImplementedError
+
+
+class InMemoryLRUCacheBackend(AbstractCacheBackend):
+    """
+    Bounded in-process cache: least recently used entries are evicted once max_entries is reached,
+    and every entry expires ttl_seconds after it was stored.
+    Single event loop only (no locking); values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 10.0):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stats = CacheStats()
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def delete(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        self._stats.size = len(self._entries)
+        return CacheStats(**vars(self._stats))
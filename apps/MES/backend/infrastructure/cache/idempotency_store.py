@@ -0,0 +1,218 @@
+# infrastructure/cache/idempotency_store.py
+"""
+Stores for the responses of requests sent with an Idempotency-Key header (see api/idempotency.py).
+A key is first claimed by the request that executes it, then completed with its response; a retry
+of the same key is answered from the stored response.
+- InMemoryIdempotencyStore: per-process LRU + TTL. Retries that reach another worker execute again.
+- DatabaseIdempotencyStore: the idempotency_keys table, shared by all workers; the claim is an
+  atomic upsert, so only one worker executes a key. Completed responses are also kept in memory.
+"""
+import abc
+import inspect
+import json
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, update
+from sqlmodel import select
+
+from infrastructure.cache.cache_backend import InMemoryLRUCacheBackend
+from infrastructure.database.sql_functions import db_now
+from infrastructure.repositories.work_order_queries import DIALECT_INSERTS
+from infrastructure.sqlmodels.idempotency import IdempotencyRecord
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A captured response and the fingerprint of the request that produced it."""
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    fingerprint: str
+
+
+class AbstractIdempotencyStore(abc.ABC):
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        """The completed response of key, or None (unknown, expired or still executing)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        """
+        Reserves key for execution by the caller. False while another worker holds an unexpired
+        claim or a completed response for it.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def release(self, key: str) -> None:
+        """Drops the caller's claim without a response, so the next retry executes again."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class InMemoryIdempotencyStore(AbstractIdempotencyStore):
+    """
+    Completed responses in a bounded in-process cache. Claims always succeed: concurrent requests
+    of one process are coalesced by the middleware before they get here.
+    """
+
+    def __init__(self, cache: InMemoryLRUCacheBackend):
+        self.cache = cache
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        return await self.cache.get(key)
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        return True
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        await self.cache.set(key, response)
+
+    async def release(self, key: str) -> None:
+        await self.cache.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "memory": vars(self.cache.stats())}
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _resolve(value: Any) -> Any:
+    # Session methods return plain values, AsyncSession methods awaitables
+    return await value if inspect.isawaitable(value) else value
+
+
+def _encode_headers(headers: List[Tuple[bytes, bytes]]) -> str:
+    return json.dumps([[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers])
+
+
+def _decode_headers(headers: Optional[str]) -> List[Tuple[bytes, bytes]]:
+    return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(headers or "[]")]
+
+
+class DatabaseIdempotencyStore(AbstractIdempotencyStore):
+    """
+    Keys in the idempotency_keys table, on sessions from open_session (sync or async).
+    A claim expires after lock_seconds, after which another worker may take the key over
+    (the worker holding it crashed); a completed response expires after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        open_session: Callable[[], AbstractAsyncContextManager],
+        ttl_seconds: float = 86400,
+        lock_seconds: float = 60,
+        memory: Optional[InMemoryIdempotencyStore] = None,
+    ):
+        self.open_session = open_session
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.memory = memory
+        self.claims = 0
+        self.claim_conflicts = 0
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        if self.memory is not None:
+            response = await self.memory.get(key)
+            if response is not None:
+                return response
+        statement = select(IdempotencyRecord).where(
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.status_code.is_not(None),
+            IdempotencyRecord.expires_at > _utc_now(),
+        )
+        async with self.open_session() as session:
+            record = (await _resolve(session.exec(statement))).first()
+        if record is None:
+            return None
+        return StoredResponse(record.status_code, _decode_headers(record.headers), record.body or b"", record.request_hash)
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        now = _utc_now()
+        async with self.open_session() as session:
+            insert = DIALECT_INSERTS.get(session.get_bind().dialect.name)
+            if insert is None:
+                raise NotImplementedError(f"Idempotency keys are not supported for database dialect '{session.get_bind().dialect.name}'.")
+            statement = insert(IdempotencyRecord).values(
+                key=key,
+                request_hash=fingerprint,
+                locked_until=now + timedelta(seconds=self.lock_seconds),
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+            )
+            # 已过期的 key 或持有者租约已过期的执行中 key 可被重新占用；其余情况冲突时不更新、不返回行
+            statement = statement.on_conflict_do_update(
+                index_elements=[IdempotencyRecord.key],
+                set_={
+                    "request_hash": statement.excluded.request_hash,
+                    "status_code": None,
+                    "headers": None,
+                    "body": None,
+                    "locked_until": statement.excluded.locked_until,
+                    "expires_at": statement.excluded.expires_at,
+                    "created_at": db_now(),
+                },
+                where=or_(
+                    IdempotencyRecord.expires_at <= now,
+                    and_(IdempotencyRecord.status_code.is_(None), IdempotencyRecord.locked_until <= now),
+                ),
+            ).returning(IdempotencyRecord.key)
+            claimed = (await _resolve(session.exec(statement))).first() is not None
+            await _resolve(session.commit())
+        if claimed:
+            self.claims += 1
+        else:
+            self.claim_conflicts += 1
+        return claimed
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        statement = (
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key, IdempotencyRecord.request_hash == response.fingerprint)
+            .values(
+                status_code=response.status_code,
+                headers=_encode_headers(response.headers),
+                body=response.body,
+                locked_until=None,
+            )
+        )
+        async with self.open_session() as session:
+            await _resolve(session.exec(statement))
+            await _resolve(session.commit())
+        if self.memory is not None:
+            await self.memory.complete(key, response)
+
+    async def release(self, key: str) -> None:
+        statement = delete(IdempotencyRecord).where(IdempotencyRecord.key == key, IdempotencyRecord.status_code.is_(None))
+        async with self.open_session() as session:
+            await _resolve(session.exec(statement))
+            await _resolve(session.commit())
+
+    async def purge_expired(self) -> int:
+        """Deletes the expired keys; returns how many were removed."""
+        statement = delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= _utc_now())
+        async with self.open_session() as session:
+            result = await _resolve(session.exec(statement))
+            await _resolve(session.commit())
+        return result.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "database",
+            "claims": self.claims,
+            "claim_conflicts": self.claim_conflicts,
+            "memory": vars(self.memory.cache.stats()) if self.memory is not None else None,
+        }
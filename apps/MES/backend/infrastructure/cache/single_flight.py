@@ -0,0 +1,50 @@
+# infrastructure/cache/single_flight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _LeaderCancelled:
+    """Result handed to waiters when the call they joined was cancelled; they retry on their own."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the load, callers arriving
+    while it is in flight await its result instead of issuing the same query again.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0 # calls served by another caller's in-flight load
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            in_flight = self._calls.get(key)
+            if in_flight is None:
+                break
+            self.coalesced += 1
+            result = await asyncio.shield(in_flight)
+            if not isinstance(result, _LeaderCancelled):
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            future.set_result(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception() # mark as retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget_all(self) -> None:
+        """Loads already in flight finish for their current waiters, but later callers start a fresh load."""
+        self._calls.clear()
@@ -1,7 +1,16 @@
 # infrastructure/database/connection.py
 import os
+from typing import Any, Dict, List
 from dotenv import load_dotenv
-from sqlmodel import create_engine, Session # Import Session from sqlmodel
+from sqlalchemy import exc, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine, Session, SQLModel # Import Session from sqlmodel
+
+from infrastructure.database.pool_metrics import PoolMetrics, instrumented_pool_class, pool_exposition
+from infrastructure.database.replicas import ReplicaSet
+from infrastructure.metrics.db_instrumentation import instrument_engine
+from infrastructure.metrics.registry import REGISTRY
 
 # Load environment variables from .env file
 load_dotenv() # Ensure .env is in the root of your backend or adjust path
@@ -16,10 +25,157 @@ if not DATABASE_URL:
     # However, your project is configured for PostgreSQL.
     raise ValueError("DATABASE_URL environment variable not set.")
 
+# 数据库会话模式:
+# - "async" (默认): AsyncSession + asyncpg (PostgreSQL) / aiosqlite (本地 SQLite)，I/O 不阻塞事件循环
+# - "sync": 原有的同步 Session (psycopg2)，保留用于并发压测对比
+DATABASE_SESSION_MODE = os.getenv("DATABASE_SESSION_MODE", "async").lower()
+if DATABASE_SESSION_MODE not in ("async", "sync"):
+    raise ValueError(f"DATABASE_SESSION_MODE must be 'async' or 'sync', got '{DATABASE_SESSION_MODE}'.")
+
+# Async drivers used when ASYNC_DATABASE_URL is not given explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Derives the async driver URL from a sync DATABASE_URL,
+    e.g. postgresql://... -> postgresql+asyncpg://..., sqlite:///x.db -> sqlite+aiosqlite:///x.db
+    """
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'. Set ASYNC_DATABASE_URL explicitly.")
+    return sa_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+
+def url_list(value: str) -> List[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+# 只读副本 (可选):
+# - DATABASE_REPLICA_URLS: 逗号分隔的副本同步连接串; 只读的仓储方法 (查询/列表/计数/导出) 轮询分发到各副本，写操作始终走主库
+# - ASYNC_DATABASE_REPLICA_URLS: 对应的异步连接串 (可选)，默认按 DATABASE_REPLICA_URLS 逐个推导
+# - DATABASE_REPLICA_STICKY_SECONDS: 客户端写入成功后在这段时间内的读请求仍走主库 (读己之写)，应大于副本的复制延迟
+DATABASE_REPLICA_URLS = url_list(os.getenv("DATABASE_REPLICA_URLS", ""))
+ASYNC_DATABASE_REPLICA_URLS = url_list(os.getenv("ASYNC_DATABASE_REPLICA_URLS", "")) or [
+    to_async_url(url) for url in DATABASE_REPLICA_URLS
+]
+if len(ASYNC_DATABASE_REPLICA_URLS) != len(DATABASE_REPLICA_URLS):
+    raise ValueError("ASYNC_DATABASE_REPLICA_URLS must list one URL per entry of DATABASE_REPLICA_URLS.")
+DATABASE_REPLICA_STICKY_SECONDS = float(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+
+
+# 连接池配置 (同步与异步引擎各自一个连接池，取值相同):
+# - DATABASE_POOL_SIZE: 常驻连接数
+# - DATABASE_MAX_OVERFLOW: 连接池满时额外允许的临时连接数
+# - DATABASE_POOL_TIMEOUT: 连接全部占用时等待空闲连接的秒数，超时抛出 TimeoutError
+# - DATABASE_POOL_RECYCLE: 连接使用超过该秒数后重建 (-1 不回收)，应小于数据库/代理的空闲断开时间
+# - DATABASE_POOL_PRE_PING: 取出连接时先 ping 一次，自动替换已被服务端断开的连接 (每次取连接多一次往返)
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "-1"))
+DATABASE_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """
+    create_engine pool arguments for url. Pools that are not QueuePools (e.g. SQLite :memory:)
+    keep their default class and only get recycle/pre-ping.
+    """
+    sa_url = make_url(url)
+    options: Dict[str, Any] = {"pool_recycle": DATABASE_POOL_RECYCLE, "pool_pre_ping": DATABASE_POOL_PRE_PING}
+    poolclass = instrumented_pool_class(sa_url.get_dialect().get_pool_class(sa_url))
+    if poolclass is not None:
+        options.update(
+            poolclass=poolclass,
+            pool_size=DATABASE_POOL_SIZE,
+            max_overflow=DATABASE_MAX_OVERFLOW,
+            pool_timeout=DATABASE_POOL_TIMEOUT,
+        )
+    return options
+
+
+# Session time zone per PostgreSQL driver. The timestamp columns hold naive UTC (summary day buckets and
+# the overdue cutoff are UTC dates), so sessions run in UTC: time zone aware values bound by the
+# application (e.g. a due_date sent with an offset) are then converted to UTC rather than to the
+# server's local time, and so is any now() not already wrapped in timezone('utc', ...)
+UTC_SESSION_CONNECT_ARGS: Dict[str, Dict[str, Any]] = {
+    "psycopg2": {"options": "-c timezone=UTC"},
+    "asyncpg": {"server_settings": {"timezone": "UTC"}},
+}
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """create_engine arguments for url: the pool options and, on PostgreSQL, a UTC session time zone."""
+    options = pool_options(url)
+    connect_args = UTC_SESSION_CONNECT_ARGS.get(make_url(url).get_driver_name())
+    if connect_args is not None:
+        options["connect_args"] = connect_args
+    return options
+
 
 # Create a SQLModel/SQLAlchemy engine
-# For production, consider connection pooling options like pool_size, max_overflow
-engine = create_engine(DATABASE_URL, echo=False) # echo=True for debugging SQL queries
+engine = create_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL)) # echo=True for debugging SQL queries
+
+# The async engine is only built in async mode so that the sync mode does not require asyncpg/aiosqlite
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, echo=False, **engine_options(ASYNC_DATABASE_URL))
+    if DATABASE_SESSION_MODE == "async" else None
+)
+
+replica_engines = [create_engine(url, echo=False, **engine_options(url)) for url in DATABASE_REPLICA_URLS]
+async_replica_engines = (
+    [create_async_engine(url, echo=False, **engine_options(url)) for url in ASYNC_DATABASE_REPLICA_URLS]
+    if DATABASE_SESSION_MODE == "async" else []
+)
+read_replicas = ReplicaSet(replica_engines)
+async_read_replicas = ReplicaSet(async_replica_engines)
+
+# 连接池统计 (GET /health/diagnostics)
+pool_metrics: Dict[str, PoolMetrics] = {"sync": PoolMetrics("sync")}
+pool_metrics["sync"].attach(engine.pool)
+if async_engine is not None:
+    pool_metrics["async"] = PoolMetrics("async")
+    pool_metrics["async"].attach(async_engine.sync_engine.pool)
+for index, replica_engine in enumerate(replica_engines):
+    pool_metrics[f"replica{index}"] = PoolMetrics(f"replica{index}")
+    pool_metrics[f"replica{index}"].attach(replica_engine.pool)
+for index, replica_engine in enumerate(async_replica_engines):
+    pool_metrics[f"replica{index}_async"] = PoolMetrics(f"replica{index}_async")
+    pool_metrics[f"replica{index}_async"].attach(replica_engine.sync_engine.pool)
+
+# GET /metrics: 每条 SQL 的耗时 (按仓储方法) 以及连接池状态
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine)
+for replica_engine in async_replica_engines:
+    instrument_engine(replica_engine.sync_engine)
+REGISTRY.add_collector(lambda: pool_exposition(pool_metrics))
+
+
+def is_sqlite() -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def is_transient_database_error(error: Exception) -> bool:
+    """
+    Errors worth retrying the same statements for: the database is unreachable, the connection
+    was lost, the pool timed out, or a lock / serialization conflict (OperationalError).
+    Anything else (e.g. DataError for a value out of a column's range) fails the same way again.
+    """
+    if isinstance(error, exc.DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (exc.OperationalError, exc.InterfaceError, exc.TimeoutError, ConnectionError, TimeoutError))
+
 
 def get_session():
     """
@@ -29,6 +185,92 @@ def get_session():
     with Session(engine) as session:
         yield session
 
+
+def create_sqlite_schema() -> None:
+    """
+    Creates the tables directly from SQLModel metadata for a local SQLite stand-in database.
+    The Alembic migrations are PostgreSQL specific (ENUM type, plpgsql trigger) and remain
+    the source of truth for PostgreSQL.
+    """
+    if not is_sqlite():
+        return
+    from infrastructure.sqlmodels.work_order import SQLITE_SEARCH_TABLE, WorkOrder, WorkOrderStatusCount, WorkOrderSummaryBucket # noqa: F401 - registers the tables on the metadata
+    from infrastructure.sqlmodels.idempotency import IdempotencyRecord # noqa: F401
+    from infrastructure.repositories.work_order_queries import status_counts_rebuild_statements, summary_rebuild_statements
+    counts_missing = not inspect(engine).has_table(WorkOrderStatusCount.__tablename__)
+    summary_missing = not inspect(engine).has_table(WorkOrderSummaryBucket.__tablename__)
+    search_missing = not inspect(engine).has_table(SQLITE_SEARCH_TABLE)
+    SQLModel.metadata.create_all(engine)
+    add_missing_sqlite_columns(engine)
+    # Backfill the aggregates for a database created before their tables existed
+    with engine.begin() as connection:
+        for statement in (status_counts_rebuild_statements() if counts_missing else []) + (summary_rebuild_statements() if summary_missing else []):
+            connection.execute(statement)
+    if search_missing:
+        rebuild_search_index()
+    # SQLite stand-in replicas (copies of the primary file) only need the tables to exist
+    for replica_engine in replica_engines:
+        if replica_engine.dialect.name == "sqlite":
+            SQLModel.metadata.create_all(replica_engine)
+            add_missing_sqlite_columns(replica_engine)
+
+
+def rebuild_aggregates(bind=None) -> None:
+    """
+    Recomputes the trigger-maintained aggregate tables (work_order_status_counts, work_order_summary)
+    from work_orders in one transaction, e.g. after a trigger was disabled or rows were changed by hand.
+    On PostgreSQL work_orders is locked in SHARE mode meanwhile: reads go on, writes wait until the rebuild commits.
+    """
+    from infrastructure.repositories.work_order_queries import status_counts_rebuild_statements, summary_rebuild_statements
+    bind = bind if bind is not None else engine
+    with bind.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("LOCK TABLE work_orders IN SHARE MODE"))
+        for statement in status_counts_rebuild_statements() + summary_rebuild_statements():
+            connection.execute(statement)
+
+
+def rebuild_search_index(bind=None) -> None:
+    """
+    Re-reads work_orders into the SQLite FTS5 search table (work_orders_search), e.g. after a VACUUM
+    renumbered the rowids it is keyed by. The PostgreSQL trigram indexes need no maintenance.
+    """
+    from infrastructure.sqlmodels.work_order import SQLITE_SEARCH_TABLE
+    bind = bind if bind is not None else engine
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.begin() as connection:
+        connection.execute(text(f"INSERT INTO {SQLITE_SEARCH_TABLE} ({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')"))
+
+
+def add_missing_sqlite_columns(bind) -> None:
+    """
+    create_all does not alter existing tables: adds the columns of later migrations to a SQLite
+    database created before them. Only columns with a server default (or nullable) can be added this way.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspect(bind).has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspect(bind).get_columns(table.name)}
+        with bind.begin() as connection:
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                default = f" DEFAULT {column.server_default.arg.text}" if column.server_default is not None else ""
+                not_null = " NOT NULL" if not column.nullable and default else ""
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}{not_null}{default}'))
+
+
+async def dispose_engines() -> None:
+    engine.dispose()
+    for replica_engine in replica_engines:
+        replica_engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica_engine in async_replica_engines:
+        await replica_engine.dispose()
+
 # Function to create all tables (useful for initial setup/testing if not using Alembic exclusively)
 # SQLModel.metadata.create_all(engine) would be the SQLModel way if you were not using Alembic.
 # Since we use Alembic, Alembic migrations are the source of truth for schema.
@@ -43,7 +285,7 @@ if __name__ == "__main__":
     try:
         with Session(engine) as session:
             # A simple query to test connection
-            session.execute(text("SELECT 1")) # type: ignore
+            session.execute(text("SELECT 1"))
             print("Successfully connected to the database and executed a test query.")
     except Exception as e:
         print(f"Error connecting to the database: {e}")
@@ -0,0 +1,136 @@
+# infrastructure/database/pool_metrics.py
+"""
+Connection pool statistics. Connect/checkout/checkin/invalidate counts come from SQLAlchemy
+pool events; the pool has no "checkout requested" event, so the wait for a connection (and the
+number of callers currently waiting) is measured by the Instrumented*QueuePool classes around
+QueuePool._do_get.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from infrastructure.metrics.histogram import LatencyHistogram
+from infrastructure.metrics.registry import render_histogram
+
+
+class PoolMetrics:
+    """Counters of one connection pool since start-up."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self.connects = 0 # new DBAPI connections opened
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0 # connections discarded after an error (or a failed pre-ping)
+        self.timeouts = 0 # checkouts that gave up after pool_timeout
+        self.waiting = 0 # callers currently in a checkout (waiting for a free slot or connecting)
+        self.checkout_latency = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def attach(self, pool: Pool) -> None:
+        """Subscribes to the pool's events (they are carried over when the pool is recreated on dispose)."""
+        self.pool = pool
+        if isinstance(pool, InstrumentedPoolMixin):
+            pool.metrics = self
+        event.listen(pool, "connect", lambda *args: self._increment("connects"))
+        event.listen(pool, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(pool, "invalidate", lambda *args: self._increment("invalidations"))
+
+    def _increment(self, counter: str, delta: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + delta)
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        stats: Dict[str, Any] = {"pool_class": type(pool).__name__ if pool is not None else None}
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0), # negative while the pool has not been filled yet
+                waiting=self.waiting,
+            )
+        stats.update(
+            connects=self.connects,
+            checkouts=self.checkouts,
+            checkins=self.checkins,
+            invalidations=self.invalidations,
+            timeouts=self.timeouts,
+            checkout_latency_seconds=self.checkout_latency.snapshot(),
+        )
+        return stats
+
+
+class InstrumentedPoolMixin:
+    """Times QueuePool checkouts (including waits for a free slot) and counts waiters and timeouts."""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super()._do_get()
+        metrics._increment("waiting")
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics._increment("timeouts")
+            raise
+        finally:
+            metrics._increment("waiting", -1)
+            metrics.checkout_latency.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrumented_pool_class(default_pool_class: Type[Pool]) -> Optional[Type[Pool]]:
+    """Instrumented replacement for a dialect's default pool class; None if it is not a QueuePool."""
+    if issubclass(default_pool_class, AsyncAdaptedQueuePool):
+        return InstrumentedAsyncAdaptedQueuePool
+    if issubclass(default_pool_class, QueuePool):
+        return InstrumentedQueuePool
+    return None
+
+
+def pool_exposition(pools: Dict[str, PoolMetrics]) -> List[str]:
+    """Prometheus exposition lines (GET /metrics) for the given pools, read at scrape time."""
+    gauges = [
+        ("db_pool_checked_out", "Connections currently checked out of the pool.", "checked_out"),
+        ("db_pool_overflow", "Overflow connections currently open beyond pool_size.", "overflow"),
+        ("db_pool_waiting", "Callers currently waiting in a pool checkout.", "waiting"),
+    ]
+    counters = [
+        ("db_pool_checkouts_total", "Connections checked out of the pool.", "checkouts"),
+        ("db_pool_timeouts_total", "Checkouts that failed after pool_timeout.", "timeouts"),
+        ("db_pool_invalidations_total", "Connections invalidated after errors.", "invalidations"),
+    ]
+    snapshots = {name: metrics.snapshot() for name, metrics in pools.items()}
+    lines: List[str] = []
+    for metric_type, families in (("gauge", gauges), ("counter", counters)):
+        for metric, documentation, key in families:
+            lines += [f"# HELP {metric} {documentation}", f"# TYPE {metric} {metric_type}"]
+            lines += [f'{metric}{{pool="{name}"}} {snapshot[key]}' for name, snapshot in snapshots.items() if key in snapshot]
+    metric = "db_pool_checkout_duration_seconds"
+    lines += [f"# HELP {metric} Time to get a connection from the pool (waiting and connecting).", f"# TYPE {metric} histogram"]
+    for name, metrics in pools.items():
+        lines += render_histogram(metric, ("pool",), (name,), metrics.checkout_latency)
+    return lines
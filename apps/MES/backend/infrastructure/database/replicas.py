@@ -0,0 +1,35 @@
+# infrastructure/database/replicas.py
+"""
+Read replica selection. Read-only repository methods are sent to the replicas in turn;
+`primary_reads_required` is set for requests that must see their client's own recent writes
+(see api/read_consistency.py) and keeps them on the primary.
+"""
+import itertools
+from contextvars import ContextVar
+from typing import Generic, Sequence, TypeVar
+
+EngineT = TypeVar("EngineT")
+
+primary_reads_required: ContextVar[bool] = ContextVar("primary_reads_required", default=False)
+
+
+class ReplicaSet(Generic[EngineT]):
+    """Round-robin over the replica engines (sync or async) of one session mode."""
+
+    def __init__(self, engines: Sequence[EngineT]):
+        self.engines = list(engines)
+        self._counter = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def next(self) -> EngineT:
+        # next() on itertools.count is atomic under the GIL, so sync-mode worker threads can share it
+        return self.engines[next(self._counter) % len(self.engines)]
+
+    def reads_enabled(self) -> bool:
+        """Whether the current request may read from a replica."""
+        return bool(self.engines) and not primary_reads_required.get()
@@ -0,0 +1,26 @@
+# infrastructure/database/sql_functions.py
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import DateTime
+
+
+class db_now(FunctionElement):
+    """
+    Current UTC timestamp evaluated by the database, naive like every datetime the application binds.
+    PostgreSQL renders timezone('utc', now()) (same as the Alembic migrations; now() alone would be
+    the session time zone's local time); SQLite renders a timestamp with
+    microseconds in the exact text format SQLAlchemy binds DateTime parameters with, so that
+    server-generated and bound values compare correctly (e.g. in keyset pagination).
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(db_now)
+def _compile_default(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
+@compiles(db_now, "sqlite")
+def _compile_sqlite(element, compiler, **kw):
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')"
@@ -0,0 +1,111 @@
+# infrastructure/events/postgres_notify.py
+"""
+Change feed shared by all workers through PostgreSQL LISTEN/NOTIFY. Publishing sends the events
+as NOTIFY payloads (JSON arrays, split to stay below the 8000 byte payload limit); every worker,
+including the publishing one, LISTENs on the channel and delivers them to its local subscribers.
+Uses one dedicated asyncpg connection per worker, outside the SQLAlchemy pools.
+"""
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+import orjson
+from sqlalchemy.engine import make_url
+
+from infrastructure.events.work_order_events import RESYNC, WorkOrderEvent, WorkOrderEventBroadcaster
+
+logger = logging.getLogger("mes.change_feed")
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7500
+RECONNECT_SECONDS = 2.0
+
+
+def asyncpg_dsn(url: str) -> str:
+    """postgresql+psycopg2://... / postgresql+asyncpg://... -> postgresql://... as accepted by asyncpg.connect"""
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def notify_payloads(events: List[WorkOrderEvent]) -> List[str]:
+    payloads: List[str] = []
+    batch: List[bytes] = []
+    size = 2
+    for event in events:
+        encoded = orjson.dumps(event.to_dict())
+        if batch and size + len(encoded) + 1 > MAX_PAYLOAD_BYTES:
+            payloads.append(b"[" + b",".join(batch) + b"]")
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        payloads.append(b"[" + b",".join(batch) + b"]")
+    return [payload.decode() for payload in payloads]
+
+
+class PostgresNotifyBroadcaster(WorkOrderEventBroadcaster):
+    def __init__(self, database_url: str, channel: str = "work_order_events", max_queue: int = 1000):
+        super().__init__(max_queue=max_queue)
+        self.dsn = asyncpg_dsn(database_url)
+        self.channel = channel
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._supervisor: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    async def start(self) -> None:
+        self._supervisor = asyncio.create_task(self._keep_listening())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+
+    async def _keep_listening(self) -> None:
+        import asyncpg # only needed for this backend
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _connection: lost.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                self._connection = connection
+                self._connected.set()
+                await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"change feed connection failed: {e}")
+            self._connected.clear()
+            # Notifications sent while disconnected are lost
+            self.deliver([WorkOrderEvent(type=RESYNC)])
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            events = [WorkOrderEvent.from_dict(value) for value in orjson.loads(payload)]
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"ignoring malformed change feed payload: {e}")
+            return
+        self.deliver(events)
+
+    async def publish(self, events: Iterable[WorkOrderEvent]) -> None:
+        events = list(events)
+        if len(events) > self.max_queue:
+            events = [WorkOrderEvent(type=RESYNC)]
+        if not events:
+            return
+        if not self._connected.is_set():
+            logger.warning(f"change feed not connected, {len(events)} event(s) not published")
+            return
+        try:
+            async with self._lock:
+                for payload in notify_payloads(events):
+                    await self._connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        except Exception as e:
+            # The write itself has been committed; subscribers resync after the reconnect
+            logger.warning(f"change feed publish failed: {e}")
@@ -0,0 +1,143 @@
+# infrastructure/events/work_order_events.py
+"""
+Work order change feed. Repository writes publish WorkOrderEvents to a broadcaster, which fans
+them out to the subscribers of this process (e.g. open Server-Sent Events streams).
+The in-process broadcaster only sees the writes of its own worker; PostgresNotifyBroadcaster
+(postgres_notify.py) routes events through LISTEN/NOTIFY so that every worker sees all of them.
+
+Every subscriber has a bounded queue. When a consumer falls behind and its queue is full, the
+queued events are dropped and replaced by a single "resync" event: the consumer has to reload
+its state (e.g. the work order list) instead of replaying the backlog, so a stalled client never
+holds more than `max_queue` events in memory.
+"""
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from domain.value_objects.order_status import OrderStatus
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+RESYNC = "resync"
+
+
+@dataclass
+class WorkOrderEvent:
+    """
+    A change of one work order. `data` holds the JSON-ready fields known for it: the full row
+    for created/updated events, only id and status for bulk status changes, only id for deletes.
+    Updated events also carry previous_status, the status before the change.
+    """
+    type: str
+    id: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "id": self.id, "data": self.data}
+
+    @classmethod
+    def from_dict(cls, value: Dict[str, Any]) -> "WorkOrderEvent":
+        return cls(type=value["type"], id=value.get("id"), data=value.get("data") or {})
+
+
+def work_order_event(event_type: str, work_order_id: uuid.UUID, **data: Any) -> WorkOrderEvent:
+    return WorkOrderEvent(type=event_type, id=str(work_order_id), data=data)
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """
+    Subscriber side filter. A condition only excludes events that carry the field: a delete (no
+    status / product) or a bulk status change (no product) reaches every subscriber, since the
+    consumer may be showing that order. Status filters match the status before (previous_status)
+    or after the change, so a subscriber also sees an order leaving the statuses it follows.
+    """
+    statuses: Optional[frozenset] = None
+    product_name: Optional[str] = None
+
+    def matches(self, event: WorkOrderEvent) -> bool:
+        if event.type == RESYNC:
+            return True
+        if self.statuses is not None:
+            statuses = {event.data[name] for name in ("status", "previous_status") if event.data.get(name) is not None}
+            if statuses and not any(OrderStatus(status) in self.statuses for status in statuses):
+                return False
+        product_name = event.data.get("product_name")
+        if self.product_name is not None and product_name is not None and product_name != self.product_name:
+            return False
+        return True
+
+
+class Subscription:
+    def __init__(self, broadcaster: "WorkOrderEventBroadcaster", filters: EventFilter, max_queue: int):
+        self.broadcaster = broadcaster
+        self.filters = filters
+        self.queue: "asyncio.Queue[WorkOrderEvent]" = asyncio.Queue(maxsize=max_queue)
+
+    def offer(self, event: WorkOrderEvent) -> None:
+        if not self.filters.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: drop the backlog and ask the consumer to reload
+            self.broadcaster.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(WorkOrderEvent(type=RESYNC))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[WorkOrderEvent]:
+        """Next event, or None when nothing arrived within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broadcaster.subscribers.discard(self)
+
+
+class WorkOrderEventBroadcaster:
+    """In-process fan-out of work order events to the subscribers of this worker."""
+
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self.subscribers: Set[Subscription] = set()
+        self.published = 0
+        self.overflows = 0 # times a subscriber's backlog was dropped for a resync
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def subscribe(self, filters: Optional[EventFilter] = None) -> Subscription:
+        subscription = Subscription(self, filters or EventFilter(), self.max_queue)
+        self.subscribers.add(subscription)
+        return subscription
+
+    async def publish(self, events: Iterable[WorkOrderEvent]) -> None:
+        """Called after a write has been committed."""
+        self.deliver(list(events))
+
+    def deliver(self, events: List[WorkOrderEvent]) -> None:
+        """Hands events to the local subscribers, without blocking on any of them."""
+        self.published += len(events)
+        if not self.subscribers:
+            return
+        if len(events) > self.max_queue:
+            # A batch that no queue could hold (e.g. a large import): everybody reloads once
+            events = [WorkOrderEvent(type=RESYNC)]
+        for subscription in list(self.subscribers):
+            for event in events:
+                subscription.offer(event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "overflows": self.overflows,
+        }
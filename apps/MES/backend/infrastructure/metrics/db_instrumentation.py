@@ -0,0 +1,94 @@
+# infrastructure/metrics/db_instrumentation.py
+"""
+Per-statement timing from the engines' before/after_cursor_execute events, labelled with the
+repository method that issued the statement. The label travels in a context variable set by
+instrument_repository, so it follows the request task (and SQLAlchemy's async greenlets)
+without being passed through every call.
+"""
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from infrastructure.metrics.registry import REGISTRY, HistogramFamily
+
+# Label of statements issued outside a repository method (schema setup, health checks, ...)
+NO_REPOSITORY_METHOD = "-"
+
+current_repository_method: ContextVar[str] = ContextVar("current_repository_method", default=NO_REPOSITORY_METHOD)
+
+DB_STATEMENT_DURATION = REGISTRY.register(HistogramFamily(
+    "db_statement_duration_seconds",
+    "Database statement execution time (cursor execute until the driver returns), by repository method.",
+    ("repository_method",),
+))
+
+# Callbacks (statement, seconds, repository method) run after every statement, e.g. per-request query budgets
+StatementObserver = Callable[[str, float, str], None]
+statement_observers: List[StatementObserver] = []
+
+
+def _wrap_coroutine(method: Callable[..., Any], label: str) -> Callable[..., Any]:
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_repository_method.set(label)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_repository_method.reset(token)
+    return wrapper
+
+
+def _wrap_async_generator(method: Callable[..., Any], label: str) -> Callable[..., Any]:
+    # The label is set around each step only: between steps the caller's own label applies
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        generator = method(*args, **kwargs)
+        try:
+            while True:
+                token = current_repository_method.set(label)
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_repository_method.reset(token)
+                yield item
+        finally:
+            await generator.aclose()
+    return wrapper
+
+
+def instrument_repository(cls: type) -> type:
+    """Class decorator: statements run by the public async methods of cls are labelled "Class.method"."""
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        label = f"{cls.__name__}.{name}"
+        if inspect.isasyncgenfunction(attribute):
+            setattr(cls, name, _wrap_async_generator(attribute, label))
+        elif inspect.iscoroutinefunction(attribute):
+            setattr(cls, name, _wrap_coroutine(attribute, label))
+    return cls
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._statement_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context._statement_started
+    label = current_repository_method.get()
+    DB_STATEMENT_DURATION.observe(elapsed, label)
+    for observer in statement_observers:
+        observer(statement, elapsed, label)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Times every statement of engine (for an AsyncEngine pass its sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
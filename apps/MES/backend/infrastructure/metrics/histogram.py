@@ -0,0 +1,51 @@
+# infrastructure/metrics/histogram.py
+"""
+Cumulative latency histogram with fixed bucket bounds (Prometheus semantics: each bucket
+counts the observations less than or equal to its upper bound).
+"""
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# Upper bounds in seconds, from sub-millisecond pool checkouts up to request timeouts
+DEFAULT_LATENCY_BUCKETS: Sequence[float] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class LatencyHistogram:
+    """
+    Thread-safe: observations may come from the event loop and from threadpool workers
+    (sync sessions are closed in the threadpool).
+    """
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        self.bounds: List[float] = sorted(buckets or DEFAULT_LATENCY_BUCKETS)
+        self._counts: List[int] = [0] * (len(self.bounds) + 1) # last slot: above the largest bound
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def cumulative(self) -> List[int]:
+        """Cumulative count per bound, followed by the +Inf bucket (== count)."""
+        with self._lock:
+            counts = list(self._counts)
+        total = 0
+        cumulative = []
+        for value in counts:
+            total += value
+            cumulative.append(total)
+        return cumulative
+
+    def snapshot(self) -> Dict[str, object]:
+        cumulative = self.cumulative()
+        buckets = {format(bound, "g"): value for bound, value in zip(self.bounds, cumulative)}
+        buckets["+Inf"] = cumulative[-1]
+        return {"buckets": buckets, "count": cumulative[-1], "sum": round(self.sum, 6)}
@@ -0,0 +1,107 @@
+# infrastructure/metrics/query_budget.py
+"""
+Per-request statement accounting and the slow query log, fed by db_instrumentation's
+statement observers. The request's QueryStats lives in a context variable set by
+api.query_budget.QueryBudgetMiddleware; statements outside a request are only checked
+against the slow query threshold.
+"""
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from infrastructure.metrics.db_instrumentation import statement_observers
+
+slow_query_logger = logging.getLogger("mes.slow_query")
+
+# Longest statement text written to a log record
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling one request."""
+    count: int = 0
+    seconds: float = 0.0
+    repository_methods: List[str] = field(default_factory=list) # in execution order, one entry per statement
+
+    def record(self, seconds: float, repository_method: str) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.repository_methods.append(repository_method)
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def log_record(event: str, **fields) -> str:
+    """One-line JSON log record (machine readable, one event per line)."""
+    return json.dumps({"event": event, **fields}, ensure_ascii=False, default=str)
+
+
+class StatementTracker:
+    """Statement observer: adds each statement to the current request's QueryStats and logs slow ones."""
+
+    def __init__(self, slow_query_seconds: float):
+        self.slow_query_seconds = slow_query_seconds
+
+    def __call__(self, statement: str, seconds: float, repository_method: str) -> None:
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(seconds, repository_method)
+        if self.slow_query_seconds > 0 and seconds >= self.slow_query_seconds:
+            slow_query_logger.warning(log_record(
+                "slow_query",
+                duration_ms=round(seconds * 1000, 3),
+                threshold_ms=round(self.slow_query_seconds * 1000, 3),
+                repository_method=repository_method,
+                statement=statement[:MAX_LOGGED_STATEMENT_LENGTH],
+            ))
+
+
+def install_statement_tracker(slow_query_seconds: float) -> StatementTracker:
+    tracker = StatementTracker(slow_query_seconds)
+    statement_observers.append(tracker)
+    return tracker
+
+
+class QueryCounter:
+    """Statement observer collecting every statement, for assert_max_queries."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.repository_methods: List[str] = []
+
+    def __call__(self, statement: str, seconds: float, repository_method: str) -> None:
+        self.statements.append(statement)
+        self.repository_methods.append(repository_method)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryCounter]:
+    """
+    Raises AssertionError if more than limit statements run inside the block, listing them with
+    their repository methods. Counts process-wide rather than per context, so it also sees the
+    statements of requests served on another thread (e.g. through fastapi.testclient.TestClient):
+
+        with assert_max_queries(1):
+            client.delete(f"/api/v1/work-orders/{wo_id}")
+    """
+    counter = QueryCounter()
+    statement_observers.append(counter)
+    try:
+        yield counter
+    finally:
+        statement_observers.remove(counter)
+    if counter.count > limit:
+        listing = "\n".join(
+            f"  {index}. [{method}] {statement}"
+            for index, (method, statement) in enumerate(zip(counter.repository_methods, counter.statements), start=1)
+        )
+        raise AssertionError(f"Expected at most {limit} statements, {counter.count} were executed:\n{listing}")
@@ -0,0 +1,148 @@
+# infrastructure/metrics/registry.py
+"""
+Minimal in-process metrics registry rendered in the Prometheus text exposition format (0.0.4).
+Metric families keep one child per label value tuple; recording is a dict lookup plus a locked
+add, cheap enough to leave on for every request and every statement.
+"""
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from infrastructure.metrics.histogram import LatencyHistogram
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricFamily:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names: Tuple[str, ...] = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class GaugeFamily(MetricFamily):
+    """Gauge (or counter, with metric_type="counter") per label value tuple."""
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), metric_type: str = "gauge"):
+        super().__init__(name, documentation, label_names)
+        self.metric_type = metric_type
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in items]
+
+
+class HistogramFamily(MetricFamily):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+        self._children: Dict[LabelValues, LatencyHistogram] = {}
+
+    def labels(self, *label_values: str) -> LatencyHistogram:
+        child = self._children.get(label_values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(label_values, LatencyHistogram(self.buckets))
+        return child
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        self.labels(*label_values).observe(seconds)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            children = sorted(self._children.items())
+        lines = self.header()
+        for labels, histogram in children:
+            lines.extend(render_histogram(self.name, self.label_names, labels, histogram))
+        return lines
+
+
+def render_histogram(name: str, label_names: Sequence[str], label_values: Sequence[str], histogram: LatencyHistogram) -> List[str]:
+    """_bucket / _sum / _count sample lines of one histogram."""
+    cumulative = histogram.cumulative()
+    lines = []
+    for bound, value in zip(histogram.bounds, cumulative):
+        le = f'le="{bound:g}"'
+        lines.append(f"{name}_bucket{_labels(label_names, label_values, le)} {value}")
+    le = 'le="+Inf"'
+    lines.append(f"{name}_bucket{_labels(label_names, label_values, le)} {cumulative[-1]}")
+    lines.append(f"{name}_sum{_labels(label_names, label_values)} {_number(histogram.sum)}")
+    lines.append(f"{name}_count{_labels(label_names, label_values)} {cumulative[-1]}")
+    return lines
+
+
+class MetricsRegistry:
+    """
+    Registered families plus collectors: callables producing exposition lines at scrape time,
+    for values that already live elsewhere (e.g. connection pool statistics).
+    """
+
+    def __init__(self):
+        self.families: List[MetricFamily] = []
+        self.collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, family: MetricFamily) -> MetricFamily:
+        self.families.append(family)
+        return family
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self.families:
+            lines.extend(family.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served by GET /metrics
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,390 @@
+# infrastructure/repositories/async_sqlmodel_work_order_repository.py
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+
+from domain.exceptions import DuplicateWorkOrdersError
+from domain.repositories.work_order_repository import AbstractWorkOrderRepository
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from domain.value_objects.work_order_summary import WorkOrderSummary
+from infrastructure.metrics.db_instrumentation import instrument_repository
+from infrastructure.repositories import work_order_queries as queries
+from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderArchive, WorkOrderBase, WorkOrderUpdate
+
+
+@instrument_repository
+class AsyncSQLModelWorkOrderRepository(AbstractWorkOrderRepository):
+    """
+    Async SQLModel implementation of the Work Order Repository.
+    Every database round trip is awaited on an AsyncSession (asyncpg / aiosqlite),
+    so a slow query no longer blocks the event loop for other in-flight requests.
+    Behaviour mirrors SQLModelWorkOrderRepository, which stays available via DATABASE_SESSION_MODE=sync.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, id: uuid.UUID) -> Optional[WorkOrder]:
+        try:
+            statement = select(WorkOrder).where(WorkOrder.id == id)
+            result = await self.session.exec(statement)
+            work_order = result.first()
+            if work_order is None:
+                # Falls through to the archive (returns a read-only WorkOrderArchive)
+                result = await self.session.exec(queries.archived_by_id_statement(id))
+                work_order = result.first()
+            return work_order
+        except SQLAlchemyError as e:
+            print(f"Database error in get_by_id: {e}") # Replace with proper logging
+            raise
+
+    async def add(self, work_order_data: WorkOrder) -> WorkOrder:
+        """
+        Adds a new work order to the database.
+        Expects a WorkOrder table model instance.
+        One INSERT ... ON CONFLICT (order_number) DO NOTHING RETURNING: the unique index on order_number
+        is the duplicate check, and DB-generated values (created_at, updated_at) come back without a refresh.
+        """
+        dialect_name = self.session.get_bind().dialect.name
+        try:
+            statement = queries.insert_skip_duplicates_statement(dialect_name)
+            result = await self.session.scalars(statement, queries.insert_rows([work_order_data]))
+            db_work_order = result.first()
+            if db_work_order is None:
+                await self.session.rollback()
+                raise ValueError(f"Work order with number '{work_order_data.order_number}' already exists.")
+            await self.session.commit()
+            return db_work_order
+        except IntegrityError as e:
+            await self.session.rollback()
+            print(f"Integrity error in add: {e.orig}")
+            raise ValueError(f"Could not add work order. Integrity constraint violated: {e.orig}")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in add: {e}")
+            raise
+
+    async def add_many(self, work_orders: Sequence[WorkOrderBase], chunk_size: int = 1000, all_or_nothing: bool = False) -> List[WorkOrder]:
+        """
+        Bulk insert: one batched INSERT ... ON CONFLICT DO NOTHING RETURNING per chunk,
+        with all chunks in a single transaction. Existing order numbers are skipped; with
+        all_or_nothing=True the transaction is rolled back and DuplicateWorkOrdersError raised instead.
+        """
+        rows = queries.insert_rows(work_orders)
+        statement = queries.insert_skip_duplicates_statement(self.session.get_bind().dialect.name)
+        created: List[WorkOrder] = []
+        try:
+            for chunk in queries.chunked(rows, chunk_size):
+                result = await self.session.scalars(statement, chunk)
+                created.extend(result.all())
+            if all_or_nothing and len(created) < len(rows):
+                created_numbers = {wo.order_number for wo in created}
+                await self.session.rollback()
+                raise DuplicateWorkOrdersError(
+                    row["order_number"] for row in rows if row["order_number"] not in created_numbers
+                )
+            await self.session.commit()
+            return created
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in add_many: {e}")
+            raise
+
+    async def update(
+        self,
+        work_order_id: uuid.UUID,
+        work_order_update_data: WorkOrderUpdate,
+        blocked_from: Optional[List[OrderStatus]] = None,
+        expected_updated_at: Optional[List[datetime]] = None,
+        expected_version: Optional[int] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> Optional[WorkOrder]:
+        """
+        Updates an existing work order.
+        work_order_update_data contains the fields to update.
+        A single UPDATE ... WHERE id = :id AND status NOT IN (:blocked_from) [AND updated_at IN (:expected)]
+        [AND version = :expected_version] RETURNING *; returns None when the order does not exist, its current
+        status is in blocked_from or it no longer has one of the expected updated_at values / the expected version.
+        A duplicate order_number is reported by the unique index and raised as ValueError.
+        previous_statuses receives the status the updated order had before the write.
+        """
+        update_data = work_order_update_data.model_dump(exclude_unset=True, exclude={"version"})
+        if not update_data:
+            work_order = await self.get_by_id(work_order_id)
+            if work_order is not None and expected_updated_at is not None and work_order.updated_at not in expected_updated_at:
+                return None
+            if work_order is not None and expected_version is not None and work_order.version != expected_version:
+                return None
+            return work_order
+        try:
+            returning = await self._returns_previous_status(previous_statuses, ids=[work_order_id])
+            statement = queries.update_statement(
+                work_order_id, update_data, blocked_from or (), expected_updated_at, expected_version, previous_status=returning
+            )
+            if returning:
+                row = (await self.session.execute(statement)).first()
+                db_work_order = None
+                if row is not None:
+                    db_work_order, previous_statuses[row[0].id] = row
+            else:
+                result = await self.session.scalars(statement)
+                db_work_order = result.first()
+            await self.session.commit()
+            return db_work_order
+        except IntegrityError as e: # e.g. unique constraint violation for order_number if changed
+            await self.session.rollback()
+            print(f"Integrity error in update: {e.orig}")
+            if "order_number" in update_data:
+                raise ValueError(f"Work order with number '{update_data['order_number']}' already exists.")
+            raise ValueError(f"Could not update work order. Integrity constraint violated: {e.orig}")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in update: {e}")
+            raise
+
+    async def update_status_many(
+        self,
+        target: OrderStatus,
+        blocked_from: List[OrderStatus],
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[uuid.UUID]:
+        """
+        Set-based status transition in a single UPDATE ... RETURNING id; the status guard is part of the WHERE clause.
+        previous_statuses receives the status each updated order had before the write.
+        """
+        try:
+            returning = await self._returns_previous_status(previous_statuses, ids=ids, filters=filters)
+            statement = queries.bulk_status_update_statement(
+                target, blocked_from, ids=ids, filters=filters, previous_status=returning
+            )
+            if returning:
+                rows = (await self.session.execute(statement)).all()
+                previous_statuses.update(rows)
+                updated_ids = [wo_id for wo_id, _ in rows]
+                await self.session.commit()
+                return updated_ids
+            result = await self.session.exec(statement)
+            updated_ids = list(result.scalars().all())
+            await self.session.commit()
+            return updated_ids
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in update_status_many: {e}")
+            raise
+
+    async def apply_progress(
+        self,
+        increments: Mapping[uuid.UUID, Tuple[int, int]],
+        rejected_from: Sequence[OrderStatus] = (),
+        complete_from: Sequence[OrderStatus] = (),
+        chunk_size: int = 1000,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[WorkOrder]:
+        """
+        Set-based progress update: one UPDATE ... RETURNING per chunk of orders, all chunks in a single transaction.
+        previous_statuses receives the status each updated order had before the write.
+        """
+        updated: List[WorkOrder] = []
+        try:
+            for chunk in queries.chunked(list(increments), chunk_size):
+                returning = await self._returns_previous_status(previous_statuses, ids=chunk)
+                statement = queries.progress_update_statement(
+                    {wo_id: increments[wo_id] for wo_id in chunk}, rejected_from, complete_from, previous_status=returning
+                )
+                if returning:
+                    for work_order, previous_status in (await self.session.execute(statement)).all():
+                        previous_statuses[work_order.id] = previous_status
+                        updated.append(work_order)
+                    continue
+                result = await self.session.scalars(statement)
+                updated.extend(result.all())
+            await self.session.commit()
+            return updated
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in apply_progress: {e}")
+            raise
+
+    async def _returns_previous_status(
+        self,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]],
+        ids: Optional[Sequence[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+    ) -> bool:
+        """
+        Whether the write should return the previous statuses itself (UPDATE ... FROM ... RETURNING, PostgreSQL).
+        Elsewhere they are read into previous_statuses first, in the same transaction as the write.
+        Nothing is read when the caller does not ask for them.
+        """
+        if previous_statuses is None:
+            return False
+        if self.session.get_bind().dialect.name in queries.PREVIOUS_STATUS_RETURNING_DIALECTS:
+            return True
+        result = await self.session.exec(queries.statuses_for_update_statement(ids=ids, filters=filters))
+        previous_statuses.update(result.all())
+        return False
+
+    async def find_existing_ids(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        try:
+            result = await self.session.scalars(queries.existing_ids_statement(ids))
+            return list(result.all())
+        except SQLAlchemyError as e:
+            print(f"Database error in find_existing_ids: {e}")
+            raise
+
+    async def archive_terminal(
+        self,
+        older_than: datetime,
+        statuses: Sequence[OrderStatus],
+        batch_size: int = 1000,
+    ) -> List[uuid.UUID]:
+        """
+        Moves one batch of orders to work_orders_archive in its own short transaction:
+        DELETE ... RETURNING the rows, then a batched INSERT of them into the archive.
+        """
+        try:
+            statement = queries.archive_candidates_delete_statement(older_than, batch_size, statuses)
+            result = await self.session.exec(statement)
+            rows = [dict(row) for row in result.mappings().all()]
+            if rows:
+                await self.session.execute(queries.archive_insert_statement(), rows)
+            await self.session.commit()
+            return [row["id"] for row in rows]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in archive_terminal: {e}")
+            raise
+
+    async def delete(
+        self, id: uuid.UUID, blocked_from: Optional[List[OrderStatus]] = None, expected_version: Optional[int] = None
+    ) -> bool:
+        """
+        Single DELETE ... WHERE id = :id AND status NOT IN (:blocked_from) [AND version = :expected_version] RETURNING id;
+        returns False when the order does not exist, its status is in blocked_from or its version differs.
+        """
+        try:
+            result = await self.session.exec(queries.delete_statement(id, blocked_from or (), expected_version))
+            deleted = result.first() is not None
+            await self.session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            print(f"Database error in delete: {e}")
+            raise
+
+    async def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[WorkOrder]:
+        """
+        With columns, a column-projected query returning plain rows instead of table models.
+        """
+        try:
+            statement = queries.list_offset_statement(skip, limit, filters, sort_by, direction, columns)
+            result = await self.session.exec(statement)
+            return result.all()
+        except SQLAlchemyError as e:
+            print(f"Database error in list_all: {e}")
+            raise
+
+    async def list_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        try:
+            statement = queries.list_cursor_statement(limit, cursor, sort_by, direction, filters, columns)
+            result = await self.session.exec(statement)
+            return queries.cursor_page(result.all(), limit, sort_by, direction)
+        except SQLAlchemyError as e:
+            print(f"Database error in list_by_cursor: {e}")
+            raise
+
+    async def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[WorkOrder], Optional[str]]:
+        try:
+            statement = queries.search_statement(term, limit, cursor, self.session.get_bind().dialect.name)
+            result = await self.session.exec(statement)
+            return queries.search_page(result.all(), limit, term)
+        except SQLAlchemyError as e:
+            print(f"Database error in search: {e}")
+            raise
+
+    async def get_updated_at(self, id: uuid.UUID) -> Optional[datetime]:
+        try:
+            result = await self.session.exec(queries.updated_at_statement(id))
+            updated_at = result.first()
+            if updated_at is None:
+                result = await self.session.exec(queries.archived_updated_at_statement(id))
+                updated_at = result.first()
+            return updated_at
+        except SQLAlchemyError as e:
+            print(f"Database error in get_updated_at: {e}")
+            raise
+
+    async def stream_all(
+        self,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[WorkOrder]]:
+        """With include_archived the archived rows follow the hot ones, in the same order among themselves."""
+        try:
+            for model in (WorkOrder, WorkOrderArchive) if include_archived else (WorkOrder,):
+                statement = queries.export_statement(filters, sort_by, direction, batch_size, columns, model)
+                if columns is None:
+                    result = await self.session.stream_scalars(statement)
+                else:
+                    result = await self.session.stream(statement)
+                async for partition in result.partitions():
+                    yield list(partition)
+        except SQLAlchemyError as e:
+            print(f"Database error in stream_all: {e}")
+            raise
+
+    async def get_by_order_number(self, order_number: str) -> Optional[WorkOrder]:
+        try:
+            statement = select(WorkOrder).where(WorkOrder.order_number == order_number)
+            result = await self.session.exec(statement)
+            work_order = result.first()
+            if work_order is None:
+                result = await self.session.exec(queries.archived_by_order_number_statement(order_number))
+                work_order = result.first()
+            return work_order
+        except SQLAlchemyError as e:
+            print(f"Database error in get_by_order_number: {e}")
+            raise
+
+    async def summarize(self, now: datetime) -> WorkOrderSummary:
+        try:
+            rows = (await self.session.exec(queries.summary_statement(now))).all()
+            overdue_today = (await self.session.exec(queries.overdue_today_statement(now))).one()
+            return queries.build_summary(rows, overdue_today, now)
+        except SQLAlchemyError as e:
+            print(f"Database error in summarize: {e}")
+            raise
+
+    async def count_all(self, filters: Optional[WorkOrderFilter] = None) -> int:
+        try:
+            statement = queries.count_statement(filters)
+            result = await self.session.exec(statement)
+            return result.one()
+        except SQLAlchemyError as e:
+            print(f"Database error in count_all: {e}")
+            raise
@@ -0,0 +1,251 @@
+# infrastructure/repositories/cached_work_order_repository.py
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from domain.repositories.work_order_repository import AbstractWorkOrderRepository
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from domain.value_objects.work_order_summary import WorkOrderSummary
+from infrastructure.cache.cache_backend import AbstractCacheBackend
+from infrastructure.cache.single_flight import SingleFlight
+from infrastructure.database.replicas import primary_reads_required
+from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderBase, WorkOrderUpdate
+
+
+def _id_key(work_order_id: uuid.UUID) -> Tuple[str, str]:
+    return ("work_order:id", str(work_order_id))
+
+
+def _order_number_key(order_number: str) -> Tuple[str, str]:
+    return ("work_order:order_number", order_number)
+
+
+class WorkOrderCache:
+    """
+    Process-wide state of the work order lookup cache, shared by the per-request CachedWorkOrderRepository.
+    - id key -> detached WorkOrder snapshot
+    - order number key -> id (resolved through the id key, so one entry per order holds the data)
+    Loads that overlap with a write are neither stored nor joined by later callers, so a read that
+    started before an invalidation cannot put the old row back into the cache.
+    Only primary reads are stored: a replica may not have replayed the write that invalidated the
+    key yet, and its old row would then be served to every client (including the writer) until the TTL.
+    """
+
+    def __init__(self, backend: AbstractCacheBackend):
+        self.backend = backend
+        self.single_flight = SingleFlight()
+        self._write_epoch = 0
+
+    async def invalidate(self, work_order_ids: Iterable[uuid.UUID] = (), order_numbers: Iterable[str] = ()) -> None:
+        self._write_epoch += 1
+        # A load that started before this write must not serve callers arriving after it
+        self.single_flight.forget_all()
+        keys = [_id_key(wo_id) for wo_id in work_order_ids] + [_order_number_key(number) for number in order_numbers]
+        if keys:
+            await self.backend.delete(*keys)
+
+    async def load(
+        self, key: Hashable, load: Callable[[], Awaitable[Optional[WorkOrder]]], store: bool = True
+    ) -> Optional[WorkOrder]:
+        """
+        Runs a coalesced load and caches the row under its id and order number if no write overlapped it.
+        store=False for loads from a read replica: they are coalesced among themselves but never stored.
+        """
+        async def load_and_store() -> Optional[WorkOrder]:
+            epoch = self._write_epoch
+            work_order = await load()
+            if work_order is None:
+                return None
+            # Detached copy: never tied to the loading request's session (keeps WorkOrderArchive for archived rows)
+            snapshot = type(work_order).model_validate(work_order.model_dump())
+            if store and epoch == self._write_epoch:
+                await self.backend.set(_id_key(snapshot.id), snapshot)
+                await self.backend.set(_order_number_key(snapshot.order_number), snapshot.id)
+            return snapshot
+
+        # Primary and replica loads never join each other's call
+        return await self.single_flight.do((key, store), load_and_store)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = vars(self.backend.stats())
+        stats["coalesced"] = self.single_flight.coalesced
+        return stats
+
+
+class CachedWorkOrderRepository(AbstractWorkOrderRepository):
+    """
+    Read-through cache in front of another work order repository for the point lookups
+    get_by_id / get_by_order_number. Writes go to the wrapped repository and then invalidate
+    exactly the affected keys; list and count queries are not cached.
+    Entries written by other processes are only picked up after the backend TTL.
+    With reads_from_replica (the wrapped repository routes reads to a replica), misses are loaded
+    from the replica but not stored. Requests that must read their client's own writes
+    (read-your-writes cookie) bypass the cache lookup and read the primary, whose rows are stored.
+    """
+    def __init__(self, repository: AbstractWorkOrderRepository, cache: WorkOrderCache, reads_from_replica: bool = False):
+        self.repository = repository
+        self.cache = cache
+        self.reads_from_replica = reads_from_replica
+
+    async def _cached(self, key: Hashable) -> Optional[Any]:
+        if primary_reads_required.get():
+            return None
+        return await self.cache.backend.get(key)
+
+    async def get_by_id(self, id: uuid.UUID) -> Optional[WorkOrder]:
+        cached = await self._cached(_id_key(id))
+        if cached is not None:
+            return cached
+        return await self.cache.load(_id_key(id), lambda: self.repository.get_by_id(id), store=not self.reads_from_replica)
+
+    async def get_updated_at(self, id: uuid.UUID) -> Optional[datetime]:
+        cached = await self._cached(_id_key(id))
+        if cached is not None:
+            return cached.updated_at
+        return await self.repository.get_updated_at(id)
+
+    async def get_by_order_number(self, order_number: str) -> Optional[WorkOrder]:
+        cached_id = await self._cached(_order_number_key(order_number))
+        if cached_id is not None:
+            cached = await self.cache.backend.get(_id_key(cached_id))
+            # The order may have been renumbered since the number was cached
+            if cached is not None and cached.order_number == order_number:
+                return cached
+        return await self.cache.load(
+            _order_number_key(order_number), lambda: self.repository.get_by_order_number(order_number),
+            store=not self.reads_from_replica,
+        )
+
+    async def add(self, work_order: WorkOrder) -> WorkOrder:
+        created = await self.repository.add(work_order)
+        await self.cache.invalidate(order_numbers=[created.order_number])
+        return created
+
+    async def add_many(self, work_orders: Sequence[WorkOrderBase], chunk_size: int = 1000, all_or_nothing: bool = False) -> List[WorkOrder]:
+        created = await self.repository.add_many(work_orders, chunk_size=chunk_size, all_or_nothing=all_or_nothing)
+        await self.cache.invalidate(order_numbers=[wo.order_number for wo in created])
+        return created
+
+    async def update(
+        self,
+        work_order_id: uuid.UUID,
+        work_order_update_data: WorkOrderUpdate,
+        blocked_from: Optional[List[OrderStatus]] = None,
+        expected_updated_at: Optional[List[datetime]] = None,
+        expected_version: Optional[int] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> Optional[WorkOrder]:
+        previous = await self.cache.backend.get(_id_key(work_order_id))
+        try:
+            updated = await self.repository.update(
+                work_order_id, work_order_update_data, blocked_from=blocked_from, expected_updated_at=expected_updated_at,
+                expected_version=expected_version, previous_statuses=previous_statuses,
+            )
+        finally:
+            order_numbers = [wo.order_number for wo in (previous,) if wo is not None]
+            await self.cache.invalidate(work_order_ids=[work_order_id], order_numbers=order_numbers)
+        if updated is not None:
+            await self.cache.invalidate(order_numbers=[updated.order_number])
+        return updated
+
+    async def update_status_many(
+        self,
+        target: OrderStatus,
+        blocked_from: List[OrderStatus],
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[uuid.UUID]:
+        updated_ids = await self.repository.update_status_many(
+            target, blocked_from, ids=ids, filters=filters, previous_statuses=previous_statuses
+        )
+        await self.cache.invalidate(work_order_ids=updated_ids)
+        return updated_ids
+
+    async def apply_progress(
+        self,
+        increments: Mapping[uuid.UUID, Tuple[int, int]],
+        rejected_from: Sequence[OrderStatus] = (),
+        complete_from: Sequence[OrderStatus] = (),
+        chunk_size: int = 1000,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[WorkOrder]:
+        try:
+            return await self.repository.apply_progress(
+                increments, rejected_from=rejected_from, complete_from=complete_from, chunk_size=chunk_size,
+                previous_statuses=previous_statuses,
+            )
+        finally:
+            await self.cache.invalidate(work_order_ids=list(increments))
+
+    async def find_existing_ids(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        return await self.repository.find_existing_ids(ids)
+
+    async def archive_terminal(
+        self,
+        older_than: datetime,
+        statuses: Sequence[OrderStatus],
+        batch_size: int = 1000,
+    ) -> List[uuid.UUID]:
+        archived_ids = await self.repository.archive_terminal(older_than, statuses, batch_size=batch_size)
+        # Cached snapshots of these ids are hot table rows; the next lookup loads the archived row
+        await self.cache.invalidate(work_order_ids=archived_ids)
+        return archived_ids
+
+    async def delete(
+        self, id: uuid.UUID, blocked_from: Optional[List[OrderStatus]] = None, expected_version: Optional[int] = None
+    ) -> bool:
+        try:
+            return await self.repository.delete(id, blocked_from=blocked_from, expected_version=expected_version)
+        finally:
+            await self.cache.invalidate(work_order_ids=[id])
+
+    async def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[WorkOrder]:
+        return await self.repository.list_all(
+            skip=skip, limit=limit, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    async def list_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        return await self.repository.list_by_cursor(
+            limit=limit, cursor=cursor, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    def stream_all(
+        self,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[WorkOrder]]:
+        return self.repository.stream_all(
+            filters=filters, sort_by=sort_by, direction=direction, batch_size=batch_size, columns=columns,
+            include_archived=include_archived,
+        )
+
+    async def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[WorkOrder], Optional[str]]:
+        return await self.repository.search(term, limit=limit, cursor=cursor)
+
+    async def summarize(self, now: datetime) -> WorkOrderSummary:
+        return await self.repository.summarize(now)
+
+    async def count_all(self, filters: Optional[WorkOrderFilter] = None) -> int:
+        return await self.repository.count_all(filters=filters)
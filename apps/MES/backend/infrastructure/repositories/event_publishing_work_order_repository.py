@@ -0,0 +1,180 @@
+# infrastructure/repositories/event_publishing_work_order_repository.py
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from domain.repositories.work_order_repository import AbstractWorkOrderRepository
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from domain.value_objects.work_order_summary import WorkOrderSummary
+from infrastructure.events.work_order_events import CREATED, DELETED, UPDATED, WorkOrderEventBroadcaster, work_order_event
+from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderBase, WorkOrderUpdate
+
+
+def _row_event(event_type: str, work_order: WorkOrder, previous_status: Optional[OrderStatus] = None):
+    data = work_order.model_dump(mode="json")
+    if previous_status is not None:
+        data["previous_status"] = previous_status.value
+    return work_order_event(event_type, work_order.id, **data)
+
+
+class EventPublishingWorkOrderRepository(AbstractWorkOrderRepository):
+    """
+    Publishes a change feed event for every committed write of the wrapped repository
+    (created / updated / deleted); reads pass straight through.
+    Updated events carry the status before the write as previous_status, so that a subscriber
+    filtering by status also sees the orders leaving it. Writes that may change the status ask the
+    wrapped repository for it (previous_statuses), which returns it from the write itself.
+    """
+    def __init__(self, repository: AbstractWorkOrderRepository, broadcaster: WorkOrderEventBroadcaster):
+        self.repository = repository
+        self.broadcaster = broadcaster
+
+    async def get_by_id(self, id: uuid.UUID) -> Optional[WorkOrder]:
+        return await self.repository.get_by_id(id)
+
+    async def get_updated_at(self, id: uuid.UUID) -> Optional[datetime]:
+        return await self.repository.get_updated_at(id)
+
+    async def get_by_order_number(self, order_number: str) -> Optional[WorkOrder]:
+        return await self.repository.get_by_order_number(order_number)
+
+    async def add(self, work_order: WorkOrder) -> WorkOrder:
+        created = await self.repository.add(work_order)
+        await self.broadcaster.publish([_row_event(CREATED, created)])
+        return created
+
+    async def add_many(self, work_orders: Sequence[WorkOrderBase], chunk_size: int = 1000, all_or_nothing: bool = False) -> List[WorkOrder]:
+        created = await self.repository.add_many(work_orders, chunk_size=chunk_size, all_or_nothing=all_or_nothing)
+        await self.broadcaster.publish(_row_event(CREATED, wo) for wo in created)
+        return created
+
+    async def update(
+        self,
+        work_order_id: uuid.UUID,
+        work_order_update_data: WorkOrderUpdate,
+        blocked_from: Optional[List[OrderStatus]] = None,
+        expected_updated_at: Optional[List[datetime]] = None,
+        expected_version: Optional[int] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> Optional[WorkOrder]:
+        if previous_statuses is None and "status" in work_order_update_data.model_fields_set:
+            previous_statuses = {}
+        updated = await self.repository.update(
+            work_order_id, work_order_update_data, blocked_from=blocked_from, expected_updated_at=expected_updated_at,
+            expected_version=expected_version, previous_statuses=previous_statuses,
+        )
+        previous = previous_statuses or {}
+        # version only carries the expected version, it is not a change of its own
+        if updated is not None and work_order_update_data.model_fields_set - {"version"}:
+            await self.broadcaster.publish([_row_event(UPDATED, updated, previous.get(updated.id, updated.status))])
+        return updated
+
+    async def update_status_many(
+        self,
+        target: OrderStatus,
+        blocked_from: List[OrderStatus],
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[uuid.UUID]:
+        previous = {} if previous_statuses is None else previous_statuses
+        updated_ids = await self.repository.update_status_many(
+            target, blocked_from, ids=ids, filters=filters, previous_statuses=previous
+        )
+        await self.broadcaster.publish(
+            work_order_event(
+                UPDATED, wo_id, id=str(wo_id), status=target.value,
+                **({"previous_status": previous[wo_id].value} if wo_id in previous else {}),
+            )
+            for wo_id in updated_ids
+        )
+        return updated_ids
+
+    async def apply_progress(
+        self,
+        increments: Mapping[uuid.UUID, Tuple[int, int]],
+        rejected_from: Sequence[OrderStatus] = (),
+        complete_from: Sequence[OrderStatus] = (),
+        chunk_size: int = 1000,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[WorkOrder]:
+        # Without complete_from the status does not change
+        if previous_statuses is None and complete_from:
+            previous_statuses = {}
+        updated = await self.repository.apply_progress(
+            increments, rejected_from=rejected_from, complete_from=complete_from, chunk_size=chunk_size,
+            previous_statuses=previous_statuses,
+        )
+        previous = previous_statuses or {}
+        await self.broadcaster.publish(_row_event(UPDATED, wo, previous.get(wo.id, wo.status)) for wo in updated)
+        return updated
+
+    async def find_existing_ids(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        return await self.repository.find_existing_ids(ids)
+
+    async def archive_terminal(
+        self,
+        older_than: datetime,
+        statuses: Sequence[OrderStatus],
+        batch_size: int = 1000,
+    ) -> List[uuid.UUID]:
+        # Archival moves rows without changing them, so no change feed events
+        return await self.repository.archive_terminal(older_than, statuses, batch_size=batch_size)
+
+    async def delete(
+        self, id: uuid.UUID, blocked_from: Optional[List[OrderStatus]] = None, expected_version: Optional[int] = None
+    ) -> bool:
+        deleted = await self.repository.delete(id, blocked_from=blocked_from, expected_version=expected_version)
+        if deleted:
+            await self.broadcaster.publish([work_order_event(DELETED, id, id=str(id))])
+        return deleted
+
+    async def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[WorkOrder]:
+        return await self.repository.list_all(
+            skip=skip, limit=limit, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    async def list_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        return await self.repository.list_by_cursor(
+            limit=limit, cursor=cursor, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    def stream_all(
+        self,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[WorkOrder]]:
+        return self.repository.stream_all(
+            filters=filters, sort_by=sort_by, direction=direction, batch_size=batch_size, columns=columns,
+            include_archived=include_archived,
+        )
+
+    async def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[WorkOrder], Optional[str]]:
+        return await self.repository.search(term, limit=limit, cursor=cursor)
+
+    async def summarize(self, now: datetime) -> WorkOrderSummary:
+        return await self.repository.summarize(now)
+
+    async def count_all(self, filters: Optional[WorkOrderFilter] = None) -> int:
+        return await self.repository.count_all(filters=filters)
@@ -0,0 +1,154 @@
+# infrastructure/repositories/replica_routing_work_order_repository.py
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from domain.repositories.work_order_repository import AbstractWorkOrderRepository
+from domain.value_objects.order_status import OrderStatus
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from domain.value_objects.work_order_summary import WorkOrderSummary
+from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderBase, WorkOrderUpdate
+
+
+class ReplicaRoutingWorkOrderRepository(AbstractWorkOrderRepository):
+    """
+    Routes the read-only methods (get_by_id, get_by_order_number, get_updated_at, list_all,
+    list_by_cursor, count_all, stream_all, summarize, search) to a repository on a read replica
+    session and all writes to the primary one.
+    Once a write has been attempted, later reads of the same repository go to the primary as
+    well: the service reads back right after a write (e.g. to explain a rejected update) and
+    must not see a replica that has not replayed it yet. find_existing_ids only serves such
+    write flows and always reads the primary.
+    """
+    def __init__(self, primary: AbstractWorkOrderRepository, replica: AbstractWorkOrderRepository):
+        self.primary = primary
+        self.replica = replica
+        self._wrote = False
+
+    @property
+    def reader(self) -> AbstractWorkOrderRepository:
+        return self.primary if self._wrote else self.replica
+
+    @property
+    def writer(self) -> AbstractWorkOrderRepository:
+        self._wrote = True
+        return self.primary
+
+    async def get_by_id(self, id: uuid.UUID) -> Optional[WorkOrder]:
+        return await self.reader.get_by_id(id)
+
+    async def get_updated_at(self, id: uuid.UUID) -> Optional[datetime]:
+        return await self.reader.get_updated_at(id)
+
+    async def get_by_order_number(self, order_number: str) -> Optional[WorkOrder]:
+        return await self.reader.get_by_order_number(order_number)
+
+    async def add(self, work_order: WorkOrder) -> WorkOrder:
+        return await self.writer.add(work_order)
+
+    async def add_many(self, work_orders: Sequence[WorkOrderBase], chunk_size: int = 1000, all_or_nothing: bool = False) -> List[WorkOrder]:
+        return await self.writer.add_many(work_orders, chunk_size=chunk_size, all_or_nothing=all_or_nothing)
+
+    async def update(
+        self,
+        work_order_id: uuid.UUID,
+        work_order_update_data: WorkOrderUpdate,
+        blocked_from: Optional[List[OrderStatus]] = None,
+        expected_updated_at: Optional[List[datetime]] = None,
+        expected_version: Optional[int] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> Optional[WorkOrder]:
+        return await self.writer.update(
+            work_order_id, work_order_update_data, blocked_from=blocked_from, expected_updated_at=expected_updated_at,
+            expected_version=expected_version, previous_statuses=previous_statuses,
+        )
+
+    async def update_status_many(
+        self,
+        target: OrderStatus,
+        blocked_from: List[OrderStatus],
+        ids: Optional[List[uuid.UUID]] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[uuid.UUID]:
+        return await self.writer.update_status_many(
+            target, blocked_from, ids=ids, filters=filters, previous_statuses=previous_statuses
+        )
+
+    async def apply_progress(
+        self,
+        increments: Mapping[uuid.UUID, Tuple[int, int]],
+        rejected_from: Sequence[OrderStatus] = (),
+        complete_from: Sequence[OrderStatus] = (),
+        chunk_size: int = 1000,
+        previous_statuses: Optional[Dict[uuid.UUID, OrderStatus]] = None,
+    ) -> List[WorkOrder]:
+        return await self.writer.apply_progress(
+            increments, rejected_from=rejected_from, complete_from=complete_from, chunk_size=chunk_size,
+            previous_statuses=previous_statuses,
+        )
+
+    async def find_existing_ids(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        return await self.primary.find_existing_ids(ids)
+
+    async def archive_terminal(
+        self,
+        older_than: datetime,
+        statuses: Sequence[OrderStatus],
+        batch_size: int = 1000,
+    ) -> List[uuid.UUID]:
+        return await self.writer.archive_terminal(older_than, statuses, batch_size=batch_size)
+
+    async def delete(
+        self, id: uuid.UUID, blocked_from: Optional[List[OrderStatus]] = None, expected_version: Optional[int] = None
+    ) -> bool:
+        return await self.writer.delete(id, blocked_from=blocked_from, expected_version=expected_version)
+
+    async def list_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[WorkOrder]:
+        return await self.reader.list_all(
+            skip=skip, limit=limit, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    async def list_by_cursor(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[WorkOrder], Optional[str]]:
+        return await self.reader.list_by_cursor(
+            limit=limit, cursor=cursor, filters=filters, sort_by=sort_by, direction=direction, columns=columns
+        )
+
+    def stream_all(
+        self,
+        filters: Optional[WorkOrderFilter] = None,
+        sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+        direction: SortDirection = SortDirection.ASC,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[WorkOrder]]:
+        return self.reader.stream_all(
+            filters=filters, sort_by=sort_by, direction=direction, batch_size=batch_size, columns=columns,
+            include_archived=include_archived,
+        )
+
+    async def search(self, term: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[WorkOrder], Optional[str]]:
+        return await self.reader.search(term, limit=limit, cursor=cursor)
+
+    async def summarize(self, now: datetime) -> WorkOrderSummary:
+        return await self.reader.summarize(now)
+
+    async def count_all(self, filters: Optional[WorkOrderFilter] = None) -> int:
+        return await self.reader.count_all(filters=filters)
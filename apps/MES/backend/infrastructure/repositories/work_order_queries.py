@@ -0,0 +1,670 @@
+# infrastructure/repositories/work_order_queries.py
+"""
+Statement builders shared by the sync and async SQLModel work order repositories,
+so both execute exactly the same SQL and only differ in how they await I/O.
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, and_, case, column, insert, literal, literal_column, or_, table, tuple_, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select, func, update, delete
+
+from domain.value_objects.order_status import ACTIVE_ORDER_STATUSES, OrderStatus
+from domain.value_objects.work_order_summary import ProductSummary, WorkOrderSummary
+from domain.value_objects.work_order_query import SortDirection, WorkOrderFilter, WorkOrderSortField
+from infrastructure.sqlmodels.work_order import (
+    NO_DUE_DAY, SQLITE_SEARCH_TABLE, WorkOrder, WorkOrderArchive, WorkOrderBase, WorkOrderRead, WorkOrderStatusCount, WorkOrderSummaryBucket,
+)
+
+# Sort fields whose column may be NULL. NULL sorts as the largest value (ASC NULLS LAST /
+# DESC NULLS FIRST), which is PostgreSQL's default and therefore matches a plain btree index.
+NULLABLE_SORT_FIELDS = {WorkOrderSortField.DUE_DATE}
+DATETIME_SORT_FIELDS = {WorkOrderSortField.CREATED_AT, WorkOrderSortField.UPDATED_AT, WorkOrderSortField.DUE_DATE}
+
+# Columns of a WorkOrderRead response, in its field (JSON key) order
+READ_COLUMNS: Tuple[str, ...] = tuple(WorkOrderRead.model_fields)
+
+
+def sort_column(sort_by: WorkOrderSortField, model=WorkOrder):
+    return getattr(model, sort_by.value)
+
+
+def work_order_select(columns: Optional[Sequence[str]] = None, model=WorkOrder):
+    """
+    select(WorkOrder) returning table models, or, with columns, a column-projected select returning
+    plain rows (named tuples) that skip identity-map bookkeeping and model construction per row.
+    model=WorkOrderArchive selects the same columns from the archive table.
+    """
+    if columns is None:
+        return select(model)
+    unknown = [name for name in columns if name not in READ_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown work order columns: {', '.join(unknown)}.")
+    return select(*(getattr(model, name) for name in columns))
+
+
+def projection(fields: Sequence[str], *required: str) -> Tuple[str, ...]:
+    """
+    Columns to select for a sparse fieldset: the requested fields plus the ones the caller needs
+    itself (id/updated_at for the ETag, the sort column for the cursor), in READ_COLUMNS order.
+    """
+    wanted = set(fields).union(required)
+    return tuple(name for name in READ_COLUMNS if name in wanted)
+
+
+def apply_filters(statement, filters: Optional[WorkOrderFilter], model=WorkOrder):
+    """Pushes the list filters down into the WHERE clause."""
+    if filters is None:
+        return statement
+    if filters.statuses:
+        statement = statement.where(model.status.in_(filters.statuses))
+    if filters.due_from is not None:
+        statement = statement.where(model.due_date >= filters.due_from)
+    if filters.due_to is not None:
+        statement = statement.where(model.due_date <= filters.due_to)
+    if filters.created_from is not None:
+        statement = statement.where(model.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        statement = statement.where(model.created_at <= filters.created_to)
+    if filters.product_name is not None:
+        statement = statement.where(model.product_name == filters.product_name)
+    return statement
+
+
+def encode_cursor(sort_by: WorkOrderSortField, direction: SortDirection, last: Any) -> str:
+    """
+    Encodes the keyset position after `last` as an opaque, URL-safe cursor.
+    The cursor also records the sort key/direction it was issued for.
+    """
+    value = getattr(last, sort_by.value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"k": sort_by.value, "d": direction.value, "v": value, "id": str(last.id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: WorkOrderSortField, direction: SortDirection) -> Tuple[Any, uuid.UUID]:
+    """
+    Decodes a cursor produced by encode_cursor into (sort value, id).
+    Raises ValueError for malformed cursors or cursors issued for a different ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload: Dict[str, Any] = json.loads(raw)
+        key, cursor_direction, value = payload["k"], payload["d"], payload["v"]
+        last_id = uuid.UUID(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if key != sort_by.value or cursor_direction != direction.value:
+        raise ValueError(f"Cursor was issued for sort '{key} {cursor_direction}', not '{sort_by.value} {direction.value}'.")
+    if value is None and sort_by not in NULLABLE_SORT_FIELDS:
+        raise ValueError("Invalid cursor.")
+    if value is not None and sort_by in DATETIME_SORT_FIELDS:
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor.")
+    return value, last_id
+
+
+def ordered(statement, sort_by: WorkOrderSortField, direction: SortDirection, model=WorkOrder):
+    """Applies ORDER BY (sort column, id) so that paging is deterministic."""
+    column = sort_column(sort_by, model)
+    if direction == SortDirection.DESC:
+        column = column.desc()
+        if sort_by in NULLABLE_SORT_FIELDS:
+            column = column.nulls_first()
+        return statement.order_by(column, model.id.desc())
+    column = column.asc()
+    if sort_by in NULLABLE_SORT_FIELDS:
+        column = column.nulls_last()
+    return statement.order_by(column, model.id.asc())
+
+
+def after_cursor(sort_by: WorkOrderSortField, direction: SortDirection, last_value: Any, last_id: uuid.UUID):
+    """
+    WHERE clause selecting the rows strictly after (last_value, last_id) in the page ordering.
+    For non-null keys this is a single row-value comparison served by the (column, id) index.
+    """
+    column = sort_column(sort_by)
+    key = tuple_(column, WorkOrder.id)
+    descending = direction == SortDirection.DESC
+    if sort_by not in NULLABLE_SORT_FIELDS:
+        return key < tuple_(last_value, last_id) if descending else key > tuple_(last_value, last_id)
+    if last_value is None:
+        if descending:
+            # NULLs come first, then all non-null values
+            return or_(and_(column.is_(None), WorkOrder.id < last_id), column.is_not(None))
+        return and_(column.is_(None), WorkOrder.id > last_id)
+    if descending:
+        return key < tuple_(last_value, last_id)
+    return or_(key > tuple_(last_value, last_id), column.is_(None))
+
+
+def list_offset_statement(
+    skip: int,
+    limit: int,
+    filters: Optional[WorkOrderFilter] = None,
+    sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+    direction: SortDirection = SortDirection.ASC,
+    columns: Optional[Sequence[str]] = None,
+):
+    statement = apply_filters(work_order_select(columns), filters)
+    return ordered(statement, sort_by, direction).offset(skip).limit(limit)
+
+
+def export_statement(
+    filters: Optional[WorkOrderFilter] = None,
+    sort_by: WorkOrderSortField = WorkOrderSortField.CREATED_AT,
+    direction: SortDirection = SortDirection.ASC,
+    batch_size: int = 1000,
+    columns: Optional[Sequence[str]] = None,
+    model=WorkOrder,
+):
+    """
+    Full filtered result in page order, fetched batch_size rows at a time through a server-side cursor
+    (yield_per implies stream_results), so the rows are never all held in memory.
+    """
+    statement = ordered(apply_filters(work_order_select(columns, model), filters, model), sort_by, direction, model)
+    return statement.execution_options(yield_per=batch_size)
+
+
+def count_statement(filters: Optional[WorkOrderFilter] = None):
+    """
+    Total for a list query. Unfiltered and status-only filtered totals are read from the
+    work_order_status_counts summary table; any other filter falls back to count(*).
+    """
+    if filters is None or not filters.model_dump(exclude_none=True, exclude={"statuses"}):
+        statement = select(func.coalesce(func.sum(WorkOrderStatusCount.count), 0))
+        if filters is not None and filters.statuses:
+            statement = statement.where(WorkOrderStatusCount.status.in_(filters.statuses))
+        return statement
+    return apply_filters(select(func.count(WorkOrder.id)), filters)
+
+
+def list_cursor_statement(
+    limit: int,
+    cursor: Optional[str],
+    sort_by: WorkOrderSortField,
+    direction: SortDirection,
+    filters: Optional[WorkOrderFilter] = None,
+    columns: Optional[Sequence[str]] = None,
+):
+    """
+    Keyset page: WHERE (sort column, id) > (last value, last id) ORDER BY sort column, id LIMIT limit + 1.
+    The extra row only signals that another page exists. The row-value comparison is served by the
+    (column, id) composite indexes, so the cost no longer depends on how deep the client has paged.
+    """
+    statement = apply_filters(work_order_select(columns), filters)
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_by, direction)
+        statement = statement.where(after_cursor(sort_by, direction, last_value, last_id))
+    return ordered(statement, sort_by, direction).limit(limit + 1)
+
+
+def cursor_page(
+    rows: Sequence[Any],
+    limit: int,
+    sort_by: WorkOrderSortField,
+    direction: SortDirection,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Splits the limit + 1 rows of a keyset query into (page items, next cursor).
+    Works for table models and projected rows alike, as long as the sort column and id were selected.
+    """
+    items = list(rows[:limit])
+    if len(rows) > limit and items:
+        return items, encode_cursor(sort_by, direction, items[-1])
+    return items, None
+
+
+# Search relevance tiers, best first: exact order number, order number prefix, product name, notes only
+SEARCH_RANK_EXACT_NUMBER = 3
+SEARCH_RANK_NUMBER_PREFIX = 2
+SEARCH_RANK_PRODUCT_NAME = 1
+SEARCH_RANK_NOTES = 0
+# Shortest search term: one full trigram, below which neither pg_trgm nor FTS5 can narrow the candidates
+SEARCH_MIN_LENGTH = 3
+
+
+def like_pattern(term: str) -> str:
+    """Escapes the LIKE wildcards in a search term (escape character: backslash)."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_rank(term: str):
+    """Relevance tier of a search hit, matched case-insensitively."""
+    pattern = like_pattern(term)
+    # Inline integer constants: untyped bound parameters in CASE would be resolved as text by PostgreSQL
+    tier = lambda value: literal_column(str(value), Integer)
+    return case(
+        (WorkOrder.order_number.ilike(pattern, escape="\\"), tier(SEARCH_RANK_EXACT_NUMBER)),
+        (WorkOrder.order_number.ilike(f"{pattern}%", escape="\\"), tier(SEARCH_RANK_NUMBER_PREFIX)),
+        (WorkOrder.product_name.ilike(f"%{pattern}%", escape="\\"), tier(SEARCH_RANK_PRODUCT_NAME)),
+        else_=tier(SEARCH_RANK_NOTES),
+    )
+
+
+def encode_search_cursor(term: str, rank: int, order_number: str) -> str:
+    """Opaque cursor after the hit (rank, order_number) of the search for term."""
+    payload = {"q": term, "r": rank, "o": order_number}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str, term: str) -> Tuple[int, str]:
+    """
+    Decodes a cursor produced by encode_search_cursor into (rank, order_number).
+    Raises ValueError for malformed cursors or cursors issued for a different search term.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload: Dict[str, Any] = json.loads(raw)
+        cursor_term, rank, order_number = payload["q"], payload["r"], payload["o"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(rank, int) or not isinstance(order_number, str):
+        raise ValueError("Invalid cursor.")
+    if cursor_term != term:
+        raise ValueError("Cursor was issued for a different search term.")
+    return rank, order_number
+
+
+def search_statement(term: str, limit: int, cursor: Optional[str], dialect_name: str):
+    """
+    Ranked search page: order numbers starting with term, product names or notes containing it,
+    ORDER BY relevance tier, order_number LIMIT limit + 1 (keyset on (tier, order_number), which is unique).
+    Rows are (WorkOrder, search_rank).
+
+    The ILIKE patterns are served by the pg_trgm GIN indexes on PostgreSQL (a BitmapOr of the three),
+    so only matching rows are read and ranked. On SQLite the FTS5 trigram table narrows the candidates
+    to rows containing term anywhere; the ILIKE predicates then apply the prefix / substring semantics.
+    Only the hot table is searched, not the archive.
+    """
+    pattern = like_pattern(term)
+    rank = search_rank(term)
+    rank_label = rank.label("search_rank")
+    statement = select(WorkOrder, rank_label).where(
+        or_(
+            WorkOrder.order_number.ilike(f"{pattern}%", escape="\\"),
+            WorkOrder.product_name.ilike(f"%{pattern}%", escape="\\"),
+            WorkOrder.notes.ilike(f"%{pattern}%", escape="\\"),
+        )
+    )
+    if dialect_name == "sqlite" and len(term) >= SEARCH_MIN_LENGTH:
+        fts = table(SQLITE_SEARCH_TABLE, column("rowid"))
+        phrase = '"' + term.replace('"', '""') + '"'
+        statement = statement.where(
+            literal_column(f"{WorkOrder.__tablename__}.rowid").in_(
+                select(fts.c.rowid).where(literal_column(SQLITE_SEARCH_TABLE).op("MATCH")(phrase))
+            )
+        )
+    if cursor:
+        last_rank, last_order_number = decode_search_cursor(cursor, term)
+        statement = statement.where(
+            or_(rank < last_rank, and_(rank == last_rank, WorkOrder.order_number > last_order_number))
+        )
+    return statement.order_by(rank_label.desc(), WorkOrder.order_number.asc()).limit(limit + 1)
+
+
+def search_page(rows: Sequence[Any], limit: int, term: str) -> Tuple[List[WorkOrder], Optional[str]]:
+    """Splits the limit + 1 (WorkOrder, search_rank) rows of search_statement into (page items, next cursor)."""
+    page = list(rows[:limit])
+    items = [row[0] for row in page]
+    if len(rows) > limit and page:
+        last, last_rank = page[-1]
+        return items, encode_search_cursor(term, last_rank, last.order_number)
+    return items, None
+
+
+# Dialect-specific INSERT constructs providing ON CONFLICT ... DO NOTHING; also the supported
+# database backends (core.dependencies rejects any other dialect at startup)
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def chunked(rows: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def insert_rows(work_orders: Sequence[WorkOrderBase]) -> List[Dict[str, Any]]:
+    """
+    Column values for a bulk INSERT, from WorkOrder table models or plain WorkOrderCreate payloads
+    (which skips building a table model per row). created_at/updated_at are left out so that the
+    server defaults apply instead of explicit NULLs.
+    """
+    rows = [wo.model_dump(exclude={"created_at", "updated_at"}) for wo in work_orders]
+    for row in rows:
+        if row.get("id") is None:
+            row["id"] = uuid.uuid4()
+    return rows
+
+
+def insert_skip_duplicates_statement(dialect_name: str):
+    """
+    INSERT ... ON CONFLICT (order_number) DO NOTHING RETURNING, executed with the rows as a list of
+    parameter sets. SQLAlchemy batches those into multi-row VALUES ("insertmanyvalues") while the
+    statement itself compiles once and is reused from the compiled cache, instead of compiling a new
+    literal VALUES list of a different size for every chunk.
+    Rows whose order_number already exists are skipped by the database and simply not returned,
+    so duplicates are detected without a separate lookup and without racing concurrent writers.
+    render_nulls: the ORM bulk INSERT otherwise leaves out None values (e.g. rows without due_date
+    or notes) and starts a new batch whenever the set of columns changes from one row to the next,
+    so a chunk mixing such rows ran as many small INSERTs instead of one.
+    """
+    insert = DIALECT_INSERTS.get(dialect_name)
+    if insert is None:
+        raise NotImplementedError(f"Bulk insert is not supported for database dialect '{dialect_name}'.")
+    return (
+        insert(WorkOrder)
+        .on_conflict_do_nothing(index_elements=[WorkOrder.order_number])
+        .returning(WorkOrder)
+        .execution_options(render_nulls=True)
+    )
+
+
+def updated_at_statement(work_order_id: uuid.UUID):
+    """Projected read of the ETag/Last-Modified source column."""
+    return select(WorkOrder.updated_at).where(WorkOrder.id == work_order_id)
+
+
+def update_statement(
+    work_order_id: uuid.UUID,
+    values: Dict[str, Any],
+    blocked_from: Sequence[OrderStatus] = (),
+    expected_updated_at: Optional[Sequence[datetime]] = None,
+    expected_version: Optional[int] = None,
+    previous_status: bool = False,
+):
+    """
+    Single-statement update (version = version + 1 comes from the column's onupdate):
+    UPDATE work_orders SET ... WHERE id = :id [AND status NOT IN (:blocked)] [AND updated_at IN (:expected)]
+    [AND version = :expected_version] RETURNING *.
+    No row comes back when the order does not exist, the status guard rejects the change or the
+    order was modified since the expected updated_at (If-Match) / version. The version comparison
+    and increment happen in the same row update, so two writers holding the same version can never both succeed.
+    With previous_status, rows are (WorkOrder, previous status) (see returning_previous_status).
+    """
+    statement = update(WorkOrder).where(WorkOrder.id == work_order_id).values(**values)
+    if blocked_from:
+        statement = statement.where(WorkOrder.status.not_in(blocked_from))
+    if expected_updated_at is not None:
+        statement = statement.where(WorkOrder.updated_at.in_(expected_updated_at))
+    if expected_version is not None:
+        statement = statement.where(WorkOrder.version == expected_version)
+    statement = statement.returning(WorkOrder)
+    if previous_status:
+        statement = returning_previous_status(statement, ids=[work_order_id])
+    return statement.execution_options(synchronize_session=False, populate_existing=True)
+
+
+def delete_statement(
+    work_order_id: uuid.UUID,
+    blocked_from: Sequence[OrderStatus] = (),
+    expected_version: Optional[int] = None,
+):
+    """
+    DELETE FROM work_orders WHERE id = :id [AND status NOT IN (:blocked)] [AND version = :expected_version] RETURNING id.
+    The status and version guards are checked by the database, so no row has to be loaded first.
+    """
+    statement = delete(WorkOrder).where(WorkOrder.id == work_order_id)
+    if blocked_from:
+        statement = statement.where(WorkOrder.status.not_in(blocked_from))
+    if expected_version is not None:
+        statement = statement.where(WorkOrder.version == expected_version)
+    return statement.returning(WorkOrder.id).execution_options(synchronize_session=False)
+
+
+def bulk_status_update_statement(
+    target: OrderStatus,
+    blocked_from: Sequence[OrderStatus],
+    ids: Optional[Sequence[uuid.UUID]] = None,
+    filters: Optional[WorkOrderFilter] = None,
+    previous_status: bool = False,
+):
+    """
+    Set-based status transition:
+    UPDATE work_orders SET status = :target WHERE <ids/filters> AND status NOT IN (:blocked) RETURNING id.
+    The status guard is evaluated by the database, atomically with the write.
+    With previous_status, rows are (id, previous status) (see returning_previous_status).
+    """
+    statement = update(WorkOrder).values(status=target)
+    if ids is not None:
+        statement = statement.where(WorkOrder.id.in_(ids))
+    statement = apply_filters(statement, filters)
+    if blocked_from:
+        statement = statement.where(WorkOrder.status.not_in(blocked_from))
+    statement = statement.returning(WorkOrder.id)
+    if previous_status:
+        statement = returning_previous_status(statement, ids=ids, filters=filters)
+    return statement.execution_options(synchronize_session=False)
+
+
+def statuses_for_update_statement(
+    ids: Optional[Sequence[uuid.UUID]] = None,
+    filters: Optional[WorkOrderFilter] = None,
+):
+    """
+    SELECT id, status FROM work_orders WHERE <ids/filters> ORDER BY id FOR UPDATE: the status of the
+    rows a write is about to change. The row locks keep the status until the write commits in the same
+    transaction; the id order avoids lock-order deadlocks. Run on its own only where the write cannot
+    return the previous status itself (SQLite, which serializes writers anyway and ignores FOR UPDATE).
+    """
+    statement = select(WorkOrder.id, WorkOrder.status)
+    if ids is not None:
+        statement = statement.where(WorkOrder.id.in_(ids))
+    return apply_filters(statement, filters).order_by(WorkOrder.id).with_for_update()
+
+
+# Dialects whose UPDATE ... FROM may reference the FROM subquery in RETURNING (SQLite's RETURNING
+# only sees the updated table)
+PREVIOUS_STATUS_RETURNING_DIALECTS = {"postgresql"}
+
+
+def returning_previous_status(
+    statement,
+    ids: Optional[Sequence[uuid.UUID]] = None,
+    filters: Optional[WorkOrderFilter] = None,
+):
+    """
+    Adds the status before the write to the RETURNING of an UPDATE of the rows selected by ids/filters:
+    UPDATE work_orders SET ... FROM (SELECT id, status FROM work_orders WHERE <ids/filters> ORDER BY id FOR UPDATE)
+    AS previous WHERE work_orders.id = previous.id AND ... RETURNING ..., previous.status.
+    The subquery locks and reads the rows before the SET applies, so the old status comes from the write itself.
+    """
+    previous = statuses_for_update_statement(ids=ids, filters=filters).subquery("previous")
+    return statement.where(WorkOrder.id == previous.c.id).returning(previous.c.status.label("previous_status"))
+
+
+def progress_update_statement(
+    increments: Mapping[uuid.UUID, Tuple[int, int]],
+    rejected_from: Sequence[OrderStatus] = (),
+    complete_from: Sequence[OrderStatus] = (),
+    previous_status: bool = False,
+):
+    """
+    Set-based progress update for many orders in one statement:
+    UPDATE work_orders SET produced_quantity = produced_quantity + CASE id WHEN :id1 THEN :n1 ... END,
+        scrapped_quantity = ..., status = CASE WHEN status IN (:complete_from) AND produced_quantity + <delta> >= quantity
+        THEN 'COMPLETED' ELSE status END
+    WHERE id IN (:ids) [AND status NOT IN (:rejected_from)] RETURNING *.
+    The right-hand sides see the row before the update, so the completion check adds the delta itself.
+    Increments are relative, so concurrent writers (other workers) never overwrite each other.
+    With previous_status, rows are (WorkOrder, previous status) (see returning_previous_status).
+    """
+    produced = case({wo_id: produced for wo_id, (produced, _) in increments.items()}, value=WorkOrder.id, else_=0)
+    scrapped = case({wo_id: scrapped for wo_id, (_, scrapped) in increments.items()}, value=WorkOrder.id, else_=0)
+    values: Dict[str, Any] = {
+        "produced_quantity": WorkOrder.produced_quantity + produced,
+        "scrapped_quantity": WorkOrder.scrapped_quantity + scrapped,
+    }
+    if complete_from:
+        values["status"] = case(
+            (
+                and_(WorkOrder.status.in_(complete_from), WorkOrder.produced_quantity + produced >= WorkOrder.quantity),
+                literal(OrderStatus.COMPLETED, WorkOrder.status.type),
+            ),
+            else_=WorkOrder.status,
+        )
+    statement = update(WorkOrder).where(WorkOrder.id.in_(list(increments))).values(**values)
+    if rejected_from:
+        statement = statement.where(WorkOrder.status.not_in(rejected_from))
+    statement = statement.returning(WorkOrder)
+    if previous_status:
+        statement = returning_previous_status(statement, ids=list(increments))
+    return statement.execution_options(synchronize_session=False, populate_existing=True)
+
+
+def existing_ids_statement(ids: Sequence[uuid.UUID]):
+    """Ids that exist, hot or archived."""
+    return union_all(
+        select(WorkOrder.id).where(WorkOrder.id.in_(ids)),
+        select(WorkOrderArchive.id).where(WorkOrderArchive.id.in_(ids)),
+    )
+
+
+def archived_by_id_statement(work_order_id: uuid.UUID):
+    return select(WorkOrderArchive).where(WorkOrderArchive.id == work_order_id)
+
+
+def archived_by_order_number_statement(order_number: str):
+    """Most recently archived order with this number (numbers can be reused once an order is archived)."""
+    return (
+        select(WorkOrderArchive)
+        .where(WorkOrderArchive.order_number == order_number)
+        .order_by(WorkOrderArchive.archived_at.desc())
+        .limit(1)
+    )
+
+
+def archived_updated_at_statement(work_order_id: uuid.UUID):
+    return select(WorkOrderArchive.updated_at).where(WorkOrderArchive.id == work_order_id)
+
+
+# Columns moved from work_orders to work_orders_archive (archived_at is set by the archive table's default)
+ARCHIVED_COLUMNS: Tuple[str, ...] = tuple(column.name for column in WorkOrder.__table__.columns)
+
+
+def archive_candidates_delete_statement(older_than: datetime, batch_size: int, statuses: Sequence[OrderStatus]):
+    """
+    One archival batch, first half:
+    DELETE FROM work_orders WHERE id IN (SELECT id FROM work_orders WHERE status IN (:terminal) AND updated_at < :cutoff
+        ORDER BY updated_at LIMIT :n FOR UPDATE SKIP LOCKED) RETURNING <all columns>.
+    The candidates come from the partial (updated_at) index over terminal orders. SKIP LOCKED lets concurrent
+    archivers (one per worker) take disjoint batches instead of queueing behind each other, and rows a request
+    is currently writing are simply left for the next batch (SQLite ignores the locking clause).
+    """
+    candidates = (
+        select(WorkOrder.id)
+        .where(WorkOrder.status.in_(statuses), WorkOrder.updated_at < older_than)
+        .order_by(WorkOrder.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        delete(WorkOrder)
+        .where(WorkOrder.id.in_(candidates.scalar_subquery()))
+        .returning(*(getattr(WorkOrder, name) for name in ARCHIVED_COLUMNS))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def archive_insert_statement():
+    """Second half of a batch: the deleted rows, executed as a list of parameter sets."""
+    return insert(WorkOrderArchive)
+
+
+def status_counts_rebuild_statements():
+    """Recomputes work_order_status_counts from work_orders (backfill / repair)."""
+    return [
+        delete(WorkOrderStatusCount),
+        WorkOrderStatusCount.__table__.insert().from_select(
+            ["status", "count"],
+            select(WorkOrder.status, func.count(WorkOrder.id)).group_by(WorkOrder.status),
+        ),
+    ]
+
+
+def summary_rebuild_statements():
+    """Recomputes work_order_summary from work_orders (backfill / repair)."""
+    due_day = case(
+        (and_(WorkOrder.status.in_(ACTIVE_ORDER_STATUSES), WorkOrder.due_date.is_not(None)), func.date(WorkOrder.due_date)),
+        else_=literal(NO_DUE_DAY),
+    )
+    rows = select(WorkOrder.product_name, WorkOrder.status, due_day.label("due_day"), WorkOrder.quantity).subquery()
+    return [
+        delete(WorkOrderSummaryBucket),
+        WorkOrderSummaryBucket.__table__.insert().from_select(
+            ["product_name", "status", "due_day", "order_count", "planned_quantity"],
+            select(rows.c.product_name, rows.c.status, rows.c.due_day, func.count(), func.sum(rows.c.quantity))
+            .group_by(rows.c.product_name, rows.c.status, rows.c.due_day),
+        ),
+    ]
+
+
+def summary_statement(now: datetime):
+    """
+    Dashboard aggregates from the work_order_summary buckets, folded to one row per
+    (product, status, due before today). Reads only the summary table, whose size does not grow with work_orders.
+    """
+    buckets = select(
+        WorkOrderSummaryBucket.product_name,
+        WorkOrderSummaryBucket.status,
+        (WorkOrderSummaryBucket.due_day < now.date()).label("overdue"),
+        WorkOrderSummaryBucket.order_count,
+        WorkOrderSummaryBucket.planned_quantity,
+    ).subquery()
+    return (
+        select(
+            buckets.c.product_name,
+            buckets.c.status,
+            buckets.c.overdue,
+            func.sum(buckets.c.order_count).label("order_count"),
+            func.sum(buckets.c.planned_quantity).label("planned_quantity"),
+        )
+        .group_by(buckets.c.product_name, buckets.c.status, buckets.c.overdue)
+        .order_by(buckets.c.product_name)
+    )
+
+
+def overdue_today_statement(now: datetime):
+    """
+    Active orders due earlier today: the part of the overdue count the day buckets cannot tell.
+    Served by the partial (status, due_date) index over active orders and limited to one day of due dates.
+    """
+    day_start = datetime.combine(now.date(), datetime.min.time())
+    return select(func.count(WorkOrder.id)).where(
+        WorkOrder.status.in_(ACTIVE_ORDER_STATUSES),
+        WorkOrder.due_date >= day_start,
+        WorkOrder.due_date < min(now, day_start + timedelta(days=1)),
+    )
+
+
+def build_summary(rows: Sequence[Any], overdue_today: int, now: datetime) -> WorkOrderSummary:
+    """Folds the rows of summary_statement (sorted by product) into a WorkOrderSummary."""
+    summary = WorkOrderSummary(as_of=now, overdue=overdue_today)
+    products: Dict[str, ProductSummary] = {}
+    for row in rows:
+        if not row.order_count:
+            continue
+        summary.total += row.order_count
+        summary.status_counts[row.status] = summary.status_counts.get(row.status, 0) + row.order_count
+        product = products.setdefault(row.product_name, ProductSummary(product_name=row.product_name))
+        product.order_count += row.order_count
+        product.planned_quantity += row.planned_quantity
+        if row.status in ACTIVE_ORDER_STATUSES:
+            product.active_order_count += row.order_count
+            product.active_planned_quantity += row.planned_quantity
+            if row.overdue:
+                summary.overdue += row.order_count
+    summary.products = list(products.values())
+    return summary
@@ -0,0 +1,33 @@
+# infrastructure/sqlmodels/idempotency.py
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy import Index, LargeBinary, Text
+
+from infrastructure.database.sql_functions import db_now
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """
+    Stored response of a write request sent with an Idempotency-Key header (see Alembic revision
+    409dc7e4e752), shared by all workers when IDEMPOTENCY_STORE=database.
+    A row without status_code is a claim: the request is being executed by the worker holding it
+    until locked_until, after which another worker may take it over (e.g. when the first one died).
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Purge of expired keys (python -m maintenance.work_orders purge-idempotency-keys)
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    key: str = Field(max_length=255, primary_key=True, description="Idempotency-Key 请求头")
+    request_hash: str = Field(max_length=64, description="请求指纹 (方法、路径、查询参数与请求体的 SHA-256)")
+    status_code: Optional[int] = Field(default=None, description="响应状态码；为空表示请求仍在执行")
+    headers: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True), description="响应头 (JSON)")
+    body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary, nullable=True), description="响应体")
+    locked_until: Optional[datetime] = Field(default=None, description="执行中的请求的租约到期时间")
+    expires_at: datetime = Field(description="过期时间，之后同一个 key 视为新请求")
+    created_at: Optional[datetime] = Field(
+        default=None, description="创建时间", sa_column_kwargs={'server_default': db_now()}
+    )
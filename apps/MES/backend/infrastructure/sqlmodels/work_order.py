@@ -1,13 +1,21 @@
 # infrastructure/sqlmodels/work_order.py
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from sqlmodel import Field, SQLModel, Column
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID # For PostgreSQL specific UUID type
 from sqlalchemy import Enum as SAEnum # For SQLAlchemy Enum type
+from sqlalchemy import DDL, BigInteger, Index, event, text
+
+from domain.value_objects.order_status import OrderStatus, ACTIVE_ORDER_STATUSES, TERMINAL_ORDER_STATUSES # Your domain enum
+from infrastructure.database.sql_functions import db_now
+
+# Partial index predicate: only orders still on the shop floor
+ACTIVE_STATUS_PREDICATE = "status IN ({})".format(", ".join(f"'{s.name}'" for s in ACTIVE_ORDER_STATUSES))
+# Partial index predicate: archival candidates
+TERMINAL_STATUS_PREDICATE = "status IN ({})".format(", ".join(f"'{s.name}'" for s in TERMINAL_ORDER_STATUSES))
 
-from domain.value_objects.order_status import OrderStatus # Your domain enum
 
 class WorkOrderBase(SQLModel):
     """
@@ -34,6 +42,35 @@ class WorkOrder(WorkOrderBase, table=True):
     This inherits from WorkOrderBase and adds table-specific fields like id, created_at, updated_at.
     """
     __tablename__ = "work_orders" # Explicitly set table name, matches Alembic migration
+    __table_args__ = (
+        # Keyset (cursor) pagination indexes, see Alembic revision f89466b64bab
+        Index("ix_work_orders_created_at_id", "created_at", "id"),
+        Index("ix_work_orders_updated_at_id", "updated_at", "id"),
+        # List filtering/sorting indexes, see Alembic revision e40d9c23f9d1
+        Index("ix_work_orders_due_date_id", "due_date", "id"),
+        Index("ix_work_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_work_orders_product_name_created_at_id", "product_name", "created_at", "id"),
+        Index(
+            "ix_work_orders_active_status_due_date", "status", "due_date",
+            postgresql_where=text(ACTIVE_STATUS_PREDICATE),
+            sqlite_where=text(ACTIVE_STATUS_PREDICATE),
+        ),
+        # Archival candidates (terminal orders by age), see Alembic revision a712e3a959dd
+        Index(
+            "ix_work_orders_terminal_updated_at", "updated_at",
+            postgresql_where=text(TERMINAL_STATUS_PREDICATE),
+            sqlite_where=text(TERMINAL_STATUS_PREDICATE),
+        ),
+        # Search (GET /work-orders/search): pg_trgm GIN indexes serving ILIKE prefix / substring
+        # patterns, see Alembic revision 48a1ef6b6194. SQLite uses the FTS5 table work_orders_search instead.
+        *(
+            Index(
+                f"ix_work_orders_{name}_trgm", name,
+                postgresql_using="gin", postgresql_ops={name: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for name in ("order_number", "product_name", "notes")
+        ),
+    )
 
     id: Optional[uuid.UUID] = Field(
         default_factory=uuid.uuid4, # SQLModel/Pydantic level default for new instances
@@ -42,14 +79,184 @@ class WorkOrder(WorkOrderBase, table=True):
     )
     created_at: Optional[datetime] = Field(
         default=None, # Will be set by DB default (see Alembic migration)
-        description="创建时间"
-        # sa_column_kwargs={'server_default': sa.text('now()')} # Can also be defined here
+        description="创建时间",
+        # Mirrors the server_default of the Alembic migration so that SQLite stand-in schemas match
+        sa_column_kwargs={'server_default': db_now()}
     )
     updated_at: Optional[datetime] = Field(
         default=None, # Will be set by DB default/trigger (see Alembic migration)
-        description="最后更新时间"
-        # sa_column_kwargs={'server_default': sa.text('now()'), 'onupdate': sa.text('now()')}
+        description="最后更新时间",
+        # On PostgreSQL the update_work_orders_updated_at trigger also maintains this column
+        sa_column_kwargs={'server_default': db_now(), 'onupdate': db_now()}
+    )
+    # 生产进度 (见 Alembic revision 81fc4cece29c)，只通过 POST /work-orders/progress 累加
+    produced_quantity: int = Field(default=0, description="已生产数量", sa_column_kwargs={'server_default': text("0")})
+    scrapped_quantity: int = Field(default=0, description="报废数量", sa_column_kwargs={'server_default': text("0")})
+    # 乐观并发版本号 (见 Alembic revision 5a09f0be2f1a)：每次 UPDATE 加 1，条件写入以 WHERE version = :expected 做比较并交换。
+    # PostgreSQL 上 work_orders_bump_version 触发器同样维护该列，手工执行的 UPDATE 也会递增
+    version: int = Field(
+        default=1, description="版本号", sa_column_kwargs={'server_default': text("1"), 'onupdate': text("version + 1")}
+    )
+
+class WorkOrderStatusCount(SQLModel, table=True):
+    """
+    Exact number of work orders per status (see Alembic revision b522fb6664d8).
+    Maintained by triggers on work_orders in the same transaction as every insert/update/delete,
+    so unfiltered or status-filtered totals are a lookup of at most a handful of rows
+    instead of a count(*) over work_orders.
+    """
+    __tablename__ = "work_order_status_counts"
+
+    status: OrderStatus = Field(
+        sa_column=Column(SAEnum(OrderStatus, name="order_status_enum", create_type=False), primary_key=True),
+        description="工单状态"
+    )
+    count: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")), description="该状态的工单数")
+
+
+
+class WorkOrderArchive(SQLModel, table=True):
+    """
+    Cold storage for terminal work orders (see Alembic revision a712e3a959dd). Rows are moved here
+    from work_orders by the archival job once they have been COMPLETED / CANCELLED for long enough,
+    so the indexes, counters and list scans of the hot table only cover orders still in use.
+    Same columns as work_orders plus archived_at; archived orders are read-only.
+    Order numbers are only unique among the hot orders, so this index is not unique.
+    """
+    __tablename__ = "work_orders_archive"
+    __table_args__ = (
+        Index("ix_work_orders_archive_created_at_id", "created_at", "id"),
+    )
+
+    id: uuid.UUID = Field(sa_column=Column(PG_UUID(as_uuid=True), primary_key=True, nullable=False))
+    order_number: str = Field(max_length=50, index=True, description="工单号")
+    product_name: str = Field(max_length=100, description="产品名称")
+    quantity: int = Field(description="计划数量")
+    status: OrderStatus = Field(
+        sa_column=Column(SAEnum(OrderStatus, name="order_status_enum", create_type=False), nullable=False),
+        description="工单状态"
+    )
+    due_date: Optional[datetime] = Field(default=None, description="计划完成日期")
+    notes: Optional[str] = Field(default=None, max_length=500, description="备注")
+    created_at: Optional[datetime] = Field(default=None, description="创建时间")
+    updated_at: Optional[datetime] = Field(default=None, description="最后更新时间")
+    produced_quantity: int = Field(default=0, description="已生产数量")
+    scrapped_quantity: int = Field(default=0, description="报废数量")
+    version: int = Field(default=1, description="版本号", sa_column_kwargs={'server_default': text("1")})
+    archived_at: Optional[datetime] = Field(
+        default=None, description="归档时间", sa_column_kwargs={'server_default': db_now()}
+    )
+
+# SQLite stand-in for the PostgreSQL statement-level counter triggers of revision b522fb6664d8
+_SQLITE_STATUS_COUNT_UPSERT = (
+    "INSERT INTO work_order_status_counts (status, count) VALUES ({status}, {delta}) "
+    "ON CONFLICT (status) DO UPDATE SET count = count + excluded.count;"
+)
+for _ddl in (
+    "CREATE TRIGGER IF NOT EXISTS work_orders_status_count_insert AFTER INSERT ON work_orders BEGIN "
+    + _SQLITE_STATUS_COUNT_UPSERT.format(status="NEW.status", delta=1) + " END",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_status_count_update AFTER UPDATE OF status ON work_orders "
+    "WHEN OLD.status IS NOT NEW.status BEGIN "
+    + _SQLITE_STATUS_COUNT_UPSERT.format(status="OLD.status", delta=-1) + " "
+    + _SQLITE_STATUS_COUNT_UPSERT.format(status="NEW.status", delta=1) + " END",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_status_count_delete AFTER DELETE ON work_orders BEGIN "
+    + _SQLITE_STATUS_COUNT_UPSERT.format(status="OLD.status", delta=-1) + " END",
+):
+    # On the metadata rather than a table: both tables must exist before the triggers are created
+    event.listen(SQLModel.metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+
+# due_day of the summary rows that never count as overdue: terminal orders and orders without a due date
+NO_DUE_DAY = date(9999, 12, 31)
+
+
+class WorkOrderSummaryBucket(SQLModel, table=True):
+    """
+    Dashboard aggregates (see Alembic revision d412e3b9f3e8): number of orders and planned quantity
+    per (product, status, due day), maintained by triggers on work_orders in the same transaction as
+    every write. Only active orders keep their due day (needed for the overdue count); all others fall
+    into NO_DUE_DAY, and emptied buckets are removed, so the table size follows the number of products
+    and open due days rather than the order history.
+    """
+    __tablename__ = "work_order_summary"
+
+    product_name: str = Field(max_length=100, primary_key=True, description="产品名称")
+    status: OrderStatus = Field(
+        sa_column=Column(SAEnum(OrderStatus, name="order_status_enum", create_type=False), primary_key=True),
+        description="工单状态"
+    )
+    due_day: date = Field(primary_key=True, description="计划完成日 (仅活动工单; 其余为 9999-12-31)")
+    order_count: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")), description="工单数")
+    planned_quantity: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")), description="计划数量合计")
+
+
+# SQLite stand-in for the PostgreSQL summary triggers of revision d412e3b9f3e8
+_SQLITE_DUE_DAY = (
+    "CASE WHEN {row}.status IN ({active}) AND {row}.due_date IS NOT NULL THEN date({row}.due_date) ELSE '{none}' END"
+)
+_SQLITE_SUMMARY_UPSERT = (
+    "INSERT INTO work_order_summary (product_name, status, due_day, order_count, planned_quantity) "
+    "VALUES ({row}.product_name, {row}.status, {due_day}, {sign}1, {sign}{row}.quantity) "
+    "ON CONFLICT (product_name, status, due_day) DO UPDATE SET "
+    "order_count = order_count + excluded.order_count, planned_quantity = planned_quantity + excluded.planned_quantity;"
+)
+_SQLITE_SUMMARY_CLEANUP = (
+    "DELETE FROM work_order_summary WHERE order_count = 0 "
+    "AND product_name = OLD.product_name AND status = OLD.status AND due_day = {due_day};"
+)
+
+
+def _sqlite_summary_change(row: str, sign: str) -> str:
+    due_day = _SQLITE_DUE_DAY.format(
+        row=row, active=", ".join(f"'{s.name}'" for s in ACTIVE_ORDER_STATUSES), none=NO_DUE_DAY.isoformat()
     )
+    statement = _SQLITE_SUMMARY_UPSERT.format(row=row, due_day=due_day, sign=sign)
+    if sign == "-":
+        statement += " " + _SQLITE_SUMMARY_CLEANUP.format(due_day=due_day)
+    return statement
+
+
+for _ddl in (
+    "CREATE TRIGGER IF NOT EXISTS work_orders_summary_insert AFTER INSERT ON work_orders BEGIN "
+    + _sqlite_summary_change("NEW", "") + " END",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_summary_update AFTER UPDATE OF status, product_name, due_date, quantity ON work_orders "
+    "WHEN OLD.status IS NOT NEW.status OR OLD.product_name IS NOT NEW.product_name "
+    "OR OLD.due_date IS NOT NEW.due_date OR OLD.quantity IS NOT NEW.quantity BEGIN "
+    + _sqlite_summary_change("OLD", "-") + " " + _sqlite_summary_change("NEW", "") + " END",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_summary_delete AFTER DELETE ON work_orders BEGIN "
+    + _sqlite_summary_change("OLD", "-") + " END",
+):
+    event.listen(SQLModel.metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+
+# SQLite stand-in for the pg_trgm indexes of revision 48a1ef6b6194: an external content FTS5 table
+# (trigram tokenizer, i.e. case-insensitive substring matches) over work_orders, kept in sync by triggers.
+# It is keyed by the implicit rowid of work_orders, which VACUUM may renumber: after a VACUUM run
+# `python -m maintenance.work_orders rebuild-search`.
+SQLITE_SEARCH_TABLE = "work_orders_search"
+_SQLITE_SEARCH_COLUMNS = "order_number, product_name, notes"
+_SQLITE_SEARCH_INSERT = (
+    f"INSERT INTO {SQLITE_SEARCH_TABLE} (rowid, {_SQLITE_SEARCH_COLUMNS}) "
+    "VALUES (NEW.rowid, NEW.order_number, NEW.product_name, NEW.notes);"
+)
+_SQLITE_SEARCH_DELETE = (
+    f"INSERT INTO {SQLITE_SEARCH_TABLE} ({SQLITE_SEARCH_TABLE}, rowid, {_SQLITE_SEARCH_COLUMNS}) "
+    "VALUES ('delete', OLD.rowid, OLD.order_number, OLD.product_name, OLD.notes);"
+)
+
+for _ddl in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_SEARCH_TABLE} USING fts5("
+    f"{_SQLITE_SEARCH_COLUMNS}, content='work_orders', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_search_insert AFTER INSERT ON work_orders BEGIN "
+    + _SQLITE_SEARCH_INSERT + " END",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_search_update AFTER UPDATE OF order_number, product_name, notes ON work_orders "
+    "WHEN OLD.order_number IS NOT NEW.order_number OR OLD.product_name IS NOT NEW.product_name "
+    "OR OLD.notes IS NOT NEW.notes BEGIN " + _SQLITE_SEARCH_DELETE + " " + _SQLITE_SEARCH_INSERT + " END",
+    "CREATE TRIGGER IF NOT EXISTS work_orders_search_delete AFTER DELETE ON work_orders BEGIN "
+    + _SQLITE_SEARCH_DELETE + " END",
+):
+    event.listen(SQLModel.metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
 
 # API Data Models (derived from SQLModel)
 
@@ -68,6 +275,9 @@ class WorkOrderRead(WorkOrderBase):
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
+    produced_quantity: int = 0
+    scrapped_quantity: int = 0
+    version: int = 1
     # status is already in WorkOrderBase
 
 
@@ -82,6 +292,8 @@ class WorkOrderUpdate(SQLModel):
     status: Optional[OrderStatus] = Field(default=None) # sa_column not needed for update schema
     due_date: Optional[datetime] = Field(default=None)
     notes: Optional[str] = Field(default=None, max_length=500)
+    # Not a column to set: the version the client read (optimistic concurrency, 409 when the order has changed since)
+    version: Optional[int] = Field(default=None, ge=1, description="读取时的版本号；传入时仅当工单仍为该版本才更新，否则返回 409")
 
 # For responses that include all table fields:
 class WorkOrderReadFull(WorkOrder):
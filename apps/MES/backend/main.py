@@ -1,11 +1,21 @@
 # main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 from api.endpoints import work_orders_router
 # engine 仍然可以从 connection 导入，以备 Alembic 或其他直接操作使用
-from infrastructure.database.connection import engine 
+from infrastructure.database.connection import (
+    engine, create_sqlite_schema, dispose_engines, pool_metrics, replica_engines, DATABASE_REPLICA_STICKY_SECONDS,
+)
+from core.dependencies import idempotency_store, progress_coalescer, work_order_archiver, work_order_cache, work_order_events
+from api.idempotency import IdempotencyMiddleware, IdempotentRequests
+from api.request_metrics import RequestMetricsMiddleware
+from api.query_budget import QueryBudgetMiddleware
+from api.read_consistency import ReadYourWritesMiddleware
+from core.config import IDEMPOTENCY_WAIT_SECONDS, QUERY_BUDGET_MAX_STATEMENTS, SLOW_QUERY_THRESHOLD_MS
+from infrastructure.metrics.query_budget import install_statement_tracker
+from infrastructure.metrics.registry import PROMETHEUS_CONTENT_TYPE, REGISTRY
 # 不再需要从这里导入 SQLModel 基类和表模型用于 create_all
 
 # 在应用的最开始加载 .env 文件
@@ -18,10 +28,20 @@ async def lifespan(app: FastAPI):
     # Alembic 将负责数据库表的创建和迁移
     # 因此此处不再调用 SQLModel.metadata.create_all(engine)
     print("数据库表结构将由 Alembic 管理。")
+    # 本地 SQLite 替身数据库 (aiosqlite) 不走 PostgreSQL 专用的迁移脚本，直接按模型建表
+    create_sqlite_schema()
+    await work_order_events.start()
+    await progress_coalescer.start()
+    await work_order_archiver.start()
 
     yield # 应用在此处运行
 
     print("MES 后端服务正在关闭...")
+    # 先写入仍在缓冲中的生产进度，再停止推送与关闭连接池
+    await work_order_archiver.stop()
+    await progress_coalescer.stop()
+    await work_order_events.stop()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -31,6 +51,30 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 带 Idempotency-Key 的创建 / 批量写入请求: 重试返回已存储的响应，同一个 key 的并发重试只执行一次。
+# 最先添加，位于最内层: 重放的响应仍经过下面的中间件 (Server-Timing、读己之写 Cookie、请求指标)。
+# 导入 (/import) 是流式上传，不缓冲请求体，因此不在其中
+IDEMPOTENT_PATHS = [
+    f"/api/v1{work_orders_router.router.prefix}{path}" for path in ("/", "/bulk", "/bulk/status", "/progress")
+]
+idempotent_requests = (
+    IdempotentRequests(idempotency_store, IDEMPOTENT_PATHS, wait_seconds=IDEMPOTENCY_WAIT_SECONDS)
+    if idempotency_store is not None else None
+)
+if idempotent_requests is not None:
+    app.add_middleware(IdempotencyMiddleware, requests=idempotent_requests)
+
+# 每个请求的 SQL 条数与耗时 (Server-Timing 响应头)、查询预算告警及慢查询日志
+install_statement_tracker(SLOW_QUERY_THRESHOLD_MS / 1000)
+app.add_middleware(QueryBudgetMiddleware, max_statements=QUERY_BUDGET_MAX_STATEMENTS)
+
+# 配置了只读副本时: 客户端写入后的短时间内其读请求仍走主库 (读己之写)
+if replica_engines:
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=DATABASE_REPLICA_STICKY_SECONDS)
+
+# 请求耗时直方图 / 进行中请求数 (GET /metrics)
+app.add_middleware(RequestMetricsMiddleware)
+
 app.include_router(work_orders_router.router, prefix="/api/v1")
 
 @app.get("/health", tags=["Health Check - 健康检查"])
@@ -40,6 +84,32 @@ async def health_check():
     """
     return {"status": "ok", "message": "MES 后端服务运行正常!"}
 
+@app.get("/health/diagnostics", tags=["Health Check - 健康检查"])
+async def diagnostics():
+    """
+    运行诊断: 各数据库连接池的实时状态 (占用/空闲/溢出连接数、等待中的调用方、取连接耗时直方图、超时次数)、
+    工单查询缓存的命中统计、变更推送的订阅者数 / 已发布事件数 / 慢消费者溢出次数、生产进度合并写入、后台归档任务以及幂等键 (执行 / 重放 / 合并次数) 的统计。数值均为本进程自启动以来的累计值。
+    """
+    return {
+        "database_pools": {name: metrics.snapshot() for name, metrics in pool_metrics.items()},
+        "work_order_cache": work_order_cache.stats() if work_order_cache is not None else None,
+        "change_feed": work_order_events.stats(),
+        "progress_ingestion": progress_coalescer.stats(),
+        "archival": work_order_archiver.stats(),
+        "idempotency": idempotent_requests.stats() if idempotent_requests is not None else None,
+    }
+
+@app.get("/metrics", tags=["Health Check - 健康检查"], response_class=Response)
+async def metrics():
+    """
+    Prometheus 文本格式的运行指标:
+    - http_request_duration_seconds: 按路由模板、方法、状态码的请求耗时直方图
+    - http_requests_in_flight: 进行中的请求数
+    - db_statement_duration_seconds: 按发起的仓储方法 (如 AsyncSQLModelWorkOrderRepository.list_all) 的 SQL 执行耗时直方图
+    - db_pool_*: 连接池占用/溢出/等待数、取连接耗时及超时次数
+    """
+    return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     # 确保您的 .env 文件中的 DATABASE_URL 配置正确，
@@ -0,0 +1,124 @@
+# maintenance/work_orders.py
+"""
+Work order maintenance commands, for cron / one-off runs outside the service process.
+Run from the backend directory (settings come from the environment / .env, like the service):
+
+    # move COMPLETED / CANCELLED orders untouched for 180 days to work_orders_archive
+    python -m maintenance.work_orders archive --older-than-days 180
+
+    # at most 50 batches of 500 orders, e.g. to spread a large first run over several nights
+    python -m maintenance.work_orders archive --batch-size 500 --max-batches 50
+
+    # recompute the trigger-maintained aggregates (status counts, dashboard summary) if they drifted
+    python -m maintenance.work_orders rebuild-summary
+
+    # SQLite stand-in only: re-index the FTS5 search table, e.g. after a VACUUM
+    python -m maintenance.work_orders rebuild-search
+
+    # IDEMPOTENCY_STORE=database: delete expired Idempotency-Key responses from idempotency_keys
+    python -m maintenance.work_orders purge-idempotency-keys
+"""
+import argparse
+import asyncio
+import sys
+from typing import List
+
+from dotenv import load_dotenv
+
+
+def command_archive(args: argparse.Namespace) -> int:
+    from core.config import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+    from core.dependencies import archive_work_orders
+    from infrastructure.database.connection import create_sqlite_schema, dispose_engines
+
+    async def run() -> int:
+        try:
+            return await archive_work_orders(
+                after_days=ARCHIVE_AFTER_DAYS if args.older_than_days is None else args.older_than_days,
+                batch_size=args.batch_size or ARCHIVE_BATCH_SIZE,
+                max_batches=args.max_batches,
+            )
+        finally:
+            await dispose_engines()
+
+    create_sqlite_schema()
+    archived = asyncio.run(run())
+    print(f"archived {archived} work order(s)")
+    return 0
+
+
+def command_rebuild_summary(args: argparse.Namespace) -> int:
+    from infrastructure.database.connection import create_sqlite_schema, rebuild_aggregates
+    create_sqlite_schema()
+    rebuild_aggregates()
+    print("rebuilt work_order_status_counts and work_order_summary")
+    return 0
+
+
+def command_rebuild_search(args: argparse.Namespace) -> int:
+    from infrastructure.database.connection import create_sqlite_schema, is_sqlite, rebuild_search_index
+    if not is_sqlite():
+        print("nothing to do: the PostgreSQL trigram indexes are maintained by the database")
+        return 0
+    create_sqlite_schema()
+    rebuild_search_index()
+    print("rebuilt work_orders_search")
+    return 0
+
+
+def command_purge_idempotency_keys(args: argparse.Namespace) -> int:
+    from core.dependencies import idempotency_store
+    from infrastructure.cache.idempotency_store import DatabaseIdempotencyStore
+    from infrastructure.database.connection import create_sqlite_schema, dispose_engines
+    if not isinstance(idempotency_store, DatabaseIdempotencyStore):
+        print("nothing to do: IDEMPOTENCY_STORE is not 'database'")
+        return 0
+
+    async def run() -> int:
+        try:
+            return await idempotency_store.purge_expired()
+        finally:
+            await dispose_engines()
+
+    create_sqlite_schema()
+    purged = asyncio.run(run())
+    print(f"purged {purged} expired idempotency key(s)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m maintenance.work_orders", description="Work order maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    archive_command = commands.add_parser("archive", help="move old terminal work orders to the archive table")
+    archive_command.add_argument("--older-than-days", type=float, help="retention of terminal orders (default: ARCHIVE_AFTER_DAYS)")
+    archive_command.add_argument("--batch-size", type=int, help="orders per transaction (default: ARCHIVE_BATCH_SIZE)")
+    archive_command.add_argument("--max-batches", type=int, help="stop after this many batches (default: until done)")
+    archive_command.set_defaults(handler=command_archive)
+
+    rebuild_command = commands.add_parser(
+        "rebuild-summary", help="recompute the status counts and dashboard summary tables from work_orders"
+    )
+    rebuild_command.set_defaults(handler=command_rebuild_summary)
+
+    search_command = commands.add_parser(
+        "rebuild-search", help="re-index the SQLite FTS5 search table from work_orders (SQLite stand-in only)"
+    )
+    search_command.set_defaults(handler=command_rebuild_search)
+
+    purge_command = commands.add_parser(
+        "purge-idempotency-keys", help="delete expired Idempotency-Key responses (IDEMPOTENCY_STORE=database only)"
+    )
+    purge_command.set_defaults(handler=command_purge_idempotency_keys)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    # Must happen before the application modules are imported: they read the settings at import time
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# tests/conftest.py
+"""
+The tests run the application against a throwaway SQLite database (aiosqlite in async session
+mode), created from the SQLModel metadata on start-up like any local SQLite stand-in.
+The settings are read when the application modules are imported, so they are set here first.
+"""
+import os
+import tempfile
+import uuid
+from typing import Any, Dict, Iterator
+
+import pytest
+
+_DATABASE_DIR = tempfile.mkdtemp(prefix="mes-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATABASE_DIR}/mes.db"
+os.environ["DATABASE_SESSION_MODE"] = "async"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["CHANGE_FEED_BACKEND"] = "memory"
+os.environ["IDEMPOTENCY_STORE"] = "memory"
+os.environ["ARCHIVE_INTERVAL_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient # noqa: E402
+
+WORK_ORDERS_URL = "/api/v1/work-orders/"
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def product_name() -> str:
+    """A product name of its own per test, to list just the orders the test created."""
+    return f"product-{uuid.uuid4().hex[:12]}"
+
+
+def create_work_order(client: TestClient, product_name: str, **fields: Any) -> Dict[str, Any]:
+    payload = {"order_number": f"T-{uuid.uuid4().hex[:16]}", "product_name": product_name, "quantity": 10, **fields}
+    response = client.post(WORK_ORDERS_URL, json=payload)
+    assert response.status_code == 201, response.text
+    return response.json()
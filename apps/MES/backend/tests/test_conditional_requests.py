@@ -0,0 +1,30 @@
+# tests/test_conditional_requests.py
+from api.conditional_requests import parse_work_order_etag
+from tests.conftest import WORK_ORDERS_URL, create_work_order
+
+
+def test_sparse_detail_etag_does_not_revalidate_full_representation(client, product_name):
+    work_order = create_work_order(client, product_name)
+    url = f"{WORK_ORDERS_URL}{work_order['id']}"
+    full = client.get(url).headers["ETag"]
+    sparse = client.get(url, params={"fields": "status,notes"}).headers["ETag"]
+    assert sparse != full
+    # Same (id, updated_at) state for If-Match
+    assert parse_work_order_etag(sparse) == parse_work_order_etag(full)
+
+    assert client.get(url, headers={"If-None-Match": sparse}).status_code == 200
+    assert client.get(url, params={"fields": "notes"}, headers={"If-None-Match": sparse}).status_code == 200
+    # Fields are normalised, so the same fieldset in another order still revalidates
+    assert client.get(url, params={"fields": "notes,status"}, headers={"If-None-Match": sparse}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": full}).status_code == 304
+
+
+def test_sparse_list_etag_does_not_revalidate_full_page(client, product_name):
+    create_work_order(client, product_name)
+    params = {"product_name": product_name}
+    full = client.get(WORK_ORDERS_URL, params=params).headers["ETag"]
+    sparse = client.get(WORK_ORDERS_URL, params={**params, "fields": "status"}).headers["ETag"]
+    assert sparse != full
+
+    assert client.get(WORK_ORDERS_URL, params=params, headers={"If-None-Match": sparse}).status_code == 200
+    assert client.get(WORK_ORDERS_URL, params={**params, "fields": "status"}, headers={"If-None-Match": sparse}).status_code == 304
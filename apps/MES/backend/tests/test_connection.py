@@ -0,0 +1,16 @@
+# tests/test_connection.py
+import pytest
+
+from infrastructure.database.connection import engine_options
+
+
+@pytest.mark.parametrize("url, connect_args", [
+    ("postgresql://mes@db/mes", {"options": "-c timezone=UTC"}),
+    ("postgresql+asyncpg://mes@db/mes", {"server_settings": {"timezone": "UTC"}}),
+])
+def test_postgresql_sessions_run_in_utc(url, connect_args):
+    assert engine_options(url)["connect_args"] == connect_args
+
+
+def test_sqlite_has_no_session_time_zone():
+    assert "connect_args" not in engine_options("sqlite:///./mes.db")
@@ -0,0 +1,14 @@
+# tests/test_dependencies.py
+import pytest
+
+from core.dependencies import check_database_dialect
+
+
+@pytest.mark.parametrize("dialect_name", ["postgresql", "sqlite"])
+def test_supported_dialects_pass(dialect_name):
+    check_database_dialect(dialect_name)
+
+
+def test_unsupported_dialect_is_rejected_at_startup():
+    with pytest.raises(ValueError, match="Unsupported database dialect 'mysql'"):
+        check_database_dialect("mysql")
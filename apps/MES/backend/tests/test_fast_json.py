@@ -0,0 +1,113 @@
+# tests/test_fast_json.py
+"""
+The list and sparse detail responses are encoded by orjson from projected rows (api/fast_json.py)
+instead of going through response_model validation. Their bytes must stay identical to what the
+response_model path produced before: pydantic's JSON mode rendered by JSONResponse.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+import pytest
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, select
+
+from api.endpoints.work_orders_router import WorkOrderListResponse
+from api.fast_json import WorkOrderJSONResponse, dumps
+from infrastructure.database.connection import engine
+from infrastructure.sqlmodels.work_order import WorkOrder, WorkOrderRead
+from tests.conftest import WORK_ORDERS_URL, create_work_order
+
+
+def reference_body(content: dict) -> bytes:
+    """Bytes of the response_model path: validated model -> JSON mode dict -> JSONResponse."""
+    return JSONResponse(content).body
+
+
+def stored_work_orders(product_name: str) -> List[WorkOrderRead]:
+    """The product's orders in the list's default order (created_at, id)."""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(WorkOrder).where(WorkOrder.product_name == product_name).order_by(WorkOrder.created_at, WorkOrder.id)
+        ).all()
+        return [WorkOrderRead.model_validate(row) for row in rows]
+
+
+def reference_list(
+    items: Sequence[WorkOrderRead], fields: Optional[Sequence[str]] = None, total: Optional[int] = None,
+    skip: int = 0, limit: int = 10, next_cursor: Optional[str] = None,
+) -> bytes:
+    if fields is None:
+        return reference_body(
+            WorkOrderListResponse(items=list(items), total=total, skip=skip, limit=limit, next_cursor=next_cursor).model_dump(mode="json")
+        )
+    return reference_body({
+        "items": [item.model_dump(mode="json", include=set(fields)) for item in items],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    })
+
+
+@pytest.fixture
+def work_orders(client, product_name) -> List[WorkOrderRead]:
+    """Orders covering the value shapes the encoders could disagree on."""
+    create_work_order(client, product_name)
+    create_work_order(client, product_name, due_date="2026-12-01T08:00:00", notes="中文备注 ✓ \"quoted\" \\ back\nslash")
+    create_work_order(client, product_name, due_date="2026-12-01T08:00:00.123456", status="IN_PROGRESS", notes="")
+    create_work_order(client, product_name, due_date="2026-12-01T08:00:00+08:00", quantity=2**31 - 1)
+    return stored_work_orders(product_name)
+
+
+def test_list_matches_response_model_encoding(client, product_name, work_orders):
+    response = client.get(WORK_ORDERS_URL, params={"product_name": product_name})
+    assert response.status_code == 200
+    assert response.content == reference_list(work_orders, total=len(work_orders))
+
+
+def test_cursor_pages_match_response_model_encoding(client, product_name, work_orders):
+    first = client.get(WORK_ORDERS_URL, params={"product_name": product_name, "paging": "cursor", "limit": 3})
+    next_cursor = first.json()["next_cursor"]
+    assert next_cursor is not None
+    assert first.content == reference_list(work_orders[:3], limit=3, next_cursor=next_cursor)
+
+    second = client.get(WORK_ORDERS_URL, params={"product_name": product_name, "cursor": next_cursor, "limit": 3})
+    assert second.content == reference_list(work_orders[3:], limit=3)
+
+
+def test_sparse_list_matches_response_model_encoding(client, product_name, work_orders):
+    fields = ["order_number", "status", "due_date", "notes"]
+    response = client.get(WORK_ORDERS_URL, params={"product_name": product_name, "fields": ",".join(reversed(fields))})
+    assert response.status_code == 200
+    assert response.content == reference_list(work_orders, fields=fields, total=len(work_orders))
+
+
+def test_sparse_detail_matches_response_model_encoding(client, work_orders):
+    fields = ["id", "quantity", "due_date", "notes", "updated_at", "version"]
+    for work_order in work_orders:
+        response = client.get(f"{WORK_ORDERS_URL}{work_order.id}", params={"fields": ",".join(fields)})
+        assert response.status_code == 200
+        assert response.content == reference_body(work_order.model_dump(mode="json", include=set(fields)))
+
+
+def test_detail_items_match_list_items(client, product_name, work_orders):
+    """The full detail still goes through response_model; each list item must encode the same way."""
+    items = client.get(WORK_ORDERS_URL, params={"product_name": product_name}).json()["items"]
+    for work_order, item in zip(work_orders, items):
+        detail = client.get(f"{WORK_ORDERS_URL}{work_order.id}").json()
+        assert {name: detail[name] for name in item} == item
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2026, 10, 17, 8, 30),
+    datetime(2026, 10, 17, 8, 30, 0, 120000),
+    datetime(2026, 10, 17, 8, 30, tzinfo=timezone.utc),
+    datetime(2026, 10, 17, 8, 30, 0, 5, tzinfo=timezone.utc),
+])
+def test_datetimes_encode_like_pydantic(value):
+    work_order = WorkOrderRead(
+        id="6f1d3c4e-8a2b-4c5d-9e0f-112233445566", order_number="D-1", product_name="p", quantity=1,
+        due_date=value, created_at=value, updated_at=value,
+    )
+    assert dumps(work_order.model_dump()) == reference_body(work_order.model_dump(mode="json"))
+    assert WorkOrderJSONResponse(work_order.model_dump()).body == reference_body(work_order.model_dump(mode="json"))
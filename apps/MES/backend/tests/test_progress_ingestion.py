@@ -0,0 +1,108 @@
+# tests/test_progress_ingestion.py
+import asyncio
+import uuid
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import exc
+
+from application.services.progress_ingestion import ProgressCoalescer
+from domain.value_objects.production_progress import PROGRESS_INCREMENT_MAX, ProgressIncrement, ProgressOutcome
+from infrastructure.database.connection import is_transient_database_error
+
+OUT_OF_RANGE = exc.DataError("UPDATE work_orders ...", {}, Exception("integer out of range"))
+UNREACHABLE = exc.OperationalError("UPDATE work_orders ...", {}, Exception("connection refused"))
+
+
+class FakeDatabase:
+    """Flush function applying the batch to in-memory totals, failing as configured."""
+
+    def __init__(self):
+        self.totals = {}
+        self.overflowing = set() # orders whose totals no longer fit the column
+        self.unavailable_flushes = 0
+
+    async def __call__(self, batch):
+        if self.unavailable_flushes:
+            self.unavailable_flushes -= 1
+            raise UNREACHABLE
+        if self.overflowing & batch.keys():
+            raise OUT_OF_RANGE
+        for wo_id, (produced, scrapped) in batch.items():
+            total = self.totals.setdefault(wo_id, [0, 0])
+            total[0] += produced
+            total[1] += scrapped
+        return {wo_id: ProgressOutcome.APPLIED for wo_id in batch}
+
+
+def increments(*wo_ids, produced=1):
+    return [ProgressIncrement(work_order_id=wo_id, produced=produced) for wo_id in wo_ids]
+
+
+def test_transient_failure_is_retried_once_with_the_next_flush():
+    async def scenario():
+        database = FakeDatabase()
+        coalescer = ProgressCoalescer(database, retryable=is_transient_database_error)
+        wo_id = uuid.uuid4()
+        database.unavailable_flushes = 1
+        future = coalescer.add(increments(wo_id, produced=2), wait=True)
+        await coalescer.flush()
+        assert not future.done()
+        assert coalescer.stats()["pending_orders"] == 1
+        await coalescer.flush()
+        assert future.result() == {wo_id: ProgressOutcome.APPLIED}
+        assert database.totals[wo_id] == [2, 0]
+
+    asyncio.run(scenario())
+
+
+def test_failing_order_is_dropped_without_blocking_the_batch():
+    async def scenario():
+        database = FakeDatabase()
+        coalescer = ProgressCoalescer(database, retryable=is_transient_database_error)
+        good, bad, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        database.overflowing.add(bad)
+        future = coalescer.add(increments(good, bad, other), wait=True)
+        await coalescer.flush()
+        assert future.result() == {
+            good: ProgressOutcome.APPLIED, bad: ProgressOutcome.FAILED, other: ProgressOutcome.APPLIED,
+        }
+        assert database.totals == {good: [1, 0], other: [1, 0]}
+        assert coalescer.stats()["pending_orders"] == 0
+        assert coalescer.stats()["dropped_orders"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_outage_while_isolating_keeps_written_outcomes_for_the_retry():
+    async def scenario():
+        database = FakeDatabase()
+        coalescer = ProgressCoalescer(database, retryable=is_transient_database_error)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        calls = []
+
+        async def flaky(batch):
+            calls.append(set(batch))
+            if len(batch) > 1:
+                raise OUT_OF_RANGE
+            if first in batch:
+                return await database(batch)
+            raise UNREACHABLE
+
+        coalescer._flush = flaky
+        future = coalescer.add(increments(first, second), wait=True)
+        await coalescer.flush()
+        assert not future.done()
+        coalescer._flush = database
+        await coalescer.flush()
+        assert future.result() == {first: ProgressOutcome.APPLIED, second: ProgressOutcome.APPLIED}
+        # The first order was written once, not again with the retry
+        assert database.totals == {first: [1, 0], second: [1, 0]}
+
+    asyncio.run(scenario())
+
+
+def test_increments_are_bounded_by_the_column_range():
+    ProgressIncrement(work_order_id=uuid.uuid4(), produced=PROGRESS_INCREMENT_MAX)
+    with pytest.raises(ValidationError):
+        ProgressIncrement(work_order_id=uuid.uuid4(), produced=PROGRESS_INCREMENT_MAX + 1)
@@ -0,0 +1,73 @@
+# tests/test_query_budget.py
+"""
+Statement budgets of the hot endpoints. A change that adds a round-trip (an N+1 lookup, a chunked
+INSERT split into several batches, ...) fails here with the list of statements and their
+repository methods.
+"""
+import uuid
+
+from infrastructure.database.connection import engine
+from infrastructure.metrics.query_budget import assert_max_queries
+from infrastructure.repositories.work_order_queries import PREVIOUS_STATUS_RETURNING_DIALECTS
+from tests.conftest import WORK_ORDERS_URL, create_work_order
+
+
+def test_list_runs_page_and_count(client, product_name):
+    create_work_order(client, product_name)
+    with assert_max_queries(2) as queries:
+        response = client.get(WORK_ORDERS_URL, params={"product_name": product_name})
+    assert response.status_code == 200
+    assert queries.repository_methods == ["AsyncSQLModelWorkOrderRepository.list_all", "AsyncSQLModelWorkOrderRepository.count_all"]
+
+
+def test_cursor_list_runs_one_statement(client, product_name):
+    create_work_order(client, product_name)
+    with assert_max_queries(1):
+        response = client.get(WORK_ORDERS_URL, params={"product_name": product_name, "paging": "cursor"})
+    assert response.status_code == 200
+
+
+def test_detail_runs_one_statement_then_hits_the_cache(client, product_name):
+    work_order = create_work_order(client, product_name)
+    with assert_max_queries(1):
+        assert client.get(f"{WORK_ORDERS_URL}{work_order['id']}").status_code == 200
+    with assert_max_queries(0):
+        assert client.get(f"{WORK_ORDERS_URL}{work_order['id']}").status_code == 200
+
+
+def test_bulk_create_of_mixed_rows_is_one_insert(client, product_name):
+    # Rows leaving different optional columns unset must still share one multi-row INSERT
+    items = [
+        {
+            "order_number": f"B-{uuid.uuid4().hex[:16]}",
+            "product_name": product_name,
+            "quantity": index + 1,
+            **({"due_date": "2026-12-01T08:00:00", "notes": "n"} if index % 2 else {}),
+            **({"status": "IN_PROGRESS"} if index % 3 == 0 else {}),
+        }
+        for index in range(25)
+    ]
+    with assert_max_queries(1) as queries:
+        response = client.post(f"{WORK_ORDERS_URL}bulk", json={"items": items})
+    assert response.status_code == 201
+    assert response.json()["created_count"] == 25
+    assert queries.repository_methods == ["AsyncSQLModelWorkOrderRepository.add_many"]
+
+
+def test_durable_progress_runs_lookups_and_update(client, product_name):
+    work_order = create_work_order(client, product_name)
+    items = [
+        {"work_order_id": work_order["id"], "produced": 3, "scrapped": 1},
+        {"work_order_id": str(uuid.uuid4()), "produced": 1},
+    ]
+    # Existing ids for the outcomes, then the UPDATE, which returns the events' previous_status (auto-complete)
+    # itself; only SQLite has to read the statuses before it
+    update_statements = 1 if engine.dialect.name in PREVIOUS_STATUS_RETURNING_DIALECTS else 2
+    with assert_max_queries(1 + update_statements) as queries:
+        response = client.post(f"{WORK_ORDERS_URL}progress", params={"durable": "true"}, json={"items": items})
+    assert response.status_code == 200
+    assert queries.repository_methods == [
+        "AsyncSQLModelWorkOrderRepository.find_existing_ids",
+        *["AsyncSQLModelWorkOrderRepository.apply_progress"] * update_statements,
+    ]
+    assert [result["outcome"] for result in response.json()["results"]] == ["applied", "not_found"]
@@ -0,0 +1,15 @@
+# tests/test_sql_functions.py
+from sqlalchemy.dialects import postgresql
+
+from infrastructure.database.sql_functions import db_now
+from infrastructure.sqlmodels.work_order import WorkOrder
+
+
+def test_db_now_is_utc_on_postgresql():
+    assert str(db_now().compile(dialect=postgresql.dialect())) == "timezone('utc', now())"
+
+
+def test_updated_at_is_written_in_utc_on_postgresql():
+    column = WorkOrder.__table__.c.updated_at
+    for generated in (column.server_default.arg, column.onupdate.arg):
+        assert str(generated.compile(dialect=postgresql.dialect())) == "timezone('utc', now())"
@@ -0,0 +1,65 @@
+# tests/test_work_order_events.py
+import uuid
+
+import pytest
+
+from core.dependencies import work_order_events
+from domain.value_objects.order_status import OrderStatus
+from infrastructure.events.work_order_events import DELETED, RESYNC, UPDATED, EventFilter, WorkOrderEvent, work_order_event
+from tests.conftest import WORK_ORDERS_URL, create_work_order
+
+IN_PROGRESS_ONLY = EventFilter(statuses=frozenset({OrderStatus.IN_PROGRESS}))
+
+
+@pytest.mark.parametrize("data, expected", [
+    ({"status": "IN_PROGRESS", "previous_status": "PENDING"}, True), # entering
+    ({"status": "COMPLETED", "previous_status": "IN_PROGRESS"}, True), # leaving
+    ({"status": "COMPLETED", "previous_status": "PENDING"}, False),
+    ({"status": "COMPLETED"}, False),
+    ({"id": "x"}, True), # no status known
+])
+def test_status_filter_matches_previous_or_new_status(data, expected):
+    assert IN_PROGRESS_ONLY.matches(work_order_event(UPDATED, uuid.uuid4(), **data)) is expected
+
+
+def test_deletes_and_resyncs_reach_every_subscriber():
+    assert IN_PROGRESS_ONLY.matches(work_order_event(DELETED, uuid.uuid4(), id="x"))
+    assert IN_PROGRESS_ONLY.matches(WorkOrderEvent(type=RESYNC))
+
+
+def received(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_subscriber_sees_order_leave_its_status(client, product_name):
+    work_order = create_work_order(client, product_name, quantity=5)
+    subscription = work_order_events.subscribe(EventFilter(statuses=frozenset({OrderStatus.PENDING})))
+    try:
+        response = client.put(f"{WORK_ORDERS_URL}{work_order['id']}", json={"status": "IN_PROGRESS"})
+        assert response.status_code == 200
+        (event,) = received(subscription)
+        assert (event.id, event.data["status"], event.data["previous_status"]) == (work_order["id"], "IN_PROGRESS", "PENDING")
+    finally:
+        subscription.close()
+
+
+def test_bulk_status_and_progress_events_carry_previous_status(client, product_name):
+    work_order = create_work_order(client, product_name, quantity=5)
+    subscription = work_order_events.subscribe(EventFilter(statuses=frozenset({OrderStatus.IN_PROGRESS})))
+    try:
+        response = client.post(f"{WORK_ORDERS_URL}bulk/status", json={"ids": [work_order["id"]], "status": "IN_PROGRESS"})
+        assert response.status_code == 200, response.text
+        response = client.post(
+            f"{WORK_ORDERS_URL}progress", params={"durable": "true"},
+            json={"items": [{"work_order_id": work_order["id"], "produced": 5}]},
+        )
+        assert response.status_code == 200
+        started, completed = received(subscription)
+        assert (started.data["status"], started.data["previous_status"]) == ("IN_PROGRESS", "PENDING")
+        # Auto-completed by the progress report: it leaves IN_PROGRESS
+        assert (completed.data["status"], completed.data["previous_status"]) == ("COMPLETED", "IN_PROGRESS")
+    finally:
+        subscription.close()
@@ -0,0 +1,40 @@
+# tests/test_work_order_export.py
+import csv
+import io
+import json
+
+from tests.conftest import WORK_ORDERS_URL, create_work_order
+
+
+def export(client, product_name, export_format):
+    response = client.get(f"{WORK_ORDERS_URL}export", params={"product_name": product_name, "format": export_format})
+    assert response.status_code == 200
+    return response.text
+
+
+def test_csv_export_has_the_ndjson_columns(client, product_name):
+    work_order = create_work_order(client, product_name)
+    client.put(f"{WORK_ORDERS_URL}{work_order['id']}", json={"notes": "bumps the version"})
+    (row,) = csv.DictReader(io.StringIO(export(client, product_name, "csv")))
+    (line,) = export(client, product_name, "ndjson").splitlines()
+    assert set(row) == set(json.loads(line))
+    assert row["version"] == "2"
+
+
+def test_csv_export_reimports(client, product_name):
+    create_work_order(client, product_name)
+    exported = export(client, product_name, "csv")
+    # Same rows under new order numbers: the generated columns (id, version, ...) are ignored
+    reader = csv.DictReader(io.StringIO(exported))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=reader.fieldnames, lineterminator="\n")
+    writer.writeheader()
+    for row in reader:
+        writer.writerow({**row, "order_number": f"{row['order_number']}-copy"})
+    response = client.post(
+        f"{WORK_ORDERS_URL}import", params={"format": "csv"}, content=buffer.getvalue().encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["created"], report["invalid"], report["aborted"]) == (1, 0, None)